@@ -0,0 +1,84 @@
+from crewai import Task, Crew, Process
+from dotenv import load_dotenv
+from typing import Optional
+import os
+import threading
+
+from crewai_sample.alumni_knowledge import AlumniKnowledgeSource
+from crewai_sample.crew_pool import crew_pool, shared_llm
+from crewai_sample.embedding_scheduler import scheduled_embedder
+from crewai_sample.hybrid_knowledge import HybridKnowledgeAgent
+from crewai_sample.tools.alumni_lookup_tool import AlumniLookupTool
+from crewai_sample.tracing import span
+
+# Load environment variables
+load_dotenv()
+
+metadata = {"source": "user_profile", "description": "Basic user information"}
+
+_excel_source: Optional[AlumniKnowledgeSource] = None
+_excel_source_lock = threading.Lock()
+
+
+def get_excel_source() -> AlumniKnowledgeSource:
+    """Alumni knowledge source shared by every pooled crew, created on first use.
+
+    The spreadsheet is read from its memory-mapped columnar copy and only changed
+    records are re-embedded.
+    """
+    global _excel_source
+    with _excel_source_lock:
+        if _excel_source is None:
+            _excel_source = AlumniKnowledgeSource(
+                file_path="cit_alumni_master.xlsx",  # Resolved relative to the knowledge/ directory
+                metadata=metadata
+            )
+        return _excel_source
+
+
+def build_alumni_crew(api_key: Optional[str] = None) -> Crew:
+    """Create the CIT alumni agent and a crew whose task takes the question as an input."""
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+
+    # Initialize Agent; building it only embeds records that changed since the last run
+    cit_alumni_agent = HybridKnowledgeAgent(
+        role="CIT Alumni Information Assistant",
+        goal="Provide accurate information about CIT alumni.",
+        backstory="You specialize in providing alumni information including payments, membership details, and personal data.",
+        knowledge_sources=[get_excel_source()],
+        embedder_config=scheduled_embedder({
+            "provider": "google",
+            "config": {
+                "model": "models/text-embedding-004",
+                "api_key": api_key,
+            }
+        }),
+        tools=[AlumniLookupTool(file_path="cit_alumni_master.xlsx")],
+        llm=shared_llm("gemini/gemini-1.5-pro-002", api_key=api_key, temperature=0)
+    )
+
+    # Create a task
+    task = Task(
+        description="Answer this CIT alumni query: {user_question}",
+        expected_output="A detailed answer based on the CIT alumni data.",
+        agent=cit_alumni_agent
+    )
+
+    # Initialize Crew
+    return Crew(
+        agents=[cit_alumni_agent],
+        tasks=[task],
+        verbose=True,
+        process=Process.sequential,
+    )
+
+
+crew_pool.register("cit_alumni", build_alumni_crew)
+
+
+def handle_user_input(user_question: str, api_key: Optional[str] = None) -> str:
+    """Answers a CIT alumni question with a pooled crew."""
+    with span("chat_turn", bot="cit_alumni"):
+        with crew_pool.checkout("cit_alumni", api_key) as crew, span("kickoff", bot="cit_alumni"):
+            result = crew.kickoff(inputs={"user_question": user_question})
+        return result.raw
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import pyarrow as pa
+
+from crewai_sample.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+# Where crewAI resolves relative knowledge file paths
+KNOWLEDGE_DIRECTORY = Path("knowledge")
+FORMAT_VERSION = 1
+
+
+class AlumniDataset:
+    """Read-only columnar view of an alumni spreadsheet.
+
+    The first sheet of the workbook is converted once into an uncompressed Arrow IPC
+    file in crewAI's storage directory and memory-mapped from there, so every process
+    shares the same pages through the OS cache. The conversion is redone only when
+    the spreadsheet's size or modification time changes *and* its content hash does.
+    """
+
+    def __init__(self, table: pa.Table, source: Path):
+        self.table = table
+        self.source = source
+
+    @property
+    def num_rows(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return self.table.column_names
+
+    def column(self, name: str) -> List[Any]:
+        return self.table.column(name).to_pylist()
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield every record as a dict of column name to value."""
+        for batch in self.table.to_batches():
+            yield from batch.to_pylist()
+
+
+def resolve_knowledge_path(file_path: Union[str, Path]) -> Path:
+    """Resolve a file name the way crewAI's file knowledge sources do."""
+    path = Path(file_path)
+    if path.exists() or path.is_absolute():
+        return path
+    return KNOWLEDGE_DIRECTORY / path
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cell(value: Any) -> Optional[str]:
+    """Normalize a spreadsheet cell to text; blanks become None."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (datetime, date)):
+        value = value.date() if isinstance(value, datetime) else value
+        return value.isoformat()
+    text = " ".join(str(value).split())
+    return text or None
+
+
+def convert_workbook(source: Path, target: Path) -> pa.Table:
+    """Convert the first sheet of a workbook into an Arrow IPC file and return its table."""
+    import pandas as pd
+
+    frame = pd.read_excel(source, dtype=object)
+    columns: Dict[str, List[Optional[str]]] = {}
+    for name in frame.columns:
+        values = [_cell(value) for value in frame[name].tolist()]
+        # Drop the unnamed, empty columns spreadsheets tend to accumulate
+        if str(name).startswith("Unnamed:") and not any(values):
+            continue
+        columns[" ".join(str(name).split())] = values
+
+    table = pa.table({name: pa.array(values, type=pa.string()) for name, values in columns.items()})
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, target)
+    return table
+
+
+def _paths(source: Path) -> Tuple[Path, Path]:
+    name = f"{source.stem}-{hashlib.sha1(str(source.resolve()).encode('utf-8')).hexdigest()[:8]}"
+    return storage_path("alumni", f"{name}.arrow"), storage_path("alumni", f"{name}.json")
+
+
+def _read_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def _open(source: Path) -> AlumniDataset:
+    arrow_path, manifest_path = _paths(source)
+    stat = source.stat()
+    manifest = _read_manifest(manifest_path)
+    fresh = (
+        manifest.get("version") == FORMAT_VERSION
+        and arrow_path.exists()
+        and manifest.get("size") == stat.st_size
+        and manifest.get("mtime_ns") == stat.st_mtime_ns
+    )
+    if not fresh:
+        digest = _file_digest(source)
+        if manifest.get("version") != FORMAT_VERSION or manifest.get("sha256") != digest or not arrow_path.exists():
+            logger.info("Converting %s to %s", source, arrow_path)
+            convert_workbook(source, arrow_path)
+        # A touched but unchanged file only needs its manifest refreshed
+        _write_manifest(manifest_path, {
+            "version": FORMAT_VERSION,
+            "source": str(source),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+        })
+
+    table = pa.ipc.open_file(pa.memory_map(str(arrow_path), "r")).read_all()
+    return AlumniDataset(table, source)
+
+
+_datasets: Dict[Path, Tuple[Tuple[int, int], AlumniDataset]] = {}
+_datasets_lock = threading.Lock()
+
+
+def load_alumni_dataset(file_path: Union[str, Path]) -> AlumniDataset:
+    """Return the memory-mapped dataset for a spreadsheet, converting it only when it changed.
+
+    Relative paths are resolved against the ``knowledge/`` directory, like crewAI's
+    ``ExcelKnowledgeSource``. Within a process the mapped table is reused until the
+    spreadsheet's size or modification time changes.
+    """
+    source = resolve_knowledge_path(file_path)
+    stat = source.stat()
+    key = (stat.st_size, stat.st_mtime_ns)
+    with _datasets_lock:
+        cached = _datasets.get(source)
+        if cached is None or cached[0] != key:
+            cached = (key, _open(source))
+            _datasets[source] = cached
+        return cached[1]
+
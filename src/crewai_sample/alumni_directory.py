@@ -0,0 +1,184 @@
+import bisect
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+
+from crewai_sample.alumni_dataset import AlumniDataset, load_alumni_dataset
+
+MEMBERSHIP_COLUMN = "Membership No."
+RECEIPT_COLUMN = "Receipt No."
+NAME_COLUMN = "Name / Batch / Branch"
+PAYMENT_DATE_COLUMN = "Date of Payment"
+
+
+def _normalize(value: Any) -> str:
+    return " ".join(re.sub(r"[^\w@.+]+", " ", str(value).lower()).split())
+
+
+def _key(value: Any) -> str:
+    """Exact-match key for identifiers: case and whitespace insensitive."""
+    return re.sub(r"\s+", "", str(value)).upper()
+
+
+def _phone_key(value: Any) -> Optional[str]:
+    """Last ten digits of a phone number, so '+91 90920 24442' matches '9092024442'."""
+    digits = re.sub(r"\D", "", str(value))
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+def normalize_batch(value: Any) -> Optional[str]:
+    """Graduation year as four digits; the sheets use both '77' and '1977'."""
+    digits = re.sub(r"\D", "", str(value or ""))
+    if len(digits) == 2:
+        return f"19{digits}" if int(digits) >= 40 else f"20{digits}"
+    return digits if len(digits) == 4 else None
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AlumniDirectory:
+    """In-memory indexes over an alumni dataset for exact lookups and aggregates.
+
+    Membership numbers, receipt numbers, e-mails and phone numbers get hash indexes;
+    names get a sorted token index for prefix search plus a trigram index for fuzzy
+    search. Counts by batch, branch, zone and payment period are computed up front.
+    """
+
+    def __init__(self, dataset: AlumniDataset):
+        self.records: List[Dict[str, Any]] = list(dataset.rows())
+        for record in self.records:
+            name, _, rest = str(record.get(NAME_COLUMN) or "").partition("/")
+            record["Name"] = name.strip() or None
+            record["Batch"] = normalize_batch(record.get("Batch") or rest.split("/")[0]) or record.get("Batch")
+            record["Paid"] = bool(record.get(PAYMENT_DATE_COLUMN) or record.get(RECEIPT_COLUMN))
+
+        self.by_membership: Dict[str, List[int]] = {}
+        self.by_receipt: Dict[str, List[int]] = {}
+        self.by_email: Dict[str, List[int]] = {}
+        self.by_phone: Dict[str, List[int]] = {}
+        self.by_batch: Dict[str, List[int]] = {}
+        name_tokens: List[Tuple[str, int]] = []
+        self.trigram_index: Dict[str, List[int]] = {}
+        self._names: List[str] = []
+
+        for row, record in enumerate(self.records):
+            if record.get(MEMBERSHIP_COLUMN):
+                self.by_membership.setdefault(_key(record[MEMBERSHIP_COLUMN]), []).append(row)
+            if record.get(RECEIPT_COLUMN):
+                self.by_receipt.setdefault(_key(record[RECEIPT_COLUMN]), []).append(row)
+            for value in record.values():
+                # E-mails and phone numbers also turn up in stray columns
+                if not isinstance(value, str):
+                    continue
+                if "@" in value:
+                    self.by_email.setdefault(value.strip().lower(), []).append(row)
+                elif (phone := _phone_key(value)) and not re.search(r"[A-Za-z/]", value):
+                    self.by_phone.setdefault(phone, []).append(row)
+            if record.get("Batch"):
+                self.by_batch.setdefault(record["Batch"], []).append(row)
+
+            name = _normalize(record.get("Name") or "")
+            self._names.append(name)
+            for token in name.split():
+                name_tokens.append((token, row))
+            for trigram in _trigrams(name):
+                self.trigram_index.setdefault(trigram, []).append(row)
+
+        name_tokens.sort()
+        self._name_tokens = [token for token, _ in name_tokens]
+        self._name_token_rows = [row for _, row in name_tokens]
+
+        self.stats = {
+            "members": len(self.records),
+            "paid": sum(1 for record in self.records if record["Paid"]),
+            "by_batch": dict(sorted(Counter(r["Batch"] for r in self.records if r.get("Batch")).items())),
+            "by_branch": dict(Counter(r["Branch"] for r in self.records if r.get("Branch")).most_common()),
+            "by_zone": dict(Counter(r["Zone"] for r in self.records if r.get("Zone")).most_common()),
+            "payments_by_financial_year": dict(sorted(Counter(
+                r[RECEIPT_COLUMN].split("/")[-1] for r in self.records if "/" in str(r.get(RECEIPT_COLUMN) or "")
+            ).items())),
+            "payments_by_month": dict(sorted(Counter(
+                r[PAYMENT_DATE_COLUMN][:7] for r in self.records if r.get(PAYMENT_DATE_COLUMN)
+            ).items())),
+        }
+
+    def _rows(self, rows: List[int]) -> List[Dict[str, Any]]:
+        return [self.records[row] for row in rows]
+
+    def member(self, membership_no: str) -> List[Dict[str, Any]]:
+        return self._rows(self.by_membership.get(_key(membership_no), []))
+
+    def receipt(self, receipt_no: str) -> List[Dict[str, Any]]:
+        return self._rows(self.by_receipt.get(_key(receipt_no), []))
+
+    def email(self, email: str) -> List[Dict[str, Any]]:
+        return self._rows(self.by_email.get(email.strip().lower(), []))
+
+    def phone(self, phone: str) -> List[Dict[str, Any]]:
+        return self._rows(self.by_phone.get(_phone_key(phone) or "", []))
+
+    def batch(self, batch: Union[str, int], branch: Optional[str] = None) -> List[Dict[str, Any]]:
+        records = self._rows(self.by_batch.get(normalize_batch(batch) or "", []))
+        if branch:
+            records = [r for r in records if _normalize(r.get("Branch") or "") == _normalize(branch)]
+        return records
+
+    def search_name(self, name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Members whose name has every query word as a word prefix; falls back to fuzzy matches."""
+        query = _normalize(name)
+        if not query:
+            return []
+
+        matches: Optional[set] = None
+        for token in query.split():
+            start = bisect.bisect_left(self._name_tokens, token)
+            end = bisect.bisect_left(self._name_tokens, token + "\uffff")
+            rows = set(self._name_token_rows[start:end])
+            matches = rows if matches is None else matches & rows
+        if matches:
+            ranked = sorted(matches, key=lambda row: (self._names[row] != query, self._names[row]))
+            return self._rows(ranked[:limit])
+
+        # Trigram similarity for misspelt names
+        query_trigrams = _trigrams(query)
+        shared = Counter(row for trigram in query_trigrams for row in self.trigram_index.get(trigram, []))
+        scored = []
+        for row, count in shared.items():
+            similarity = count / (len(query_trigrams) + len(_trigrams(self._names[row])) - count)
+            if similarity >= 0.3:
+                scored.append((-similarity, row))
+        return self._rows([row for _, row in sorted(scored)[:limit]])
+
+    @staticmethod
+    def describe(record: Dict[str, Any]) -> str:
+        """One line summary of a member, including payment status."""
+        parts = [f"{record.get('Name') or 'Unknown'} ({record.get(MEMBERSHIP_COLUMN) or 'no membership no.'})"]
+        parts.append(f"batch {record.get('Batch') or '?'}, {record.get('Branch') or '?'}")
+        if record["Paid"]:
+            parts.append(f"paid on {record.get(PAYMENT_DATE_COLUMN) or '?'}, receipt {record.get(RECEIPT_COLUMN) or '?'}")
+        else:
+            parts.append("no payment recorded")
+        for column in ("E Mail", "Mob No", "Zone"):
+            if record.get(column):
+                parts.append(f"{column}: {record[column]}")
+        return "; ".join(parts)
+
+
+_directories: Dict[Path, Tuple[AlumniDataset, AlumniDirectory]] = {}
+_directories_lock = threading.Lock()
+
+
+def get_alumni_directory(file_path: Union[str, Path]) -> AlumniDirectory:
+    """Return the directory for a spreadsheet, rebuilding its indexes when the data changes."""
+    dataset = load_alumni_dataset(file_path)
+    with _directories_lock:
+        cached = _directories.get(dataset.source)
+        if cached is None or cached[0] is not dataset:
+            cached = (dataset, AlumniDirectory(dataset))
+            _directories[dataset.source] = cached
+        return cached[1]
@@ -0,0 +1,68 @@
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+from typing import Dict, Any
+import threading
+from pydantic import Field, PrivateAttr
+
+from crewai_sample.alumni_dataset import AlumniDataset, load_alumni_dataset
+from crewai_sample.embedding_index import EmbeddingIndex, sync_records
+from crewai_sample.record_format import format_record
+from crewai_sample.tracing import span
+
+# Columns that identify an alumni record, in order of preference
+RECORD_KEYS = ("Membership No.", "Receipt No.")
+
+
+class AlumniKnowledgeSource(BaseKnowledgeSource):
+    """Knowledge source over an alumni spreadsheet, read from its memory-mapped columnar copy.
+
+    Records are embedded one by one and tracked in an ``EmbeddingIndex``, so only
+    records that are new or changed since the last run are sent to the embedder.
+    """
+
+    file_path: str = Field(description="Alumni spreadsheet, relative to the knowledge/ directory")
+
+    _sync_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def dataset(self) -> AlumniDataset:
+        return load_alumni_dataset(self.file_path)
+
+    def load_content(self) -> Dict[Any, str]:
+        """Format every alumni record into readable text."""
+        records = self.dataset().rows()
+        return {self.file_path: "\n\n".join(self._format_record(record) for record in records)}
+
+    def _format_record(self, record: Dict[str, Any]) -> str:
+        """Format one alumni record as `column: value` lines, skipping blank cells."""
+        return format_record(record)
+
+    def _record_id(self, row: int, record: Dict[str, Any]) -> str:
+        for column in RECORD_KEYS:
+            if record.get(column):
+                return record[column]
+        return f"row:{row}"
+
+    def add(self) -> None:
+        """Embed new or changed records and delete the ones removed from the spreadsheet."""
+        with self._sync_lock, span("knowledge_sync", source=self.file_path):
+            self._sync()
+
+    def _sync(self) -> None:
+        index = EmbeddingIndex.for_collection(
+            self.collection_name or self.storage.collection_name or "knowledge", self.file_path
+        )
+        records = {}
+        for row, record in enumerate(self.dataset().rows()):
+            record_id = self._record_id(row, record)
+            # Duplicate keys (e.g. a renewed membership) are kept as separate records
+            if record_id in records:
+                record_id = f"{record_id}#{row}"
+            records[record_id] = self._format_record(record)
+
+        # One chunk per record, so every retrieved chunk is a complete record
+        sync_records(
+            self.storage,
+            index,
+            self.file_path,
+            "record_id",
+            ((record_id, chunk, dict(self.metadata)) for record_id, chunk in records.items()),
+        )
@@ -0,0 +1,143 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+def normalize_question(question: str) -> str:
+    """Canonical form used for exact matches: lowercase, single spaces, no trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+class _Entry:
+    def __init__(self, answer: str, vector: Optional[np.ndarray], numbers: tuple):
+        self.answer = answer
+        self.vector = vector
+        self.numbers = numbers
+        self.created_at = time.monotonic()
+
+
+class AnswerCache:
+    """Thread-safe LRU/TTL cache of crew answers with exact and semantic lookup.
+
+    Semantic hits need a cosine similarity of at least ``similarity_threshold`` and the
+    same numbers in both questions, so "2-bed under $2000" never answers "3-bed under
+    $2000". The cache empties itself whenever it is used with a new data ``version``;
+    versions it has moved on from are refused, so a turn that started on older data
+    can neither read nor store answers. If the embedder fails, a lookup is an exact
+    match only and an answer is stored for exact matches only.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl: float = 3600,
+        similarity_threshold: float = 0.95,
+        embed: Optional[EmbedFn] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._retired: "deque[str]" = deque(maxlen=64)
+        self._lock = threading.Lock()
+
+    def get(self, question: str, version: Optional[str] = None) -> Optional[str]:
+        """Return a cached answer for the question, or None on a miss."""
+        key = normalize_question(question)
+        with self._lock:
+            if not self._check_version(version):
+                self.misses += 1
+                return None
+            self._evict_expired()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.answer
+            if self.embed is None or not self._entries:
+                self.misses += 1
+                return None
+
+        # Embed outside the lock; the provider call is the slow part
+        vector = self._embed(key)
+        if vector is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        numbers = tuple(_NUMBER.findall(key))
+        with self._lock:
+            best_key, best_score = None, self.similarity_threshold
+            for candidate_key, entry in self._entries.items():
+                if entry.vector is None or entry.numbers != numbers:
+                    continue
+                score = float(np.dot(vector, entry.vector))
+                if score >= best_score:
+                    best_key, best_score = candidate_key, score
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key].answer
+
+    def put(self, question: str, answer: str, version: Optional[str] = None) -> None:
+        """Cache the answer to a question computed against the given data version."""
+        key = normalize_question(question)
+        vector = self._embed(key) if self.embed is not None else None
+        with self._lock:
+            if not self._check_version(version):
+                return
+            self._entries[key] = _Entry(answer, vector, tuple(_NUMBER.findall(key)))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, version: Optional[str]) -> bool:
+        """Move to a new data version; returns False for a version the cache has left behind."""
+        if version is None or version == self._version:
+            return True
+        if version in self._retired:
+            return False
+        if self._version is not None:
+            self._retired.append(self._version)
+        self._entries.clear()
+        self._version = version
+        return True
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        # Entries are not reordered by age, so scan them all; the cache is small
+        expired = [key for key, entry in self._entries.items() if entry.created_at < cutoff]
+        for key in expired:
+            del self._entries[key]
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(self.embed([text])[0], dtype=np.float32)
+        except Exception as e:
+            logger.warning("Answer cache embedding failed; using exact matches only: %s", e)
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,179 @@
+"""Answer a file of questions with the real estate crew.
+
+Questions are read from JSONL (``{"id": ..., "question": ...}`` objects or plain JSON
+strings, one per line) or CSV (a ``question`` column and an optional ``id`` column)
+and answered concurrently by pooled crews, which share the answer cache. Every answer
+is appended to the output JSONL as soon as it is ready, together with its timing; the
+output doubles as the checkpoint, so running the same command again after an
+interruption only answers the questions that are still missing or failed::
+
+    batch questions.csv --output answers.jsonl --workers 8
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("BATCH_WORKERS", "8"))
+
+
+def read_questions(path: str) -> List[Dict[str, str]]:
+    """Load ``[{"id", "question"}]`` from a JSONL or CSV file; ids default to the 1-based row number."""
+    records: List[Dict[str, Any]] = []
+    if Path(path).suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            column = "question" if "question" in (reader.fieldnames or []) else (reader.fieldnames or [None])[0]
+            if column is None:
+                raise ValueError(f"{path} has no header row.")
+            records = [{"id": row.get("id"), "question": row.get(column)} for row in reader]
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                records.append(record if isinstance(record, dict) else {"question": record})
+
+    questions = []
+    seen = set()
+    for row, record in enumerate(records, start=1):
+        question = " ".join(str(record.get("question") or "").split())
+        if not question:
+            continue
+        question_id = str(record.get("id") or row)
+        if question_id in seen:
+            raise ValueError(f"Duplicate question id {question_id!r} in {path}.")
+        seen.add(question_id)
+        questions.append({"id": question_id, "question": question})
+    return questions
+
+
+def read_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    """Results already written to the output, by question id; a torn last line is ignored."""
+    done: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[str(result["id"])] = result
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class BatchWriter:
+    """Appends one JSON line per answered question, flushed right away."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a+", encoding="utf-8")
+        self._lock = threading.Lock()
+        # Start on a fresh line if an interrupted run left a torn one behind
+        if self._file.tell() > 0:
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def write(self, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_batch(
+    questions: Sequence[Dict[str, str]],
+    output: str,
+    workers: int = DEFAULT_WORKERS,
+    api_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Answer the questions that have no successful answer in ``output`` yet."""
+    from crewai_sample.crew_pool import crew_pool
+    from crewai_sample.real_estate_crew import handle_user_input
+
+    done = read_checkpoint(output)
+    # Failed questions are asked again
+    pending = [q for q in questions if q["id"] not in done or done[q["id"]].get("error")]
+    logger.info("%d of %d questions already answered; %d to go", len(questions) - len(pending), len(questions), len(pending))
+    if not pending:
+        return {"answered": 0, "failed": 0, "skipped": len(questions), "seconds": 0.0}
+
+    # Keep one crew per worker instead of rebuilding the ones over the idle limit
+    crew_pool.max_idle = max(crew_pool.max_idle, workers)
+    crew_pool.warm("real_estate", api_key, count=min(workers, len(pending)))
+
+    def answer(question: Dict[str, str]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result: Dict[str, Any] = {**question, "answer": None, "error": None}
+        try:
+            result["answer"] = handle_user_input(question["question"], api_key=api_key)
+        except Exception as e:
+            logger.exception("Question %s failed", question["id"])
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        result["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        return result
+
+    writer = BatchWriter(output)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+    start = time.perf_counter()
+    answered = failed = 0
+    try:
+        futures = [executor.submit(answer, question) for question in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            writer.write(result)
+            answered += 1
+            failed += result["error"] is not None
+            elapsed = time.perf_counter() - start
+            if answered % 10 == 0 or answered == len(pending):
+                logger.info(
+                    "Answered %d/%d (%d failed), %.2f questions/s, about %.0fs left",
+                    answered, len(pending), failed, answered / elapsed,
+                    (len(pending) - answered) * elapsed / answered,
+                )
+    finally:
+        # On an interrupt, drop the questions not started yet; finished ones are already saved
+        executor.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+    return {
+        "answered": answered - failed,
+        "failed": failed,
+        "skipped": len(questions) - len(pending),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Answer a JSONL or CSV file of questions with the real estate crew.")
+    parser.add_argument("input", help="Questions as JSONL or CSV")
+    parser.add_argument("--output", help="Answers as JSONL (default: <input>.answers.jsonl); also the checkpoint")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Questions answered at once")
+    parser.add_argument("--api-key", default=None, help="OpenAI API key (default: OPENAI_API_KEY)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    output = args.output or str(Path(args.input).with_suffix(".answers.jsonl"))
+    summary = run_batch(read_questions(args.input), output, workers=args.workers, api_key=args.api_key)
+    logger.info(
+        "Done: %d answered, %d failed, %d already answered, in %.1fs; answers in %s",
+        summary["answered"], summary["failed"], summary["skipped"], summary["seconds"], output,
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    run()
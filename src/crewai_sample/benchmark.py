@@ -0,0 +1,454 @@
+"""Offline benchmark of the chat bots.
+
+Drives ``handle_user_input`` of the real estate, e-commerce and CIT alumni bots against
+a local mock of the listings and products APIs, a recorded-LLM stand-in and a
+deterministic hashing embedder, each with a configurable latency. Every listing scale
+runs in its own process, so the storage, pools and peak RSS of one scale never leak
+into the next. No network access or API keys are needed::
+
+    benchmark --scales 1000,10000,100000 --questions 50 --concurrency 4 --output bench.json
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import re
+import resource
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+BOTS = ("real_estate", "ecommerce", "cit_alumni")
+
+LOCATIONS = ("Brooklyn, NY", "Austin, TX", "Seattle, WA", "Denver, CO", "Miami, FL", "Chicago, IL", "Boston, MA")
+PROPERTY_TYPES = ("Apartment", "Condo", "House", "Townhouse", "Studio")
+CATEGORIES = ("laptops", "smartphones", "fragrances", "groceries", "furniture", "beauty", "sports-accessories")
+BRANDS = ("Apple", "Samsung", "Acme", "Globex", "Initech", "Umbrella", "Hooli")
+
+# Answer format the agents parse; anything after the marker is the final answer
+ANSWER_TEMPLATE = "Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+def _rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# --- Local listings and products API -------------------------------------------------
+
+
+def make_listings(count: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    listings = []
+    for i in range(count):
+        property_type = rng.choice(PROPERTY_TYPES)
+        location = rng.choice(LOCATIONS)
+        bedrooms = 0 if property_type == "Studio" else rng.randint(1, 5)
+        listings.append({
+            "id": i + 1,
+            "title": f"{bedrooms or 'Studio'} bed {property_type.lower()} #{i + 1} in {location.split(',')[0]}",
+            "price": rng.randrange(800, 9000, 25),
+            "location": location,
+            "bedrooms": bedrooms,
+            "bathrooms": rng.randint(1, max(bedrooms, 1)),
+            "property_type": property_type,
+            "date_added": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "images": [f"https://images.example.com/{i + 1}/{n}.jpg" for n in range(2)],
+        })
+    return listings
+
+
+def make_products(count: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed + 1)
+    products = []
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        brand = rng.choice(BRANDS)
+        products.append({
+            "id": i + 1,
+            "title": f"{brand} {category.rstrip('s')} model {i + 1}",
+            "description": f"A {rng.choice(('compact', 'premium', 'budget', 'durable'))} {category.rstrip('s')} by {brand}.",
+            "price": round(rng.uniform(5, 2500), 2),
+            "category": category,
+            "brand": brand,
+            "rating": round(rng.uniform(1, 5), 2),
+            "stock": rng.randint(0, 500),
+            "meta": {"qrCode": f"https://qr.example.com/{i + 1}.png"},
+        })
+    return products
+
+
+class MockCatalogServer:
+    """Serves synthetic listings (``/listings``, with an ETag) and products (``/products``,
+    paginated with ``limit``/``skip``) from a background thread, each request delayed by ``latency``."""
+
+    def __init__(self, listings: List[dict], products: List[dict], latency: float = 0.0):
+        self.products = products
+        self.latency = latency
+        self.listings_body = json.dumps({"success": True, "data": listings}).encode("utf-8")
+        self.listings_etag = f'"{hashlib.sha1(self.listings_body).hexdigest()}"'
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockCatalogServer":
+        threading.Thread(target=self._server.serve_forever, name="mock-catalog", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlparse(self.path)
+                if url.path == "/listings":
+                    if self.headers.get("If-None-Match") == server.listings_etag:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    self._send(server.listings_body, etag=server.listings_etag)
+                elif url.path == "/products":
+                    query = parse_qs(url.query)
+                    limit = int(query.get("limit", ["30"])[0])
+                    skip = int(query.get("skip", ["0"])[0])
+                    page = server.products[skip:skip + limit]
+                    body = {"products": page, "total": len(server.products), "skip": skip, "limit": limit}
+                    self._send(json.dumps(body).encode("utf-8"))
+                else:
+                    self.send_error(404)
+
+            def _send(self, body: bytes, etag: Optional[str] = None):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# --- Deterministic model stand-ins ---------------------------------------------------
+
+
+def _hashing_embedding_function(dimensions: int, latency: float):
+    from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+    class HashingEmbeddingFunction(EmbeddingFunction[Documents]):
+        """Bag-of-words feature hashing: deterministic, offline, and similar texts get similar vectors."""
+
+        def __call__(self, input: Documents) -> Embeddings:
+            if latency:
+                time.sleep(latency)
+            embeddings = []
+            for text in input:
+                vector = [0.0] * dimensions
+                for word in re.findall(r"\w+", text.lower()):
+                    digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+                    bucket = int.from_bytes(digest[:4], "little") % dimensions
+                    vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+                norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+                embeddings.append([v / norm for v in vector])
+            return embeddings
+
+    return HashingEmbeddingFunction()
+
+
+def _recorded_llm_class():
+    import litellm
+
+    from crewai_sample.streaming import StreamingLLM
+    from crewai_sample.tracing import span
+
+    class RecordedLLM(StreamingLLM):
+        """LLM stand-in that answers after ``latency`` seconds without calling any API.
+
+        A question found in ``recordings`` gets its recorded answer; any other prompt is
+        answered with the first knowledge record it contains, so answers stay
+        deterministic for a given prompt.
+        """
+
+        def __init__(self, *args: Any, latency: float = 0.0, recordings: Optional[Dict[str, str]] = None,
+                     **kwargs: Any):
+            super().__init__(*args, **kwargs)
+            self.latency = latency
+            self.recordings = recordings or {}
+
+        def respond(self, messages: List[Dict[str, str]]) -> str:
+            prompt = "\n".join(str(message.get("content") or "") for message in messages)
+            for question, answer in self.recordings.items():
+                if question in prompt:
+                    return ANSWER_TEMPLATE.format(answer=answer)
+            record = re.search(r"^(?:Title|Name|Name / Batch / Branch): .+$", prompt, re.MULTILINE)
+            return ANSWER_TEMPLATE.format(answer=record.group(0) if record else "No matching records were found.")
+
+        def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+            with span("llm", model=self.model) as llm_span:
+                if self.latency:
+                    time.sleep(self.latency)
+                text = self.respond(messages)
+                llm_span.add_tokens("prompt", litellm.token_counter(model=self.model, messages=messages))
+                llm_span.add_tokens("completion", litellm.token_counter(model=self.model, text=text))
+                return text
+
+    return RecordedLLM
+
+
+# --- Workloads -----------------------------------------------------------------------
+
+
+def real_estate_questions(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    templates = (
+        lambda: f"Show me {rng.randint(1, 4)} bedroom {rng.choice(PROPERTY_TYPES).lower()}s in {rng.choice(LOCATIONS)}",
+        lambda: f"What is the cheapest {rng.choice(PROPERTY_TYPES).lower()} in {rng.choice(LOCATIONS)}?",
+        lambda: f"Are there listings under ${rng.randrange(1000, 5000, 500)} per month?",
+        lambda: "What are the current rental trends?",
+    )
+    return [rng.choice(templates)() for _ in range(count)]
+
+
+def ecommerce_questions(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 1)
+    templates = (
+        lambda: f"Which {rng.choice(CATEGORIES)} does {rng.choice(BRANDS)} sell?",
+        lambda: f"What is the best rated product in {rng.choice(CATEGORIES)}?",
+        lambda: f"Recommend a {rng.choice(CATEGORIES).rstrip('s')} under ${rng.randrange(50, 1000, 50)}",
+    )
+    return [rng.choice(templates)() for _ in range(count)]
+
+
+def alumni_questions(count: int, seed: int = 0, file_path: str = "cit_alumni_master.xlsx") -> List[str]:
+    from crewai_sample.alumni_dataset import load_alumni_dataset
+
+    rng = random.Random(seed + 2)
+    records = [record for record in load_alumni_dataset(file_path).rows() if record.get("Membership No.")]
+    questions = []
+    for _ in range(count):
+        record = rng.choice(records)
+        questions.append(rng.choice((
+            f"What is the membership number of {record['Name / Batch / Branch']}?",
+            f"How many alumni from the {record.get('Batch')} batch have paid?",
+            f"Who holds membership {record['Membership No.']}?",
+        )))
+    return questions
+
+
+def _run_questions(answer: Callable[[str], str], questions: Sequence[str], concurrency: int) -> Dict[str, Any]:
+    def ask(question: str) -> bool:
+        try:
+            answer(question)
+            return True
+        except Exception:
+            logger.exception("Question failed: %s", question)
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        answered = list(executor.map(ask, questions))
+    seconds = time.perf_counter() - start
+    return {
+        "questions": len(questions),
+        "errors": answered.count(False),
+        "seconds": seconds,
+        "questions_per_second": len(questions) / seconds if seconds else 0.0,
+    }
+
+
+def _configure_offline_environment(storage_dir: str, server_url: str) -> None:
+    # Must happen before crewAI, litellm or the bot modules are imported
+    os.environ.update({
+        "CREWAI_STORAGE_DIR": storage_dir,
+        "REAL_ESTATE_API_ENDPOINTS": f"{server_url}/listings",
+        "PRODUCT_API_ENDPOINT": f"{server_url}/products",
+        "OPENAI_API_KEY": "offline",
+        "CHROMA_OPENAI_API_KEY": "offline",
+        "GEMINI_API_KEY": "offline",
+        "OTEL_SDK_DISABLED": "true",
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+    })
+    os.environ.pop("KNOWLEDGE_RERANK_MODEL", None)
+
+
+def run_scale(scale: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Benchmark every bot at one listing scale; meant to run in a fresh process."""
+    server = MockCatalogServer(
+        make_listings(scale, options["seed"]), make_products(scale, options["seed"]), latency=options["api_latency"]
+    ).start()
+    storage_dir = f"crewai_sample_benchmark_{scale}_{os.getpid()}"
+    _configure_offline_environment(storage_dir, server.url)
+    if not options["verbose"]:
+        # The crews are verbose; keep their transcripts out of the report
+        sys.stdout = open(os.devnull, "w")
+
+    from functools import partial
+
+    from crewai.utilities.paths import db_storage_path
+
+    from crewai_sample import alumni_crew, ecom_crew, real_estate_crew
+    from crewai_sample.crew_pool import crew_pool, set_llm_factory
+    from crewai_sample.embedding_scheduler import set_embedding_function_factory
+    from crewai_sample.tracing import metrics
+
+    recordings = {}
+    if options["recordings"]:
+        with open(options["recordings"], encoding="utf-8") as f:
+            recordings = json.load(f)
+    set_llm_factory(partial(_recorded_llm_class(), latency=options["llm_latency"], recordings=recordings))
+    set_embedding_function_factory(
+        lambda config: _hashing_embedding_function(options["dimensions"], options["embed_latency"])
+    )
+
+    workloads = {
+        "real_estate": (real_estate_crew.handle_user_input, real_estate_questions),
+        "ecommerce": (ecom_crew.handle_user_input, ecommerce_questions),
+        "cit_alumni": (alumni_crew.handle_user_input, alumni_questions),
+    }
+    result: Dict[str, Any] = {"scale": scale, "bots": {}}
+    try:
+        for bot in options["bots"]:
+            answer, make_questions = workloads[bot]
+            metrics.reset()
+            start = time.perf_counter()
+            crew_pool.warm(bot, count=options["concurrency"])
+            ingest_seconds = time.perf_counter() - start
+            run = _run_questions(answer, make_questions(options["questions"], options["seed"]), options["concurrency"])
+            result["bots"][bot] = {
+                **run,
+                "ingest_seconds": ingest_seconds,
+                "peak_rss_mb": _rss_mb(),
+                **metrics.snapshot(),
+            }
+            crew_pool.clear(bot)
+        result["mock_api_requests"] = server.requests
+    finally:
+        server.stop()
+        if not options["keep_storage"]:
+            shutil.rmtree(db_storage_path(), ignore_errors=True)
+    return result
+
+
+def _child(scale: int, options: Dict[str, Any], results: "multiprocessing.Queue") -> None:
+    try:
+        results.put(run_scale(scale, options))
+    except BaseException as e:
+        results.put({"scale": scale, "error": f"{type(e).__name__}: {e}"})
+        raise
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    lines = []
+    for result in results:
+        lines.append(f"== {result['scale']:,} listings ==")
+        if "error" in result:
+            lines.append(f"  failed: {result['error']}")
+            continue
+        for bot, stats in result["bots"].items():
+            lines.append(
+                f"  {bot}: {stats['questions_per_second']:.2f} questions/s "
+                f"({stats['questions']} questions, {stats['errors']} errors), "
+                f"ingest {stats['ingest_seconds']:.1f}s, peak RSS {stats['peak_rss_mb']:.0f} MB"
+            )
+            for stage, stage_stats in stats["stages"].items():
+                lines.append(
+                    f"    {stage:<16} n={stage_stats['count']:<6} p50={stage_stats['p50'] * 1000:9.1f}ms "
+                    f"p95={stage_stats['p95'] * 1000:9.1f}ms p99={stage_stats['p99'] * 1000:9.1f}ms"
+                )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline throughput and latency benchmark of the chat bots.")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Comma-separated numbers of listings (and products) to serve")
+    parser.add_argument("--bots", default=",".join(BOTS), help="Comma-separated bots to benchmark")
+    parser.add_argument("--questions", type=int, default=50, help="Questions asked per bot")
+    parser.add_argument("--concurrency", type=int, default=4, help="Questions in flight at once")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per LLM call")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="Seconds per embedding request")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds per mock API request")
+    parser.add_argument("--dimensions", type=int, default=256, help="Size of the fake embeddings")
+    parser.add_argument("--recordings", help="JSON file mapping questions to recorded answers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--keep-storage", action="store_true", help="Keep each scale's vector store")
+    parser.add_argument("--verbose", action="store_true", help="Show the crews' output")
+    return parser.parse_args(argv)
+
+
+def run(argv: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    options = {
+        "bots": [bot for bot in args.bots.split(",") if bot],
+        "questions": args.questions,
+        "concurrency": args.concurrency,
+        "llm_latency": args.llm_latency,
+        "embed_latency": args.embed_latency,
+        "api_latency": args.api_latency,
+        "dimensions": args.dimensions,
+        "recordings": args.recordings,
+        "seed": args.seed,
+        "keep_storage": args.keep_storage,
+        "verbose": args.verbose,
+    }
+    unknown = set(options["bots"]) - set(BOTS)
+    if unknown:
+        raise SystemExit(f"Unknown bots: {', '.join(sorted(unknown))}")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for scale in (int(s) for s in args.scales.split(",") if s):
+        queue = context.Queue()
+        process = context.Process(target=_child, args=(scale, options, queue), name=f"benchmark-{scale}")
+        process.start()
+        while True:
+            try:
+                result = queue.get(timeout=1)
+                break
+            except Empty:
+                if not process.is_alive():
+                    result = {"scale": scale, "error": f"benchmark process exited with code {process.exitcode}"}
+                    break
+        process.join()
+        results.append(result)
+        print(format_report([result]), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    run()
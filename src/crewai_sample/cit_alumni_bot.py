@@ -1,11 +1,17 @@
 from dotenv import load_dotenv
 import os
 import streamlit as st
-from crewai import Agent, Task, Crew, Process, LLM
-from crewai.knowledge.source.excel_knowledge_source import ExcelKnowledgeSource
-from crewai.knowledge.storage.knowledge_storage import KnowledgeStorage
-from crewai.knowledge.knowledge import Knowledge
+from crewai import Task, Crew, Process
 import chromadb.utils.embedding_functions.google_embedding_function as embedding_functions
+from typing import Optional
+
+from crewai_sample.alumni_knowledge import AlumniKnowledgeSource
+from crewai_sample.crew_pool import crew_pool, shared_llm
+from crewai_sample.embedding_scheduler import scheduled_embedder
+from crewai_sample.hybrid_knowledge import HybridKnowledgeAgent
+from crewai_sample.streaming import AnswerStream
+from crewai_sample.tools.alumni_lookup_tool import AlumniLookupTool
+from crewai_sample.tracing import serve_metrics, span
 
 # Load environment variables
 load_dotenv()
@@ -18,35 +24,54 @@ model_name = os.getenv("MODEL")
 #     api_key=gemini_api_key
 # )
 
-storage = KnowledgeStorage(
-    embedder_config={
-        "provider": "google",
-        "config": {
-            "model": "models/text-embedding-004",
-            "api_key": gemini_api_key
-        }
-    }
-)
-storage.initialize_knowledge_storage()
-
-excel_source = ExcelKnowledgeSource(file_paths=["knowledge/cit_alumni.xls"])
-knowledge = Knowledge(collection_name="excel_knowledge", sources=[excel_source])
-
-knowledge.storage = storage
-knowledge.add()
-gemini_llm = LLM(
-    model="gemini/gemini-1.5-pro-002",
-    api_key=gemini_api_key,
-    temperature=0,
-)
-
-# Initialize CIT Alumni Agent
-cit_alumni_agent = Agent(
-    role="CIT Alumni Information Assistant",
-    goal="Provide accurate information about CIT alumni.",
-    backstory="You specialize in providing alumni information including payments, membership details, and personal data.",
-    llm=gemini_llm
-)
+
+@st.cache_resource
+def load_alumni_source() -> AlumniKnowledgeSource:
+    """Load the alumni spreadsheet once per process instead of on every rerun.
+
+    Records already embedded by an earlier run are skipped, so only a changed
+    spreadsheet costs embedding calls.
+    """
+    return AlumniKnowledgeSource(file_path="cit_alumni.xlsx")
+
+
+def build_alumni_crew(api_key: Optional[str] = None) -> Crew:
+    """Create the CIT alumni agent and a crew whose task takes the question as an input."""
+    # Initialize CIT Alumni Agent; its knowledge is searched for every task
+    cit_alumni_agent = HybridKnowledgeAgent(
+        role="CIT Alumni Information Assistant",
+        goal="Provide accurate information about CIT alumni.",
+        backstory="You specialize in providing alumni information including payments, membership details, and personal data.",
+        knowledge_sources=[load_alumni_source()],
+        embedder_config=scheduled_embedder({
+            "provider": "google",
+            "config": {
+                "model": "models/text-embedding-004",
+                "api_key": api_key
+            }
+        }),
+        tools=[AlumniLookupTool(file_path="cit_alumni.xlsx")],
+        llm=shared_llm("gemini/gemini-1.5-pro-002", api_key=api_key, temperature=0)
+    )
+
+    task = Task(
+        description="Answer this CIT alumni query: {user_question}",
+        expected_output="A detailed answer based on the CIT alumni data.",
+        agent=cit_alumni_agent
+    )
+
+    return Crew(
+        agents=[cit_alumni_agent],
+        tasks=[task],
+        verbose=True,
+        process=Process.sequential,
+    )
+
+
+crew_pool.register("cit_alumni_bot", build_alumni_crew)
+
+# Expose per-stage metrics when METRICS_PORT is set
+serve_metrics()
 
 # Streamlit Chatbot UI
 st.title("🎓 CIT Alumni Chatbot")
@@ -66,33 +91,17 @@ if user_input := st.chat_input("Type your question here..."):
     st.session_state.messages.append({"role": "user", "content": user_input})
     st.chat_message("user").write(user_input)
 
-    # Create a task and initialize Crew
-    task = Task(
-        description=f"Answer this CIT alumni query: {user_input}",
-        expected_output="A detailed answer based on the CIT alumni data.",
-        agent=cit_alumni_agent
-    )
-
-    crew = Crew(
-        agents=[cit_alumni_agent],
-        tasks=[task],
-        verbose=True,
-        process=Process.sequential,
-    #     knowledge_sources=[knowledge],
-    #     embedder={
-    #     "provider": "google",
-    #     "config": {
-    #         "model": "models/text-embedding-004",
-    #         "api_key": gemini_api_key,
-    #     }
-    # }
-    )
+    def answer() -> str:
+        with span("chat_turn", bot="cit_alumni_bot"):
+            with crew_pool.checkout("cit_alumni_bot", gemini_api_key) as crew, span("kickoff", bot="cit_alumni_bot"):
+                return crew.kickoff(inputs={"user_question": user_input}).raw
 
-    # Execute and handle results
+    # Execute and stream the answer into the chat bubble as it is generated
     try:
-        result = crew.kickoff(inputs={"user_question": user_input})
-        st.session_state.messages.append({"role": "assistant", "content": result})
-        st.chat_message("assistant").write(result)
+        with span("render", bot="cit_alumni_bot"):
+            stream = AnswerStream(answer)
+            st.chat_message("assistant").write_stream(stream)
+        st.session_state.messages.append({"role": "assistant", "content": stream.result})
     except Exception as e:
         error_message = f"An error occurred: {str(e)}"
         st.session_state.messages.append({"role": "assistant", "content": error_message})
@@ -0,0 +1,130 @@
+import logging
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import litellm
+from crewai.knowledge.knowledge import Knowledge
+from crewai.utilities.constants import DEFAULT_SCORE_THRESHOLD
+
+from crewai_sample.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Tokens of retrieved knowledge allowed into one prompt, per model
+CONTEXT_BUDGETS: Dict[str, int] = {
+    "gpt-4o-mini": 1200,
+    "gemini/gemini-1.5-pro-002": 3000,
+}
+DEFAULT_CONTEXT_BUDGET = int(os.getenv("KNOWLEDGE_CONTEXT_BUDGET", "1200"))
+
+SHARED_HEADER = "Shared by every record below:"
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+class ContextPacker:
+    """Turns retrieved knowledge chunks into the smallest useful prompt context.
+
+    Chunks are taken in retrieval order (best first). Exact and near duplicates, and
+    chunks contained in a better one, are dropped. ``Label: value`` lines repeated in
+    every remaining chunk are hoisted into one shared header. Chunks are then packed
+    greedily until the model's token budget is used up.
+    """
+
+    def __init__(self, model: Optional[str] = None, budget: Optional[int] = None, candidates: int = 10,
+                 similarity: float = 0.9):
+        self.model = model or "gpt-4o-mini"
+        self.budget = budget or CONTEXT_BUDGETS.get(self.model, DEFAULT_CONTEXT_BUDGET)
+        self.candidates = candidates
+        self.similarity = similarity
+
+    def count_tokens(self, text: str) -> int:
+        return litellm.token_counter(model=self.model, text=text)
+
+    def dedupe(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        kept: List[Dict[str, Any]] = []
+        kept_words: List[set] = []
+        for result in results:
+            text = " ".join(str(result.get("context") or "").split())
+            if not text:
+                continue
+            words = _words(text)
+            duplicate = False
+            for other, other_words in zip(kept, kept_words):
+                other_text = " ".join(other["context"].split())
+                overlap = len(words & other_words) / max(len(words | other_words), 1)
+                if text in other_text or overlap >= self.similarity:
+                    duplicate = True
+                    break
+            if not duplicate:
+                kept.append(result)
+                kept_words.append(words)
+        return kept
+
+    @staticmethod
+    def shared_lines(texts: List[str]) -> List[str]:
+        """``Label: value`` lines that appear in every text (only meaningful for two or more)."""
+        if len(texts) < 2:
+            return []
+        counts = Counter(line for text in texts for line in set(text.splitlines()) if ": " in line)
+        return [line for line, count in counts.items() if count == len(texts)]
+
+    def pack(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the packed results; the first one carries the shared header, if any."""
+        if not results:
+            return []
+        with span("pack", candidates=len(results)) as pack_span:
+            raw_tokens = sum(self.count_tokens(str(result.get("context") or "")) for result in results)
+            unique = self.dedupe(results)
+
+            shared = set(self.shared_lines([result["context"] for result in unique]))
+            header = f"{SHARED_HEADER}\n" + "\n".join(
+                line for line in unique[0]["context"].splitlines() if line in shared
+            ) if shared else ""
+
+            records: List[Dict[str, Any]] = []
+            used = self.count_tokens(header) if header else 0
+            for result in unique:
+                text = "\n".join(line for line in result["context"].splitlines() if line not in shared).strip()
+                tokens = self.count_tokens(text)
+                if used + tokens > self.budget:
+                    continue
+                used += tokens
+                # The agent joins contexts with single newlines; keep records visibly apart
+                records.append({**result, "context": f"{text}\n"})
+            if not records:
+                header, used = "", 0
+
+            packed = [{"id": "shared", "metadata": {}, "context": f"{header}\n", "score": None}] if header else []
+            packed.extend(records)
+            pack_span.set("chunks", len(records))
+            pack_span.add_tokens("context", used)
+            pack_span.add_tokens("saved", max(raw_tokens - used, 0))
+        logger.info(
+            "Packed %d of %d retrieved chunks into %d tokens (budget %d, saved %d)",
+            len(records), len(results), used, self.budget, max(raw_tokens - used, 0),
+        )
+        return packed
+
+
+class PackedKnowledge(Knowledge):
+    """Knowledge whose query results are deduplicated and packed to a token budget."""
+
+    packer: ContextPacker
+
+    def query(
+        self, query: List[str], limit: int = 3, preference: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve more candidates than ``limit`` and let the token budget decide how many fit."""
+        with span("retrieve", collection=self.collection_name or ""):
+            results = self.storage.search(
+                query,
+                max(limit, self.packer.candidates),
+                filter={"preference": preference} if preference else None,
+                score_threshold=DEFAULT_SCORE_THRESHOLD,
+            )
+        return self.packer.pack(results)
@@ -0,0 +1,107 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from crewai import Crew
+
+from crewai_sample.streaming import StreamingLLM
+from crewai_sample.tracing import span
+
+CrewFactory = Callable[[Optional[str]], Crew]
+
+
+class CrewPool:
+    """Process-wide, thread-safe pool of pre-built crews keyed by bot name and API key.
+
+    Building an agent ingests its knowledge sources and creates its LLM client, so
+    crews are built once and reused: ``checkout`` hands out an idle crew (building one
+    only if none is free) and takes it back when the request is done. Crews whose run
+    raised are dropped rather than reused.
+    """
+
+    def __init__(self, max_idle: int = 4):
+        self.max_idle = max_idle
+        self._factories: Dict[str, CrewFactory] = {}
+        self._idle: Dict[Tuple[str, Optional[str]], Deque[Crew]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, bot: str, factory: CrewFactory) -> None:
+        """Register how to build crews for a bot; already pooled crews are kept."""
+        with self._lock:
+            self._factories[bot] = factory
+
+    def is_registered(self, bot: str) -> bool:
+        return bot in self._factories
+
+    @contextmanager
+    def checkout(self, bot: str, api_key: Optional[str] = None) -> Iterator[Crew]:
+        """Borrow a crew for one request."""
+        crew = self._acquire(bot, api_key)
+        yield crew
+        # Only reached when the request succeeded
+        self._release(bot, api_key, crew)
+
+    def warm(self, bot: str, api_key: Optional[str] = None, count: int = 1) -> None:
+        """Build crews ahead of time so the first requests do not pay for it."""
+        with self._lock:
+            missing = count - len(self._idle.get((bot, api_key), ()))
+        for _ in range(max(missing, 0)):
+            self._release(bot, api_key, self._build(bot, api_key))
+
+    def clear(self, bot: Optional[str] = None) -> None:
+        """Drop idle crews, e.g. after a configuration change."""
+        with self._lock:
+            for key in list(self._idle):
+                if bot is None or key[0] == bot:
+                    del self._idle[key]
+
+    def _acquire(self, bot: str, api_key: Optional[str]) -> Crew:
+        with self._lock:
+            idle = self._idle.get((bot, api_key))
+            if idle:
+                return idle.popleft()
+        return self._build(bot, api_key)
+
+    def _release(self, bot: str, api_key: Optional[str], crew: Crew) -> None:
+        with self._lock:
+            idle = self._idle.setdefault((bot, api_key), deque())
+            if len(idle) < self.max_idle:
+                idle.append(crew)
+
+    def _build(self, bot: str, api_key: Optional[str]) -> Crew:
+        try:
+            factory = self._factories[bot]
+        except KeyError:
+            raise ValueError(f"No crew factory registered for bot '{bot}'.")
+        with span("crew_build", bot=bot):
+            return factory(api_key)
+
+
+_llms: Dict[Tuple[Any, ...], StreamingLLM] = {}
+_llms_lock = threading.Lock()
+_llm_factory: Callable[..., StreamingLLM] = StreamingLLM
+
+
+def set_llm_factory(factory: Callable[..., StreamingLLM]) -> None:
+    """Build shared LLMs with ``factory`` (e.g. an offline stand-in); drops the ones already built."""
+    global _llm_factory
+    with _llms_lock:
+        _llm_factory = factory
+        _llms.clear()
+
+
+def shared_llm(model: str, api_key: Optional[str] = None, **kwargs: Any) -> StreamingLLM:
+    """Return one long-lived LLM per configuration so its HTTP client stays warm.
+
+    The LLM streams tokens to an ``AnswerStream`` when one is active on the calling thread.
+    """
+    key = (model, api_key, tuple(sorted(kwargs.items())))
+    with _llms_lock:
+        if key not in _llms:
+            _llms[key] = _llm_factory(model=model, api_key=api_key, **kwargs)
+        return _llms[key]
+
+
+# The pool shared by every bot in this process
+crew_pool = CrewPool()
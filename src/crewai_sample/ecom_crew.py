@@ -1,107 +1,73 @@
-from crewai import Agent, Task, Crew, Process, LLM
-from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
-import requests
-from typing import Dict, Any
-from pydantic import BaseModel, Field
+from crewai import Task, Crew, Process
+from typing import Optional
 from dotenv import load_dotenv
-import uuid
+import os
+import threading
+
+from crewai_sample.crew_pool import crew_pool, shared_llm
+from crewai_sample.embedding_scheduler import scheduled_embedder
+from crewai_sample.hybrid_knowledge import HybridKnowledgeAgent
+from crewai_sample.product_knowledge import ProductKnowledgeSource
+from crewai_sample.tracing import span
+
 # Load environment variables from .env file
 load_dotenv()
 
-class ProductKnowledgeSource(BaseKnowledgeSource):
-    """Knowledge source that fetches data from a product API."""
-    
-    api_endpoint: str = Field(description="API endpoint URL")
-    
-    def load_content(self) -> Dict[Any, str]:
-        """Fetch and format product data from the remote API."""
-        try:
-            # Make a GET request to the API to fetch product data
-            response = requests.get(self.api_endpoint)
-            response.raise_for_status()  # Ensure the request was successful
-
-            data = response.json()  # Parse the JSON response
-            products = data.get('products', [])  # Extract the products from the response
-
-            formatted_data = self._format_products(products)
-            return {self.api_endpoint: formatted_data}
-        except Exception as e:
-            raise ValueError(f"Failed to fetch product data: {str(e)}")
-
-    def _format_products(self, products: list) -> str:
-        """Format products into readable text."""
-        formatted = "Product Information:\n\n"
-        for product in products:
-            formatted += f"""
-                Name: {product['title']}
-                Price: {product['price']}
-                Description: {product['description']}
-                Category: {product['category']}
-                URL: {product.get('meta', {}).get('qrCode', 'No URL available')}
-                -------------------"""
-        return formatted
-
-    def add(self) -> None:
-        """Process and store the product data."""
-        content = self.load_content()
-        for _, text in content.items():
-            chunks = self._chunk_text(text)
-            self.chunks.extend(chunks)
-        
-        # Save documents with metadata
-        chunks_metadata = [
-                {
-                    "chunk_id": str(uuid.uuid4()),
-                    "source": self.api_endpoint,
-                    "description": f"Chunk {i + 1} from API response"
-                }
-                for i in range(len(chunks))
-            ]
-
-        # Save documents (chunks) and metadata
-        self.save_documents(metadata=chunks_metadata)
-
-# Create knowledge source
-product_knowledge = ProductKnowledgeSource(
-    api_endpoint="https://dummyjson.com/products",  # Use remote API endpoint here
-    
-)
-
-# Create specialized agent
-product_analyst = Agent(
-    role="Product Analyst",
-    goal="Answer questions about product details and trends accurately and comprehensively",
-    backstory="""You are a product analyst with expertise in various product categories,
-    market trends, and consumer behavior. You excel at answering questions about products and providing detailed, accurate information.""",
-    knowledge_sources=[product_knowledge],
-    llm=LLM(model="gpt-4o-mini", temperature=0.0)
-)
+_product_knowledge: Optional[ProductKnowledgeSource] = None
+_product_knowledge_lock = threading.Lock()
 
-# Function to handle user questions dynamically
-def handle_user_input(user_question: str):
-    """Handles user input, creates a task, and returns the answer based on product knowledge."""
-    
-    # Create task for the user question
+
+def get_product_knowledge() -> ProductKnowledgeSource:
+    """The knowledge source shared by every pooled agent, created on first use."""
+    global _product_knowledge
+    with _product_knowledge_lock:
+        if _product_knowledge is None:
+            _product_knowledge = ProductKnowledgeSource(
+                api_endpoint=os.getenv("PRODUCT_API_ENDPOINT", "https://dummyjson.com/products"),  # Use remote API endpoint here
+            )
+        return _product_knowledge
+
+
+def build_ecom_crew(api_key: Optional[str] = None) -> Crew:
+    """Create the product analyst and a crew whose task takes the question as an input."""
+    # Create specialized agent
+    product_analyst = HybridKnowledgeAgent(
+        role="Product Analyst",
+        goal="Answer questions about product details and trends accurately and comprehensively",
+        backstory="""You are a product analyst with expertise in various product categories,
+        market trends, and consumer behavior. You excel at answering questions about products and providing detailed, accurate information.""",
+        knowledge_sources=[get_product_knowledge()],
+        embedder_config=scheduled_embedder({"provider": "openai", "config": {"api_key": api_key}} if api_key else None),
+        llm=shared_llm("gpt-4o-mini", api_key=api_key, temperature=0.0)
+    )
+
+    # The question is interpolated from the kickoff inputs on every run
     analysis_task = Task(
-        description=f"Answer this question about products: {user_question}",
+        description="Answer this question about products: {user_question}",
         expected_output="A detailed answer based on the recent product data",
         agent=product_analyst
     )
-    
-    # Create and run the crew
-    crew = Crew(
+
+    return Crew(
         agents=[product_analyst],
         tasks=[analysis_task],
         verbose=True,
         process=Process.sequential
     )
-    
-    # Get the answer for the user question
-    result = crew.kickoff(
-        inputs={"user_question": user_question}
-    )
-    
-    return result
+
+
+crew_pool.register("ecommerce", build_ecom_crew)
+
+# Function to handle user questions dynamically
+def handle_user_input(user_question: str, api_key: Optional[str] = None) -> str:
+    """Answers the question about products with a pooled crew."""
+    with span("chat_turn", bot="ecommerce"):
+        with crew_pool.checkout("ecommerce", api_key) as crew, span("kickoff", bot="ecommerce"):
+            result = crew.kickoff(
+                inputs={"user_question": user_question}
+            )
+
+        return result.raw
 
 # Chatbot loop to allow user interaction
 def chatbot_interaction():
@@ -120,4 +86,6 @@ def chatbot_interaction():
         print(f"Chatbot: {answer}\n")
 
 # Start the chatbot interaction
-chatbot_interaction()
+if __name__ == "__main__":
+    chatbot_interaction()
+
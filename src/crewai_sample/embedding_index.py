@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from crewai_sample.paths import storage_path
+
+if TYPE_CHECKING:
+    from crewai_sample.hybrid_knowledge import HybridKnowledgeStorage
+
+# (record id, formatted chunk, metadata) of one record of a knowledge source
+Record = Tuple[str, str, Dict[str, Any]]
+
+
+class EmbeddingIndex:
+    """Persistent map of document keys to the content hash embedded for them."""
+
+    # 3: vectors are stored under record ids instead of content hashes
+    VERSION = 3
+
+    def __init__(self, path: str):
+        self.path = path
+        self.is_new = True
+        self._entries: Dict[str, str] = {}
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_collection(cls, collection_name: str, source: str = "") -> "EmbeddingIndex":
+        """Open the index that tracks one source inside a knowledge collection."""
+        name = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16] if source else "default"
+        return cls(str(storage_path("embedding_index", collection_name, f"{name}.json")))
+
+    @staticmethod
+    def digest(text: str) -> str:
+        """Hash a formatted document the same way the vector store keys it."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> Set[str]:
+        return set(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the digest recorded for a document, if any."""
+        return self._entries.get(key)
+
+    def fingerprint(self) -> str:
+        """Hash of every recorded document; it changes whenever the stored data does."""
+        return self.digest(json.dumps(self._entries, sort_keys=True))
+
+    def set(self, key: str, digest: str) -> None:
+        """Record the digest embedded for a document."""
+        if self._entries.get(key) != digest:
+            self._entries[key] = digest
+            self._dirty = True
+
+    def remove(self, key: str) -> None:
+        """Forget a document that was deleted from the vector store."""
+        if self._entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Forget every document, e.g. after the vector store was reset."""
+        if self._entries:
+            self._entries.clear()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the index to disk atomically if it changed."""
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "entries": self._entries}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self.is_new = False
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") == self.VERSION:
+            self._entries = dict(data.get("entries", {}))
+            self.is_new = False
+
+
+class SyncResult(BaseModel):
+    """Counts of records touched by one sync of a knowledge source."""
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+def sync_records(
+    storage: "HybridKnowledgeStorage",
+    index: EmbeddingIndex,
+    source: str,
+    id_field: str,
+    records: Iterable[Record],
+    batch_size: int = 512,
+    rebuild: bool = False,
+    keep: Optional[Callable[[str], bool]] = None,
+) -> SyncResult:
+    """Bring the chunks a source stored up to date with its current records.
+
+    ``records`` may be a generator: records are consumed in a single pass and only
+    new or changed ones are embedded, ``batch_size`` at a time, so only one batch and
+    the set of record ids are held in memory. Each chunk is stored under
+    ``<source>#<record id>``, so a changed record replaces its vector in place and two
+    records that render to the same text keep a vector each. Records missing from
+    ``records`` are deleted, except those ``keep`` returns True for. ``rebuild`` drops
+    everything stored for the source first.
+    """
+    # A reset vector store invalidates everything the index remembers, while vectors
+    # stored without an index (older runs) cannot be matched to records
+    if storage.collection.count() == 0:
+        index.clear()
+    elif rebuild or index.is_new:
+        storage.delete(where={"source": source})
+        index.clear()
+
+    result = SyncResult()
+    seen: Set[str] = set()
+    batch: List[Tuple[str, str, str, Dict[str, Any]]] = []
+
+    def flush() -> None:
+        storage.upsert(
+            [f"{source}#{record_id}" for record_id, _, _, _ in batch],
+            [chunk for _, _, chunk, _ in batch],
+            [{**metadata, "chunk_id": record_id, id_field: record_id, "source": source}
+             for record_id, _, _, metadata in batch],
+        )
+        for record_id, digest, _, _ in batch:
+            index.set(record_id, digest)
+        batch.clear()
+
+    for record_id, chunk, metadata in records:
+        seen.add(record_id)
+        digest = EmbeddingIndex.digest(chunk)
+        stored = index.get(record_id)
+        if stored == digest:
+            result.unchanged += 1
+            continue
+        if stored is None:
+            result.added += 1
+        else:
+            result.updated += 1
+        batch.append((record_id, digest, chunk, metadata))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    removed = [record_id for record_id in index.keys() if record_id not in seen and not (keep and keep(record_id))]
+    if removed:
+        storage.delete(where={"$and": [{"source": source}, {id_field: {"$in": removed}}]})
+        for record_id in removed:
+            index.remove(record_id)
+    result.removed = len(removed)
+    index.save()
+    return result
@@ -0,0 +1,228 @@
+import json
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from crewai.utilities import EmbeddingConfigurator
+
+from crewai_sample.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Per-request limits of the embedding APIs we use
+PROVIDER_LIMITS: Dict[str, Dict[str, int]] = {
+    "openai": {"batch_size": 2048, "max_batch_tokens": 250_000},
+    "google": {"batch_size": 100, "max_batch_tokens": 20_000},
+}
+DEFAULT_LIMITS = {"batch_size": 100, "max_batch_tokens": 20_000}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for rate limiting."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` units per second with bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        """Block until ``amount`` units are available, then take them.
+
+        An amount larger than ``capacity`` waits for a full bucket and takes it into
+        debt, so later callers wait until the rate has paid for the excess.
+        """
+        needed = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return
+                wait = (needed - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class EmbeddingStats:
+    """Running totals for an embedding scheduler."""
+
+    def __init__(self):
+        self.documents = 0
+        self.tokens = 0
+        self.batches = 0
+        self.retries = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, documents: int, tokens: int, batches: int, seconds: float) -> None:
+        with self._lock:
+            self.documents += documents
+            self.tokens += tokens
+            self.batches += batches
+            self.seconds += seconds
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    @property
+    def throughput(self) -> float:
+        """Documents embedded per second of wall time spent in the scheduler."""
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.documents} documents (~{self.tokens} tokens) in {self.batches} batches, "
+            f"{self.seconds:.1f}s, {self.throughput:.1f} docs/s, {self.retries} retries"
+        )
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    message = f"{type(error).__name__} {error}".lower()
+    return any(hint in message for hint in ("ratelimit", "rate limit", "429", "resource exhausted", "quota", "timeout"))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingScheduler(EmbeddingFunction[Documents]):
+    """Wraps an embedding function to batch, parallelize, rate limit and retry its calls.
+
+    Documents are split into batches no larger than the provider's request limits (and
+    small enough to keep every worker busy), embedded concurrently under optional
+    requests- and tokens-per-minute budgets, and retried with exponential backoff on
+    rate-limit and transient errors. Output order always matches the input.
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        provider: Optional[str] = None,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        limits = PROVIDER_LIMITS.get(provider or "", DEFAULT_LIMITS)
+        self.embedding_function = embedding_function
+        self.batch_size = limits["batch_size"]
+        self.max_batch_tokens = limits["max_batch_tokens"]
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = EmbeddingStats()
+        self._requests = TokenBucket(requests_per_minute / 60, max(requests_per_minute / 60, 1)) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute / 60) if tokens_per_minute else None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embed")
+
+    def __call__(self, input: Documents) -> Embeddings:
+        if not input:
+            return []
+        start = time.perf_counter()
+        tokens = sum(estimate_tokens(text) for text in input)
+        with span("embed", documents=len(input)) as embed_span:
+            batches = self._batches(list(input))
+            if len(batches) == 1:
+                results = [self._embed_batch(batches[0])]
+            else:
+                results = list(self._executor.map(self._embed_batch, batches))
+            embed_span.set("batches", len(batches))
+            embed_span.add_tokens("embedded", tokens)
+        embeddings = [embedding for batch in results for embedding in batch]
+
+        self.stats.record(len(input), tokens, len(batches), time.perf_counter() - start)
+        logger.info("Embedded %d documents in %d batches; totals: %s", len(input), len(batches), self.stats.report())
+        return embeddings
+
+    def _batches(self, documents: List[str]) -> List[List[str]]:
+        # Spread work over every worker, within the provider's per-request limits
+        target = max(1, min(self.batch_size, math.ceil(len(documents) / self.max_concurrency)))
+        batches, current, current_tokens = [], [], 0
+        for text in documents:
+            tokens = estimate_tokens(text)
+            if current and (len(current) >= target or current_tokens + tokens > self.max_batch_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batch(self, batch: List[str]) -> Embeddings:
+        tokens = sum(estimate_tokens(text) for text in batch)
+        for attempt in range(self.max_retries + 1):
+            if self._requests:
+                self._requests.acquire()
+            if self._tokens:
+                self._tokens.acquire(tokens)
+            try:
+                return list(self.embedding_function(batch))
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                self.stats.record_retry()
+                delay = _retry_after(e) or min(self.max_delay, self.base_delay * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.8, 1.2))
+        raise RuntimeError("unreachable")
+
+
+_schedulers: Dict[str, EmbeddingScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def _configure_embedder(embedder_config: Optional[Dict[str, Any]]) -> EmbeddingFunction:
+    return EmbeddingConfigurator().configure_embedder(embedder_config)
+
+
+_embedding_function_factory: Callable[[Optional[Dict[str, Any]]], EmbeddingFunction] = _configure_embedder
+
+
+def set_embedding_function_factory(factory: Callable[[Optional[Dict[str, Any]]], EmbeddingFunction]) -> None:
+    """Build the scheduled embedding functions with ``factory(embedder_config)`` (e.g. an offline
+    stand-in); drops the schedulers already built."""
+    global _embedding_function_factory
+    with _schedulers_lock:
+        _embedding_function_factory = factory
+        _schedulers.clear()
+
+
+def scheduled_embedder(embedder_config: Optional[Dict[str, Any]] = None, **scheduler_options: Any) -> Dict[str, Any]:
+    """Turn a crewAI embedder config into one whose provider is a shared ``EmbeddingScheduler``.
+
+    The result can be passed wherever crewAI accepts an embedder config (``Agent``,
+    ``Crew``, ``KnowledgeStorage``); ``None`` means crewAI's default OpenAI embedder.
+    One scheduler is kept per configuration, so every crew built from the same
+    config shares its worker threads, rate limits and throughput stats.
+    """
+    key = json.dumps([embedder_config, scheduler_options], sort_keys=True, default=str)
+    with _schedulers_lock:
+        if key not in _schedulers:
+            provider = (embedder_config or {}).get("provider", "openai")
+            embedding_function = _embedding_function_factory(embedder_config)
+            _schedulers[key] = EmbeddingScheduler(embedding_function, provider=provider, **scheduler_options)
+        return {"provider": _schedulers[key]}
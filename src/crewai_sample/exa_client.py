@@ -0,0 +1,146 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+import requests
+from exa_py import Exa
+from requests.adapters import HTTPAdapter
+
+from crewai_sample.paths import storage_path
+from crewai_sample.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Seconds an Exa response is reused (0 disables the cache), and seconds one request may
+# wait for the API; fetches on a shared worker pool must give their worker back
+EXA_CACHE_TTL = float(os.getenv("EXA_CACHE_TTL", "86400"))
+EXA_REQUEST_TIMEOUT = float(os.getenv("EXA_REQUEST_TIMEOUT", "30"))
+
+
+class ResponseCache:
+    """Persistent TTL cache of API responses, one JSON file per request.
+
+    Files are replaced atomically, so several processes (e.g. parallel training runs)
+    can share the cache directory.
+    """
+
+    def __init__(self, name: str = "exa_cache", ttl: float = EXA_CACHE_TTL):
+        self.name = name
+        self.ttl = ttl
+
+    @staticmethod
+    def key(endpoint: str, data: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps([endpoint, data], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str):
+        return storage_path(self.name, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.ttl <= 0:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry.get("response")
+
+    def put(self, key: str, response: Any) -> None:
+        if self.ttl <= 0:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"created_at": time.time(), "response": response}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.exception("Could not cache the response in %s", path)
+
+
+class PooledExa(Exa):
+    """Exa client that keeps its HTTP connections alive and avoids repeated requests.
+
+    Every API call (``search``, ``find_similar``, ``get_contents``...) goes through
+    ``request``, where the response is served from the persistent cache when an
+    identical request (same endpoint, query/url/ids and options such as
+    ``num_results``) was made within the TTL. Identical requests made concurrently
+    share one upstream call.
+
+    ``request``, ``_post``, ``base_url`` and ``headers`` are exa_py internals, which is
+    why pyproject.toml pins exa_py to the version they were written against.
+    """
+
+    def __init__(self, api_key: Optional[str], cache: Optional[ResponseCache] = None, pool_size: int = 8,
+                 timeout: float = EXA_REQUEST_TIMEOUT, **kwargs: Any):
+        super().__init__(api_key, **kwargs)
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def request(self, endpoint: str, data):
+        key = ResponseCache.key(endpoint, data)
+        with span("exa_request", endpoint=endpoint) as request_span:
+            cached = self.cache.get(key) if self.cache else None
+            request_span.cache("exa", cached is not None)
+            if cached is not None:
+                return cached
+
+            with self._lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = Future()
+            if not leader:
+                request_span.set("coalesced", True)
+                # Callers may parse (and modify) the response; each gets its own copy
+                return copy.deepcopy(future.result())
+
+            try:
+                response = self._post(endpoint, data)
+                if self.cache:
+                    self.cache.put(key, response)
+                future.set_result(response)
+                return copy.deepcopy(response)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+
+    def _post(self, endpoint: str, data) -> Any:
+        res = self.session.post(self.base_url + endpoint, json=data, headers=self.headers, timeout=self.timeout)
+        if res.status_code != 200:
+            raise ValueError(f"Request failed with status code {res.status_code}: {res.text}")
+        return res.json()
+
+
+_clients: Dict[str, PooledExa] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_exa(api_key: str) -> PooledExa:
+    """Return the process-wide Exa client for an API key, with the persistent response cache."""
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = PooledExa(api_key, cache=ResponseCache())
+        return _clients[api_key]
@@ -0,0 +1,112 @@
+import csv
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Offline place names with coordinates, relative to the knowledge/ directory
+GAZETTEER_FILE = os.getenv("GAZETTEER_FILE", "gazetteer.csv")
+KNOWLEDGE_DIRECTORY = Path("knowledge")
+
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*[, ]\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+class Place(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+
+
+def _parts(text: str) -> List[str]:
+    """Comma-separated parts of a place name, lowercased and without punctuation."""
+    parts = (" ".join(re.findall(r"[a-z0-9]+", part.lower())) for part in str(text).split(","))
+    return [part for part in parts if part]
+
+
+class Gazetteer:
+    """Offline geocoder over a CSV of ``name,latitude,longitude[,aliases]``.
+
+    Names are comma-separated from specific to general, e.g. "Park Slope, Brooklyn, NY";
+    aliases are separated by ``|``. A place can be looked up by its full name, its name
+    without the last part (usually the state), an alias, or its first part alone
+    ("Park Slope"), which may match several places.
+    """
+
+    def __init__(self, places: List[Place], aliases: Optional[Dict[str, List[str]]] = None):
+        self.places = places
+        self._keys: Dict[str, List[Place]] = {}
+        for place in places:
+            parts = _parts(place.name)
+            keys = {", ".join(parts), ", ".join(parts[:-1]) if len(parts) > 2 else "", parts[0] if parts else ""}
+            keys.update(", ".join(_parts(alias)) for alias in (aliases or {}).get(place.name, []))
+            for key in keys - {""}:
+                self._keys.setdefault(key, []).append(place)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "Gazetteer":
+        places = []
+        aliases = {}
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                try:
+                    place = Place(row["name"].strip(), float(row["latitude"]), float(row["longitude"]))
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Skipping gazetteer row without a name and coordinates: %s", row)
+                    continue
+                places.append(place)
+                aliases[place.name] = [alias for alias in (row.get("aliases") or "").split("|") if alias.strip()]
+        return cls(places, aliases)
+
+    def lookup(self, name: str) -> List[Place]:
+        """Every place ``name`` may refer to; "lat, lon" coordinates are returned as they are."""
+        coordinates = _COORDINATES.match(str(name))
+        if coordinates:
+            latitude, longitude = float(coordinates.group(1)), float(coordinates.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return [Place(name.strip(), latitude, longitude)]
+        return list(self._keys.get(", ".join(_parts(name)), []))
+
+    def geocode(self, location: str) -> Optional[Place]:
+        """The most specific unambiguous place a free-text location line is in.
+
+        Leading parts that are not places (a street address, a unit) are skipped:
+        "12 Main St, Park Slope, Brooklyn, NY" is found as "Park Slope, Brooklyn, NY".
+        """
+        parts = _parts(location)
+        for start in range(len(parts)):
+            for end in range(len(parts), start, -1):
+                places = self._keys.get(", ".join(parts[start:end]))
+                if places and len(places) == 1:
+                    return places[0]
+        return None
+
+
+_gazetteers: Dict[Path, Tuple[int, Gazetteer]] = {}
+_gazetteers_lock = threading.Lock()
+
+
+def load_gazetteer(file_path: str = GAZETTEER_FILE) -> Gazetteer:
+    """Return the gazetteer for a CSV file, reloaded when the file changes.
+
+    Relative paths are resolved against the ``knowledge/`` directory, like crewAI's file
+    knowledge sources. A missing file gives an empty gazetteer, so only listings that
+    carry their own coordinates are located.
+    """
+    path = Path(file_path)
+    if not path.exists() and not path.is_absolute():
+        path = KNOWLEDGE_DIRECTORY / path
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        logger.warning("No gazetteer at %s; listings are located only by their own coordinates", path)
+        return Gazetteer([])
+    with _gazetteers_lock:
+        cached = _gazetteers.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, Gazetteer.from_csv(path))
+            _gazetteers[path] = cached
+        return cached[1]
@@ -0,0 +1,185 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from crewai_sample.gazetteer import GAZETTEER_FILE, Gazetteer, load_gazetteer
+from crewai_sample.tracing import span
+
+EARTH_RADIUS_MILES = 3958.8
+# Grid cells of 0.01 degrees (about 0.7 miles); a cell id is its row * COLUMNS + its column
+CELL_DEGREES = 0.01
+COLUMNS = int(round(360 / CELL_DEGREES))
+ROWS = int(round(180 / CELL_DEGREES))
+
+Match = Tuple[dict, float]
+
+
+def _closest(distances: np.ndarray, limit: Optional[int]) -> np.ndarray:
+    """Positions of the ``limit`` smallest distances, in order, without sorting all of them."""
+    if limit is not None and limit < len(distances):
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        nearest = np.argpartition(distances, limit - 1)[:limit]
+        return nearest[np.argsort(distances[nearest], kind="stable")]
+    return np.argsort(distances, kind="stable")
+
+
+def _coordinate(record: dict, *names: str) -> Optional[float]:
+    for name in names:
+        try:
+            return float(record[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def _cell_rows(latitudes: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((latitudes + 90) / CELL_DEGREES).astype(np.int64), 0, ROWS - 1)
+
+
+def _cell_columns(longitudes: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((longitudes + 180) / CELL_DEGREES).astype(np.int64), 0, COLUMNS - 1)
+
+
+def haversine_miles(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances in miles from one point to arrays of points, all in degrees."""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class _Grid:
+    """Immutable snapshot of the located listings, sorted by grid cell."""
+
+    def __init__(self, records: List[dict], latitudes: np.ndarray, longitudes: np.ndarray):
+        located = np.flatnonzero(np.isfinite(latitudes) & np.isfinite(longitudes))
+        cells = _cell_rows(latitudes[located]) * COLUMNS + _cell_columns(longitudes[located])
+        order = np.argsort(cells, kind="stable")
+        self.records = records
+        self.cells = cells[order]
+        self.rows = located[order]
+        self.latitudes = latitudes[self.rows]
+        self.longitudes = longitudes[self.rows]
+
+    def candidates(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Positions of the listings in every cell the box touches; each cell row is one slice."""
+        rows = np.arange(_cell_rows(np.float64(south)), _cell_rows(np.float64(north)) + 1)
+        starts = np.searchsorted(self.cells, rows * COLUMNS + _cell_columns(np.float64(west)), side="left")
+        ends = np.searchsorted(self.cells, rows * COLUMNS + _cell_columns(np.float64(east)), side="right")
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64)
+        # Concatenate the slices without a Python loop
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return np.arange(total) + offsets
+
+
+class GeoIndex:
+    """Coordinates of the listings in a grid index for radius, bounding-box and nearest queries.
+
+    A listing is located by its own ``latitude``/``longitude`` (or ``lat``/``lng``) fields
+    when the feed has them, otherwise by geocoding its location line against the
+    offline gazetteer. Located listings are bucketed into fixed grid cells and sorted by
+    cell, so a query only measures the distance to the listings in the few cells around
+    it. ``load`` swaps in a fresh snapshot atomically, like ``ListingStore``.
+    """
+
+    def __init__(self, gazetteer_file: str = GAZETTEER_FILE):
+        self.gazetteer_file = gazetteer_file
+        self._grid = _Grid([], np.empty(0), np.empty(0))
+        self._gazetteer: Optional[Gazetteer] = None
+        self._geocoded: Dict[str, Optional[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._grid.rows)
+
+    @property
+    def gazetteer(self) -> Gazetteer:
+        if self._gazetteer is None:
+            self._gazetteer = load_gazetteer(self.gazetteer_file)
+        return self._gazetteer
+
+    def load(self, properties: List[dict]) -> None:
+        """Locate the listings of a new API payload and index them."""
+        with self._lock, span("geo_index", records=len(properties)) as index_span:
+            latitudes = np.full(len(properties), np.nan)
+            longitudes = np.full(len(properties), np.nan)
+            for row, property in enumerate(properties):
+                latitude = _coordinate(property, "latitude", "lat")
+                longitude = _coordinate(property, "longitude", "lng", "lon")
+                if latitude is None or longitude is None:
+                    point = self._geocode(property.get("location"))
+                    if point is None:
+                        continue
+                    latitude, longitude = point
+                latitudes[row], longitudes[row] = latitude, longitude
+            self._grid = _Grid(list(properties), latitudes, longitudes)
+            index_span.set("listings.located", len(self._grid.rows))
+
+    def _geocode(self, location: Any) -> Optional[Tuple[float, float]]:
+        # Feeds repeat the same few location lines, so each is geocoded once
+        if not location:
+            return None
+        location = str(location)
+        if location not in self._geocoded:
+            place = self.gazetteer.geocode(location)
+            self._geocoded[location] = (place.latitude, place.longitude) if place else None
+        return self._geocoded[location]
+
+    def within_radius(self, latitude: float, longitude: float, miles: float,
+                      limit: Optional[int] = 20) -> Tuple[int, List[Match]]:
+        """Listings within ``miles`` of a point, nearest first, with the total number found."""
+        grid = self._grid
+        positions, distances = self._around(grid, latitude, longitude, miles)
+        inside = distances <= miles
+        positions, distances = positions[inside], distances[inside]
+        order = _closest(distances, limit)
+        return len(positions), [(grid.records[grid.rows[positions[i]]], float(distances[i])) for i in order]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 5) -> List[Match]:
+        """The ``k`` listings closest to a point, nearest first.
+
+        The search circle starts at a mile and doubles until its box holds ``k`` listings;
+        it then widens to the ``k``-th closest of those, and once ``k`` listings lie inside
+        the circle, no closer listing can be outside it.
+        """
+        grid = self._grid
+        if k <= 0 or not len(grid.rows):
+            return []
+        miles = 1.0
+        while True:
+            positions, distances = self._around(grid, latitude, longitude, miles)
+            if (distances <= miles).sum() >= k or miles >= np.pi * EARTH_RADIUS_MILES:
+                break
+            miles = float(np.partition(distances, k - 1)[k - 1]) if len(distances) >= k else miles * 2
+        order = _closest(distances, k)
+        return [(grid.records[grid.rows[positions[i]]], float(distances[i])) for i in order]
+
+    def within_bbox(self, south: float, west: float, north: float, east: float,
+                    limit: Optional[int] = 20) -> Tuple[int, List[dict]]:
+        """Listings inside a latitude/longitude box, with the total number found."""
+        grid = self._grid
+        if south > north or west > east:
+            raise ValueError("The box needs south <= north and west <= east (boxes across the antimeridian are not supported).")
+        positions = grid.candidates(south, west, north, east)
+        latitudes, longitudes = grid.latitudes[positions], grid.longitudes[positions]
+        positions = positions[(latitudes >= south) & (latitudes <= north) & (longitudes >= west) & (longitudes <= east)]
+        rows = np.sort(grid.rows[positions])
+        return len(rows), [grid.records[row] for row in rows[:limit]]
+
+    @staticmethod
+    def _around(grid: _Grid, latitude: float, longitude: float, miles: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Listings in the box around a circle of ``miles``, with their distances to its center."""
+        degrees = np.degrees(miles / EARTH_RADIUS_MILES)
+        south, north = max(latitude - degrees, -90.0), min(latitude + degrees, 90.0)
+        # Longitude degrees shrink towards the poles; near them the box spans every longitude.
+        # The box is clipped at the antimeridian, which no listing feed crosses.
+        cos = np.cos(np.radians(max(abs(south), abs(north))))
+        span_degrees = degrees / cos if cos > 1e-9 else 180.0
+        west, east = max(longitude - span_degrees, -180.0), min(longitude + span_degrees, 180.0)
+        positions = grid.candidates(south, west, north, east)
+        return positions, haversine_miles(latitude, longitude, grid.latitudes[positions], grid.longitudes[positions])
@@ -0,0 +1,317 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import chromadb.errors
+from crewai import Agent
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+from crewai.knowledge.storage.knowledge_storage import KnowledgeStorage, suppress_logging
+
+from crewai_sample.context_packer import ContextPacker, PackedKnowledge
+from crewai_sample.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Optional cross-encoder used to rerank fused candidates, e.g.
+# "cross-encoder/ms-marco-MiniLM-L-6-v2" (needs sentence-transformers)
+RERANK_MODEL = os.getenv("KNOWLEDGE_RERANK_MODEL")
+
+# Words too common in task prompts to say anything about a chunk
+STOPWORDS = frozenset(
+    "a an and any are as at be by detailed for from has have how i in is it its me of on or "
+    "the this to was what when where which who with about answer question based recent data".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; identifiers like 'LTM0261' or '287/22-23' keep their parts."""
+    return [token for token in re.findall(r"\w+", text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Incremental in-memory BM25 inverted index keyed by document id."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_ids: Iterable[str], documents: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id, document in zip(doc_ids, documents):
+                self._remove(doc_id)
+                tokens = tokenize(document)
+                frequencies = Counter(tokens)
+                for term, frequency in frequencies.items():
+                    self._postings.setdefault(term, {})[doc_id] = frequency
+                self._terms[doc_id] = list(frequencies)
+                self._lengths[doc_id] = len(tokens)
+                self._total_length += len(tokens)
+
+    def remove(self, doc_ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` (doc id, score) pairs, best first."""
+        with self._lock:
+            count = len(self._lengths)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+_cross_encoders: Dict[str, Any] = {}
+_cross_encoders_lock = threading.Lock()
+
+
+def _cross_encoder(model_name: str) -> Optional[Any]:
+    with _cross_encoders_lock:
+        if model_name not in _cross_encoders:
+            try:
+                from sentence_transformers import CrossEncoder
+
+                _cross_encoders[model_name] = CrossEncoder(model_name)
+            except ImportError:
+                logger.warning("sentence-transformers is not installed; reranking with %s is disabled", model_name)
+                _cross_encoders[model_name] = None
+        return _cross_encoders[model_name]
+
+
+def _similarity(distance: float, space: str) -> float:
+    """Cosine similarity of unit-length embeddings from a Chroma distance in ``space``."""
+    if space == "l2":
+        # Chroma's l2 is the squared distance, 2 - 2 * cosine for unit vectors
+        return 1 - distance / 2
+    return 1 - distance
+
+
+class HybridKnowledgeStorage(KnowledgeStorage):
+    """Knowledge storage that fuses BM25 keyword search with vector search.
+
+    Exact tokens such as street names, product names or membership numbers are often
+    missed by embeddings alone, so every query also runs against a BM25 index kept in
+    step with ``save``. The two rankings are combined with reciprocal rank fusion and,
+    if ``rerank_model`` is set, the top candidates are reranked with a cross-encoder.
+    The BM25 index is rebuilt from the collection when the storage is initialized.
+    Sources delete chunks through ``delete`` so both indexes drop them together; chunks
+    deleted from the collection directly are pruned from BM25 when they surface.
+    """
+
+    def __init__(
+        self,
+        embedder_config: Optional[Dict[str, Any]] = None,
+        collection_name: Optional[str] = None,
+        rerank_model: Optional[str] = RERANK_MODEL,
+        candidates: int = 20,
+        rrf_k: int = 60,
+    ):
+        super().__init__(embedder_config=embedder_config, collection_name=collection_name)
+        self.bm25 = BM25Index()
+        self.rerank_model = rerank_model
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self._init_lock = threading.Lock()
+
+    def initialize_knowledge_storage(self):
+        # Every crew built on a shared storage initializes it again; only the first one counts
+        with self._init_lock:
+            if self.collection is not None:
+                return
+            super().initialize_knowledge_storage()
+            stored = self.collection.get(include=["documents"])
+            bm25 = BM25Index()
+            bm25.add(stored["ids"], stored["documents"])
+            self.bm25 = bm25
+
+    def delete(self, where: Dict[str, Any]) -> int:
+        """Delete the chunks whose metadata matches ``where`` from the vectors and BM25; returns how many."""
+        if not self.collection:
+            raise Exception("Collection not initialized")
+        ids = self.collection.get(where=where, include=[])["ids"]
+        if ids:
+            self.collection.delete(ids=ids)
+            self.bm25.remove(ids)
+        return len(ids)
+
+    def save(
+        self,
+        documents: List[str],
+        metadata: Union[Dict[str, Any], List[Dict[str, Any]]],
+    ):
+        # Same content-hash ids as KnowledgeStorage.save
+        self.upsert(
+            [hashlib.sha256(doc.encode("utf-8")).hexdigest() for doc in documents],
+            documents,
+            [metadata] if isinstance(metadata, dict) else metadata,
+        )
+
+    def upsert(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Store chunks under the given ids in the vectors and BM25.
+
+        Sources that track records pass ids derived from the record, so two records
+        that render to the same text still get a vector each.
+        """
+        if not self.collection:
+            raise Exception("Collection not initialized")
+        try:
+            self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+        except chromadb.errors.InvalidDimensionException as e:
+            raise ValueError(
+                "Embedding dimension mismatch. Make sure you're using the same embedding model "
+                "across all operations with this collection. "
+                "Try resetting the collection using `crewai reset-memories -a`"
+            ) from e
+        self.bm25.add(ids, documents)
+
+    def search(
+        self,
+        query: List[str],
+        limit: int = 3,
+        filter: Optional[dict] = None,
+        score_threshold: float = 0.35,
+    ) -> List[Dict[str, Any]]:
+        """Return the ``limit`` best chunks for the query by fused keyword and vector rank.
+
+        Vector hits whose cosine similarity to the query is below ``score_threshold``
+        are left out of the vector ranking; keyword hits count whatever their
+        similarity. The returned ``score`` is the fused (or reranked) score.
+        """
+        if not self.collection:
+            raise Exception("Collection not initialized")
+        if self.collection.count() == 0:
+            return []
+        text = " ".join(query)
+        candidates = max(self.candidates, limit)
+
+        with span("vector_query"), suppress_logging():
+            fetched = self.collection.query(query_texts=[text], n_results=candidates, where=filter)
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        vector_ids = [
+            doc_id for doc_id, distance in zip(fetched["ids"][0], fetched["distances"][0])
+            if _similarity(distance, space) >= score_threshold
+        ]
+        with span("keyword_query"):
+            keyword_ids = [doc_id for doc_id, _ in self.bm25.search(text, candidates)]
+
+        fused: Dict[str, float] = {}
+        for ranking in (vector_ids, keyword_ids):
+            for rank, doc_id in enumerate(ranking):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1 / (self.rrf_k + rank + 1)
+        ranked = sorted(fused, key=fused.get, reverse=True)[:candidates]
+
+        # Documents and metadata for keyword-only hits come from the collection; ids it
+        # no longer has were deleted behind the index's back
+        documents = {
+            doc_id: (document, metadata)
+            for doc_id, document, metadata in zip(
+                fetched["ids"][0], fetched["documents"][0], fetched["metadatas"][0]
+            )
+        }
+        missing = [doc_id for doc_id in ranked if doc_id not in documents]
+        if missing:
+            stored = self.collection.get(ids=missing, where=filter, include=["documents", "metadatas"])
+            documents.update(zip(stored["ids"], zip(stored["documents"], stored["metadatas"])))
+            if filter is None:
+                self.bm25.remove(set(missing) - set(stored["ids"]))
+        ranked = [doc_id for doc_id in ranked if doc_id in documents]
+
+        results = [
+            {"id": doc_id, "metadata": documents[doc_id][1], "context": documents[doc_id][0], "score": fused[doc_id]}
+            for doc_id in ranked
+        ]
+        return self._rerank(text, results)[:limit]
+
+    def _rerank(self, query: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        model = _cross_encoder(self.rerank_model) if self.rerank_model and results else None
+        if model is None:
+            return results
+        with span("rerank", model=self.rerank_model, candidates=len(results)):
+            scores = model.predict([(query, result["context"]) for result in results])
+        for result, score in zip(results, scores):
+            result["score"] = float(score)
+        return sorted(results, key=lambda result: result["score"], reverse=True)
+
+
+_storages: Dict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], HybridKnowledgeStorage]] = {}
+_storages_lock = threading.Lock()
+
+
+def shared_storage(collection_name: str, embedder_config: Optional[Dict[str, Any]] = None) -> HybridKnowledgeStorage:
+    """Return the process-wide storage of a collection and embedder config.
+
+    Knowledge points its sources at the storage of the last agent built, so pooled
+    agents share one storage: a sync from any of them updates the vectors and the
+    BM25 index that all of them search.
+    """
+    # Embedding functions are not serializable; the registry keeps them alive, so their ids are stable
+    config_key = json.dumps(embedder_config, sort_keys=True, default=lambda value: f"{type(value).__name__}@{id(value)}")
+    key = (collection_name, config_key)
+    with _storages_lock:
+        if key not in _storages:
+            _storages[key] = (
+                embedder_config,
+                HybridKnowledgeStorage(embedder_config=embedder_config, collection_name=collection_name),
+            )
+        return _storages[key][1]
+
+
+class HybridKnowledgeAgent(Agent):
+    """Agent whose knowledge sources are stored in a ``HybridKnowledgeStorage``.
+
+    Agents with the same role and embedder share one storage. Retrieved chunks are
+    packed to the token budget of the agent's model before they are added to the
+    task prompt. ``_set_knowledge`` is a private crewAI hook; pyproject.toml pins
+    the crewAI it was written for.
+    """
+
+    def _set_knowledge(self):
+        try:
+            if self.knowledge_sources:
+                collection_name = f"{self.role.replace(' ', '_')}"
+                if isinstance(self.knowledge_sources, list) and all(
+                    isinstance(k, BaseKnowledgeSource) for k in self.knowledge_sources
+                ):
+                    self._knowledge = PackedKnowledge(
+                        sources=self.knowledge_sources,
+                        collection_name=collection_name,
+                        storage=shared_storage(collection_name, self.embedder_config),
+                        packer=ContextPacker(model=getattr(self.llm, "model", self.llm)),
+                    )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid Knowledge Configuration: {str(e)}")
@@ -0,0 +1,59 @@
+"""Import-time check of the command-line entry points.
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``; the check
+fails if one is over its budget or pulls in a package it should leave to the commands
+that need it::
+
+    import_budget crewai_sample.main crewai_sample.server
+"""
+import argparse
+import subprocess
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+# Cumulative import time allowed for the command-line entry points, in seconds, and the
+# heavy packages they must leave to the commands that need them
+IMPORT_BUDGETS = {"crewai_sample.main": 0.25, "crewai_sample.server": 1.0}
+DEFERRED_PACKAGES = ("crewai", "chromadb", "langchain", "exa_py", "streamlit", "litellm")
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Import ``module`` in a fresh interpreter; report its cumulative import time and deferred packages loaded."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys, {module}; print(' '.join(sys.modules))"],
+        capture_output=True, text=True, check=True,
+    )
+    seconds = 0.0
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            seconds = int(parts[1]) / 1e6
+    loaded = set(process.stdout.split())
+    return {"seconds": seconds, "loaded": [package for package in DEFERRED_PACKAGES if package in loaded]}
+
+
+def check_imports(argv: Optional[Sequence[str]] = None) -> None:
+    """Fail if an entry point is over its import-time budget or imports a deferred package."""
+    parser = argparse.ArgumentParser(description="Check the import time of the command-line entry points.")
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGETS))
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        result = measure_import(module)
+        budget = IMPORT_BUDGETS.get(module)
+        over = budget is not None and result["seconds"] > budget
+        failed = failed or over or bool(result["loaded"])
+        print(
+            f"{module}: {result['seconds'] * 1000:.0f}ms"
+            + (f" (budget {budget * 1000:.0f}ms)" if budget is not None else "")
+            + (f", imports {', '.join(result['loaded'])}" if result["loaded"] else "")
+            + (" FAILED" if over or result["loaded"] else "")
+        )
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    check_imports()
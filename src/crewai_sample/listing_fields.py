@@ -0,0 +1,30 @@
+from typing import Any, Optional
+
+import numpy as np
+
+
+def normalize(value: Any) -> str:
+    """Lowercased text with runs of whitespace collapsed; the key categories are matched on."""
+    return " ".join(str(value).lower().split())
+
+
+def to_float(value: Any) -> float:
+    """Parse a number the feed may format as "$1,250"; NaN when it is missing or not a number."""
+    try:
+        return float(str(value).replace("$", "").replace(",", ""))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def to_number(value: Any) -> Optional[float]:
+    """Like ``to_float``, but None when the value is missing or not a number."""
+    number = to_float(value)
+    return None if np.isnan(number) else number
+
+
+def to_day(value: Any) -> np.datetime64:
+    """Parse the day of an ISO date or timestamp; NaT when it is missing or not a date."""
+    try:
+        return np.datetime64(str(value)[:10], "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
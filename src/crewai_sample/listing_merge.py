@@ -0,0 +1,132 @@
+import hashlib
+import re
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crewai_sample.listing_fields import to_number
+
+# Spellings that differ between feeds for the same address or listing
+ABBREVIATIONS = {
+    "st": "street", "str": "street", "ave": "avenue", "av": "avenue", "rd": "road", "dr": "drive",
+    "blvd": "boulevard", "ln": "lane", "ct": "court", "pl": "place", "pkwy": "parkway", "hwy": "highway",
+    "apt": "apartment", "ste": "suite", "fl": "floor", "n": "north", "s": "south", "e": "east", "w": "west",
+    "bd": "bed", "br": "bed", "bdrm": "bed", "bedroom": "bed", "bedrooms": "bed", "beds": "bed",
+    "ba": "bath", "bathroom": "bath", "bathrooms": "bath", "baths": "bath",
+}
+
+
+def normalize_text(value: Any) -> str:
+    """Lowercase words without punctuation, with common address and listing abbreviations expanded."""
+    words = re.findall(r"[a-z0-9]+", str(value or "").lower())
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+def feed_key(endpoint: str) -> str:
+    """Short, stable prefix that keeps listing ids from different feeds apart."""
+    return hashlib.sha1(endpoint.encode("utf-8")).hexdigest()[:8]
+
+
+def _similar(a: str, b: str, threshold: float) -> bool:
+    if a == b:
+        return True
+    if not a or not b:
+        return False
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # The quick upper bounds rule most pairs out without the full comparison
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+
+class _Group:
+    """Listings from different feeds that describe the same property."""
+
+    def __init__(self, endpoint: str, listing: dict, address: str, title: str):
+        self.endpoints = [endpoint]
+        self.listings = [listing]
+        self.address = address
+        self.title = title
+        self.price = to_number(listing.get("price"))
+
+    def merged(self) -> dict:
+        # The first feed wins; later feeds only fill in what it is missing
+        merged = dict(self.listings[0])
+        images: List[Any] = []
+        for listing in self.listings:
+            for key, value in listing.items():
+                if merged.get(key) in (None, "", []):
+                    merged[key] = value
+            for image in listing.get("images") or []:
+                if image not in images:
+                    images.append(image)
+        if images:
+            merged["images"] = images
+        merged["sources"] = list(self.endpoints)
+        return merged
+
+
+class ListingMerger:
+    """Merges listing feeds with overlapping inventory into one list without duplicates.
+
+    Listings are compared only within a block of the same bedroom count and street
+    number (or first address word), so merging stays close to linear in the number of
+    listings. Two listings from different feeds are the same property when their
+    normalized addresses match closely and either their titles match closely or their
+    prices are within ``price_tolerance`` of each other. Listings from the same feed
+    are never merged with each other: a feed may list several units of one building.
+    """
+
+    def __init__(self, address_similarity: float = 0.9, title_similarity: float = 0.85,
+                 price_tolerance: float = 0.05):
+        self.address_similarity = address_similarity
+        self.title_similarity = title_similarity
+        self.price_tolerance = price_tolerance
+
+    @staticmethod
+    def _block(listing: dict, address: str) -> Tuple[Optional[float], str]:
+        street_number = re.search(r"\d+", address)
+        return to_number(listing.get("bedrooms")), street_number.group(0) if street_number else address[:1]
+
+    def _same_property(self, group: _Group, listing: dict, address: str, title: str) -> bool:
+        if not _similar(group.address, address, self.address_similarity):
+            return False
+        if _similar(group.title, title, self.title_similarity):
+            return True
+        price = to_number(listing.get("price"))
+        return (
+            group.price is not None and price is not None
+            and abs(group.price - price) <= self.price_tolerance * max(group.price, price)
+        )
+
+    def merge(self, feeds: Dict[str, List[dict]], listing_id: Callable[[dict], str]) -> List[dict]:
+        """Merge ``{endpoint: listings}`` in feed order.
+
+        Every merged listing gets an id of ``<feed key>:<id in its first feed>``, so ids
+        from different feeds never collide, and a ``sources`` list of the feeds it came from.
+        """
+        groups: List[_Group] = []
+        blocks: Dict[Tuple[Optional[float], str], List[_Group]] = {}
+        exact: Dict[Tuple[str, str], List[_Group]] = {}
+        for endpoint, listings in feeds.items():
+            for listing in listings:
+                address = normalize_text(listing.get("location"))
+                title = normalize_text(listing.get("title"))
+                listing = {**listing, "id": f"{feed_key(endpoint)}:{listing_id(listing)}"}
+
+                candidates = exact.get((address, title), []) + blocks.get(self._block(listing, address), [])
+                group = next(
+                    (g for g in candidates
+                     if endpoint not in g.endpoints and self._same_property(g, listing, address, title)),
+                    None,
+                )
+                if group is None:
+                    group = _Group(endpoint, listing, address, title)
+                    groups.append(group)
+                    blocks.setdefault(self._block(listing, address), []).append(group)
+                    exact.setdefault((address, title), []).append(group)
+                else:
+                    group.endpoints.append(endpoint)
+                    group.listings.append(listing)
+        return [group.merged() for group in groups]
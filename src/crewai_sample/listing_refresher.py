@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from crewai_sample.paths import storage_path
+from crewai_sample.tracing import span
+
+logger = logging.getLogger(__name__)
+
+Parser = Callable[[Dict[str, Any]], List[dict]]
+Subscriber = Callable[[List[dict]], None]
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def shared_session(pool_size: int = 16) -> requests.Session:
+    """One pooled HTTP session for every feed, so refreshes reuse warm keep-alive connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+class ListingRefresher:
+    """Keeps the last good copy of a listings feed fresh from a background thread.
+
+    Readers call ``properties()`` and always get the current snapshot immediately; the
+    upstream API is only polled from the refresher thread, using ETag and
+    Last-Modified conditional requests. Snapshots are mirrored to disk, so a restart
+    serves the previous data even while the API is slow or down. Only a cold start
+    without any snapshot on disk waits for the API (bounded by ``timeout``).
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        parse: Parser,
+        interval: float = 300,
+        timeout: float = 10,
+        session: Optional[requests.Session] = None,
+    ):
+        self.endpoint = endpoint
+        self.parse = parse
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session or shared_session()
+        self.path = storage_path("listings", f"{hashlib.sha1(endpoint.encode('utf-8')).hexdigest()[:16]}.json")
+        self.fetched_at = 0.0
+        self._properties: Optional[List[dict]] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._load_snapshot()
+
+    def properties(self) -> List[dict]:
+        """Return the latest snapshot without waiting on the API (except on a cold start)."""
+        if self._properties is None and not self.refresh():
+            raise ValueError(f"No listings available yet from {self.endpoint}.")
+        self.start()
+        return self._properties
+
+    def subscribe(self, callback: Subscriber) -> None:
+        """Call ``callback(properties)`` from the refresher thread whenever the feed changes."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="listing-refresher", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def refresh(self) -> bool:
+        """Revalidate the snapshot once; returns False if the API could not be reached."""
+        with self._refresh_lock:
+            headers = {}
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+            try:
+                with span("fetch", endpoint=self.endpoint) as fetch_span:
+                    response = self.session.get(self.endpoint, headers=headers, timeout=self.timeout)
+                    fetch_span.set("http.status_code", response.status_code)
+                    if response.status_code == 304 and self._properties is not None:
+                        self.fetched_at = time.time()
+                        return True
+                    response.raise_for_status()
+                    properties = self.parse(response.json())
+            except Exception as e:
+                logger.warning("Keeping the previous listings snapshot for %s: %s", self.endpoint, e)
+                return False
+
+            changed = properties != self._properties
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self.fetched_at = time.time()
+            # Readers detect changes by identity, so an identical payload keeps the old list
+            if changed:
+                self._properties = properties
+                self._save_snapshot()
+
+        if changed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(properties)
+                except Exception:
+                    logger.exception("Listings subscriber failed for %s", self.endpoint)
+        return True
+
+    def _loop(self) -> None:
+        # Revalidate right away if the snapshot came from an earlier run
+        wait = max(self.interval - (time.time() - self.fetched_at), 0)
+        while not self._stop.wait(wait):
+            self.refresh()
+            wait = self.interval
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self._properties = data.get("properties")
+        self._etag = data.get("etag")
+        self._last_modified = data.get("last_modified")
+        self.fetched_at = data.get("fetched_at", 0.0)
+
+    def _save_snapshot(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "endpoint": self.endpoint,
+                "etag": self._etag,
+                "last_modified": self._last_modified,
+                "fetched_at": self.fetched_at,
+                "properties": self._properties,
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+_refreshers: Dict[str, ListingRefresher] = {}
+_refreshers_lock = threading.Lock()
+
+
+def get_refresher(endpoint: str, parse: Parser, **kwargs: Any) -> ListingRefresher:
+    """Return the process-wide refresher for an endpoint, creating it on first use."""
+    with _refreshers_lock:
+        if endpoint not in _refreshers:
+            _refreshers[endpoint] = ListingRefresher(endpoint, parse, **kwargs)
+        return _refreshers[endpoint]
@@ -0,0 +1,212 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from crewai_sample.listing_fields import normalize, to_day, to_float
+
+NUMERIC_FIELDS = ("price", "bedrooms", "bathrooms", "date_added")
+CATEGORY_FIELDS = ("property_type", "location", "bedrooms", "bathrooms")
+
+
+class _Columns:
+    """Immutable columnar snapshot of the listings plus its indexes."""
+
+    def __init__(self, properties: List[dict]):
+        self.records = list(properties)
+        self.size = len(self.records)
+        self.columns = {
+            "price": np.array([to_float(p.get("price")) for p in self.records], dtype=np.float64),
+            "bedrooms": np.array([to_float(p.get("bedrooms")) for p in self.records], dtype=np.float64),
+            "bathrooms": np.array([to_float(p.get("bathrooms")) for p in self.records], dtype=np.float64),
+            "date_added": np.array([to_day(p.get("date_added")) for p in self.records], dtype="datetime64[D]"),
+        }
+
+        # Sorted indexes: row ids ordered by value, plus the sorted values for searchsorted
+        self.sorted_rows = {}
+        self.sorted_values = {}
+        for field in NUMERIC_FIELDS:
+            values = self.columns[field]
+            valid = np.flatnonzero(~np.isnat(values) if values.dtype.kind == "M" else ~np.isnan(values))
+            rows = valid[np.argsort(values[valid], kind="stable")]
+            self.sorted_rows[field] = rows
+            self.sorted_values[field] = values[rows]
+
+        # Hash indexes: normalized value -> row ids. Locations are also indexed by each
+        # comma-separated part so "brooklyn" matches "Park Slope, Brooklyn, NY".
+        self.hash_index: Dict[str, Dict[str, np.ndarray]] = {}
+        for field in CATEGORY_FIELDS:
+            buckets: Dict[str, List[int]] = {}
+            for row, record in enumerate(self.records):
+                value = record.get(field)
+                if value is None:
+                    continue
+                if field in ("bedrooms", "bathrooms"):
+                    keys = {normalize(to_float(value))}
+                else:
+                    keys = {normalize(value)}
+                    if field == "location":
+                        keys.update(normalize(part) for part in str(value).split(",") if part.strip())
+                for key in keys:
+                    buckets.setdefault(key, []).append(row)
+            self.hash_index[field] = {key: np.array(rows, dtype=np.int64) for key, rows in buckets.items()}
+
+
+class ListingStore:
+    """Typed, columnar in-memory store of property listings with sorted and hash indexes.
+
+    ``load`` swaps in a fresh snapshot atomically, so queries running on other threads
+    always see a consistent view of the catalog.
+    """
+
+    def __init__(self, properties: Optional[List[dict]] = None):
+        self._snapshot = _Columns(properties or [])
+
+    def __len__(self) -> int:
+        return self._snapshot.size
+
+    def load(self, properties: List[dict]) -> None:
+        """Replace the stored listings with a new API payload."""
+        self._snapshot = _Columns(properties)
+
+    def query(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        bedrooms: Optional[float] = None,
+        min_bedrooms: Optional[float] = None,
+        max_bedrooms: Optional[float] = None,
+        bathrooms: Optional[float] = None,
+        min_bathrooms: Optional[float] = None,
+        property_type: Optional[str] = None,
+        location: Optional[str] = None,
+        added_after: Optional[str] = None,
+        added_before: Optional[str] = None,
+        sort_by: str = "price",
+        descending: bool = False,
+        limit: Optional[int] = 20,
+    ) -> List[dict]:
+        """Return the listings matching every given filter, ordered by ``sort_by``.
+
+        Range bounds are inclusive and dates are ISO ``YYYY-MM-DD`` strings.
+        """
+        snapshot = self._snapshot
+        predicates = []
+
+        if bedrooms is not None:
+            predicates.append(self._equal(snapshot, "bedrooms", normalize(float(bedrooms))))
+        if bathrooms is not None:
+            predicates.append(self._equal(snapshot, "bathrooms", normalize(float(bathrooms))))
+        if property_type:
+            predicates.append(self._equal(snapshot, "property_type", normalize(property_type)))
+        if location:
+            predicates.append(self._equal(snapshot, "location", normalize(location)))
+        if min_price is not None or max_price is not None:
+            predicates.append(self._range(snapshot, "price", min_price, max_price))
+        if min_bedrooms is not None or max_bedrooms is not None:
+            predicates.append(self._range(snapshot, "bedrooms", min_bedrooms, max_bedrooms))
+        if min_bathrooms is not None:
+            predicates.append(self._range(snapshot, "bathrooms", min_bathrooms, None))
+        if added_after or added_before:
+            predicates.append(self._range(
+                snapshot,
+                "date_added",
+                to_day(added_after) if added_after else None,
+                to_day(added_before) if added_before else None,
+            ))
+
+        if predicates:
+            # Drive the query from the most selective index and check the remaining
+            # predicates only against those rows
+            predicates.sort(key=lambda predicate: predicate.size)
+            rows = predicates[0].rows()
+            for predicate in predicates[1:]:
+                if not len(rows):
+                    break
+                rows = rows[predicate.matches(rows)]
+        else:
+            rows = np.arange(snapshot.size)
+
+        if sort_by in snapshot.columns and len(rows):
+            values = snapshot.columns[sort_by][rows]
+            order = np.argsort(values, kind="stable")
+            if descending:
+                # Missing values ("call", no date) stay last instead of leading the results
+                missing = (np.isnat(values) if values.dtype.kind == "M" else np.isnan(values))[order]
+                order = np.concatenate([order[~missing][::-1], order[missing]])
+            rows = rows[order]
+        if limit is not None:
+            rows = rows[:limit]
+        return [snapshot.records[row] for row in rows]
+
+    def count(self, **filters: Any) -> int:
+        """Count the listings matching the filters accepted by ``query``."""
+        return len(self.query(sort_by="", limit=None, **filters))
+
+    @staticmethod
+    def _equal(snapshot: _Columns, field: str, key: str) -> "_Predicate":
+        return _EqualPredicate(snapshot.hash_index[field].get(key, np.empty(0, dtype=np.int64)))
+
+    @staticmethod
+    def _range(snapshot: _Columns, field: str, low: Any, high: Any) -> "_Predicate":
+        return _RangePredicate(snapshot, field, low, high)
+
+    @staticmethod
+    def describe(record: Dict[str, Any]) -> str:
+        """One-line summary of a listing for tool output."""
+        return (
+            f"{record.get('title')} | ${record.get('price')} per month | {record.get('location')} | "
+            f"{record.get('bedrooms')} bed / {record.get('bathrooms')} bath | "
+            f"{record.get('property_type')} | added {record.get('date_added')}"
+        )
+
+
+class _Predicate:
+    """A filter that can either enumerate its rows or test candidate rows."""
+
+    size: int
+
+    def rows(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def matches(self, rows: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class _EqualPredicate(_Predicate):
+    def __init__(self, bucket: np.ndarray):
+        self.bucket = bucket
+        self.size = len(bucket)
+
+    def rows(self) -> np.ndarray:
+        return self.bucket
+
+    def matches(self, rows: np.ndarray) -> np.ndarray:
+        # Buckets are sorted, so membership is a binary search per candidate
+        if not self.size:
+            return np.zeros(len(rows), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.bucket, rows), self.size - 1)
+        return self.bucket[positions] == rows
+
+
+class _RangePredicate(_Predicate):
+    def __init__(self, snapshot: _Columns, field: str, low: Any, high: Any):
+        self.snapshot = snapshot
+        self.field = field
+        self.low = low
+        self.high = high
+        values = snapshot.sorted_values[field]
+        self.start = 0 if low is None else np.searchsorted(values, low, side="left")
+        self.end = len(values) if high is None else np.searchsorted(values, high, side="right")
+        self.size = max(int(self.end - self.start), 0)
+
+    def rows(self) -> np.ndarray:
+        return self.snapshot.sorted_rows[self.field][self.start:self.end]
+
+    def matches(self, rows: np.ndarray) -> np.ndarray:
+        values = self.snapshot.columns[self.field][rows]
+        mask = ~np.isnat(values) if values.dtype.kind == "M" else ~np.isnan(values)
+        if self.low is not None:
+            mask &= values >= self.low
+        if self.high is not None:
+            mask &= values <= self.high
+        return mask
@@ -2,9 +2,6 @@
 import sys
 import warnings
 
-from crewai_sample.crew import CrewaiSample
-from crewai_sample.ecom_crew import EComCrew
-
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # This main file is intended to be a way for you to run your
@@ -12,15 +9,23 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
 
+# The crews are imported by the commands that use them: importing crewAI takes
+# seconds, and the e-commerce bot's knowledge is only needed by `ecom`.
+
+
+def _sample_crew():
+    from crewai_sample.crew import CrewaiSample
+
+    return CrewaiSample().crew()
+
 
 def ecom():
     """
     Run the crew.
     """
-    inputs = {
-        'user_question': 'What are the top trending products in the market?'
-    }
-    EComCrew().crew().kickoff(inputs=inputs)
+    from crewai_sample.ecom_crew import handle_user_input
+
+    print(handle_user_input('What are the top trending products in the market?'))
 
 def run():
     """
@@ -29,7 +34,7 @@ def run():
     inputs = {
         'company_name': 'Highonswift'
     }
-    CrewaiSample().crew().kickoff(inputs=inputs)
+    _sample_crew().kickoff(inputs=inputs)
 
 
 def train():
@@ -39,8 +44,11 @@ def train():
     inputs = {
         "company_name": "AI LLMs"
     }
+    from crewai_sample.parallel_iterations import train_in_parallel
+
     try:
-        CrewaiSample().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        # Iterations run in parallel (CREW_ITERATION_WORKERS at a time) and share the Exa cache
+        train_in_parallel(_sample_crew(), n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
@@ -50,7 +58,7 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        CrewaiSample().crew().replay(task_id=sys.argv[1])
+        _sample_crew().replay(task_id=sys.argv[1])
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
@@ -62,8 +70,11 @@ def test():
     inputs = {
         "company_name": "AI LLMs"
     }
+    from crewai_sample.parallel_iterations import test_in_parallel
+
     try:
-        CrewaiSample().crew().test(n_iterations=int(sys.argv[1]), openai_model_name=sys.argv[2], inputs=inputs)
+        # Iterations run in parallel (CREW_ITERATION_WORKERS at a time) and share the Exa cache
+        test_in_parallel(_sample_crew(), n_iterations=int(sys.argv[1]), openai_model_name=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
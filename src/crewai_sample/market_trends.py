@@ -0,0 +1,204 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from crewai_sample.listing_fields import normalize, to_day, to_float
+from crewai_sample.tracing import span
+
+PERIODS = ("week", "month", "all")
+# Metric -> the listing value it aggregates; new listings are the counts of the rent groups
+METRICS = {"rent": "price", "new_listings": "price", "price_per_bedroom": "price_per_bedroom"}
+VALUES = ("price", "price_per_bedroom")
+
+# (period kind, location key, property type key, period); None keys mean "any"
+GroupKey = Tuple[str, Optional[str], Optional[str], str]
+
+
+def _location_keys(location: Any) -> List[Optional[str]]:
+    """Same keys as the listing store's location index: the full location and each comma-separated part."""
+    keys: List[Optional[str]] = [None]
+    if location:
+        keys.append(normalize(location))
+        keys.extend(normalize(part) for part in str(location).split(",") if part.strip())
+    return list(dict.fromkeys(keys))
+
+
+def _group_stats(groups: List[np.ndarray]) -> Dict[str, np.ndarray]:
+    """Count, mean, median, min and max of every group's finite values, in one vectorized pass."""
+    sizes = np.array([len(group) for group in groups], dtype=np.int64)
+    codes = np.repeat(np.arange(len(groups)), sizes)
+    values = np.concatenate(groups)
+    # Sorted by group, then by value with NaN last, so every group is one sorted segment
+    values = values[np.lexsort((values, codes))]
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    finite = np.isfinite(values)
+    priced = np.add.reduceat(finite.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(finite, values, 0.0), starts)
+    last = starts + np.maximum(priced - 1, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        empty = priced == 0
+        return {
+            "listings": sizes,
+            "priced": priced,
+            "mean": np.where(empty, np.nan, sums / priced),
+            "median": np.where(empty, np.nan, (values[starts + (priced - 1) // 2] + values[starts + priced // 2]) / 2),
+            "min": np.where(empty, np.nan, values[starts]),
+            "max": np.where(empty, np.nan, values[last]),
+        }
+
+
+def _round(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+class MarketTrends:
+    """Market-trend rollups of the listings, kept up to date incrementally.
+
+    Rent and price per bedroom are aggregated by week and month of ``date_added``
+    (and over all time), for every location (and each part of it, e.g. "brooklyn"),
+    property type and their combinations. ``update`` diffs a new payload against the
+    previous one and recomputes only the groups that a new, changed or removed
+    listing belongs to, so the numbers are always exact and a query is a lookup.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, dict] = {}
+        self._keys: Dict[str, List[GroupKey]] = {}
+        self._members: Dict[str, Dict[GroupKey, Dict[str, float]]] = {value: {} for value in VALUES}
+        # value -> (period kind, location, property type) -> period -> stats
+        self._stats: Dict[str, Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, Dict[str, Any]]]] = {
+            value: {} for value in VALUES
+        }
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def update(self, properties: List[dict], listing_id: Callable[[dict], str]) -> int:
+        """Apply a new listings payload; returns how many listings were added, changed or removed."""
+        with self._lock, span("market_trends", records=len(properties)) as trends_span:
+            current = {listing_id(property): property for property in properties}
+            removed = [pid for pid in self._records if pid not in current]
+            changed = [
+                pid for pid, property in current.items()
+                if self._records.get(pid) is not property and self._records.get(pid) != property
+            ]
+            trends_span.set("listings.changed", len(changed))
+            trends_span.set("listings.removed", len(removed))
+            if not removed and not changed:
+                return 0
+
+            touched = set()
+            for pid in removed + [pid for pid in changed if pid in self._records]:
+                for key in self._keys.pop(pid):
+                    for members in self._members.values():
+                        members[key].pop(pid, None)
+                    touched.add(key)
+                del self._records[pid]
+
+            touched.update(self._add([(pid, current[pid]) for pid in changed]))
+            for value in VALUES:
+                self._recompute(value, touched)
+            trends_span.set("groups.recomputed", len(touched))
+            return len(removed) + len(changed)
+
+    def _add(self, listings: List[Tuple[str, dict]]) -> Iterable[GroupKey]:
+        if not listings:
+            return []
+        records = [property for _, property in listings]
+        prices = np.array([to_float(p.get("price")) for p in records], dtype=np.float64)
+        bedrooms = np.array([to_float(p.get("bedrooms")) for p in records], dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            per_bedroom = np.where(bedrooms > 0, prices / bedrooms, np.nan)
+
+        days = np.array([to_day(p.get("date_added")) for p in records], dtype="datetime64[D]")
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        weekdays = (days.astype(np.int64) + 3) % 7
+        weeks = np.datetime_as_string(days - weekdays.astype("timedelta64[D]"))
+        months = np.datetime_as_string(days.astype("datetime64[M]"))
+        dated = ~np.isnat(days)
+
+        touched = set()
+        for row, (pid, property) in enumerate(listings):
+            periods = [("all", "all")]
+            if dated[row]:
+                periods += [("week", str(weeks[row])), ("month", str(months[row]))]
+            property_type = property.get("property_type")
+            types = [None, normalize(property_type)] if property_type else [None]
+            keys = [
+                (kind, location, type_key, period)
+                for kind, period in periods
+                for location in _location_keys(property.get("location"))
+                for type_key in types
+            ]
+            for key in keys:
+                self._members["price"].setdefault(key, {})[pid] = prices[row]
+                self._members["price_per_bedroom"].setdefault(key, {})[pid] = per_bedroom[row]
+            self._records[pid] = property
+            self._keys[pid] = keys
+            touched.update(keys)
+        return touched
+
+    def _recompute(self, value: str, keys: Iterable[GroupKey]) -> None:
+        members = self._members[value]
+        stats = self._stats[value]
+        live = []
+        for key in keys:
+            if members.get(key):
+                live.append(key)
+                continue
+            # The last listing of this group is gone
+            members.pop(key, None)
+            series = stats.get(key[:3])
+            if series is not None:
+                series.pop(key[3], None)
+                if not series:
+                    del stats[key[:3]]
+        if not live:
+            return
+
+        columns = _group_stats([np.fromiter(members[key].values(), dtype=np.float64) for key in live])
+        for i, key in enumerate(live):
+            stats.setdefault(key[:3], {})[key[3]] = {
+                "period": key[3],
+                "listings": int(columns["listings"][i]),
+                "priced": int(columns["priced"][i]),
+                "median": _round(columns["median"][i]),
+                "mean": _round(columns["mean"][i]),
+                "min": _round(columns["min"][i]),
+                "max": _round(columns["max"][i]),
+            }
+
+    def trend(
+        self,
+        metric: str = "rent",
+        period: str = "month",
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """One row of stats per period, oldest first.
+
+        ``metric`` is one of ``METRICS`` and ``period`` one of ``PERIODS``; weeks are
+        named by their Monday (``YYYY-MM-DD``) and months as ``YYYY-MM``. ``start`` and
+        ``end`` are inclusive ISO dates.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {', '.join(METRICS)}.")
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(PERIODS)}.")
+        key = (period, normalize(location) if location else None, normalize(property_type) if property_type else None)
+        with self._lock:
+            series = dict(self._stats[METRICS[metric]].get(key, {}))
+        rows = []
+        for name in sorted(series):
+            # A week or month is in range when its start is; "2024-03" compares with "2024-03-15"[:7]
+            if period != "all" and start and name < start[:len(name)]:
+                continue
+            if period != "all" and end and name > end[:len(name)]:
+                continue
+            rows.append(dict(series[name]))
+        return rows
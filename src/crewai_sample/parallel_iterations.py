@@ -0,0 +1,159 @@
+import functools
+import logging
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from crewai import Agent, Crew
+from crewai.utilities.constants import TRAINING_DATA_FILE
+from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+from crewai.utilities.evaluators.task_evaluator import TaskEvaluator
+from crewai.utilities.training_handler import CrewTrainingHandler
+
+logger = logging.getLogger(__name__)
+
+# Crew.train and Crew.test are rebuilt here from private crewAI members (_setup_for_training,
+# _train_iteration, _telemetry, executor internals); pyproject.toml pins the crewAI they were
+# written for and tests/test_parallel_iterations.py runs them against the installed one
+
+# Iterations run at once; each one is a full crew run (research, LLM calls, evaluation)
+ITERATION_WORKERS = int(os.getenv("CREW_ITERATION_WORKERS", "4"))
+
+_training_io_lock = threading.RLock()
+
+
+def _run_iterations(crews: List[Crew], inputs: Optional[Dict[str, Any]], max_workers: int) -> List[bool]:
+    """Kick off every crew on a bounded thread pool; returns whether each one succeeded."""
+    succeeded = [False] * len(crews)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew-iteration") as executor:
+        futures = {executor.submit(crew.kickoff, inputs=inputs): index for index, crew in enumerate(crews)}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                succeeded[futures[future]] = True
+            except Exception:
+                logger.exception("Iteration %d failed", futures[future] + 1)
+    return succeeded
+
+
+def _serialized(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _training_io_lock:
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _serialize_training_io(agent: Agent) -> None:
+    """Let one iteration at a time ask ``agent`` for human feedback and update the training data file.
+
+    crewAI prompts on the terminal and rewrites the whole training pickle on every
+    update, which concurrent iterations would interleave and overwrite. The agent
+    builds a new executor for every task, so each one is wrapped as it is created;
+    other crews and agents are left alone.
+    """
+    create_agent_executor = agent.create_agent_executor
+
+    @functools.wraps(create_agent_executor)
+    def create_serialized_executor(*args: Any, **kwargs: Any) -> Any:
+        result = create_agent_executor(*args, **kwargs)
+        executor = agent.agent_executor
+        for name in ("_ask_human_input", "_handle_crew_training_output"):
+            setattr(executor, name, _serialized(getattr(executor, name)))
+        return result
+
+    # Agents are pydantic models; the wrapper is an instance attribute, not a field
+    object.__setattr__(agent, "create_agent_executor", create_serialized_executor)
+
+
+def _iteration_output_files(crew: Crew, iteration: int) -> None:
+    """Write each task's output file per iteration (report.md -> report.iteration-1.md)."""
+    for task in crew.tasks:
+        if task.output_file:
+            root, extension = os.path.splitext(task.output_file)
+            task.output_file = f"{root}.iteration-{iteration}{extension}"
+
+
+def train_in_parallel(
+    crew: Crew,
+    n_iterations: int,
+    filename: str,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_workers: int = ITERATION_WORKERS,
+) -> None:
+    """``Crew.train`` with up to ``max_workers`` iterations running at once.
+
+    Each iteration runs on its own copy of the crew and writes its own task output
+    files. Human feedback is still asked for one answer at a time, but the next
+    answer is usually ready by then. The feedback of all copies is filed under the
+    same agents, as a sequential run would, before the trained data is evaluated
+    and saved to ``filename``.
+    """
+    train_crew = crew.copy()
+    train_crew._setup_for_training(filename)
+
+    crews = []
+    for n_iteration in range(n_iterations):
+        iteration_crew = train_crew.copy()
+        iteration_crew._train = True
+        iteration_crew._train_iteration = n_iteration
+        _iteration_output_files(iteration_crew, n_iteration + 1)
+        for agent in iteration_crew.agents:
+            _serialize_training_io(agent)
+        crews.append(iteration_crew)
+
+    _run_iterations(crews, inputs, max_workers)
+
+    # Copies get new agent ids; key every iteration's feedback by the training crew's agents
+    training_handler = CrewTrainingHandler(TRAINING_DATA_FILE)
+    iteration_data = training_handler.load()
+    training_data: Dict[str, Dict[int, Any]] = {}
+    for iteration_crew in crews:
+        for agent, iteration_agent in zip(train_crew.agents, iteration_crew.agents):
+            training_data.setdefault(str(agent.id), {}).update(iteration_data.get(str(iteration_agent.id), {}))
+    training_handler.save(training_data)
+
+    for agent in train_crew.agents:
+        if training_data.get(str(agent.id)):
+            result = TaskEvaluator(agent).evaluate_training_data(training_data=training_data, agent_id=str(agent.id))
+            CrewTrainingHandler(filename).save_trained_data(agent_id=str(agent.role), trained_data=result.model_dump())
+
+
+def test_in_parallel(
+    crew: Crew,
+    n_iterations: int,
+    openai_model_name: Optional[str] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_workers: int = ITERATION_WORKERS,
+) -> None:
+    """``Crew.test`` with up to ``max_workers`` iterations running at once.
+
+    Every iteration runs and is scored on its own copy of the crew, with its own task
+    output files; the scores of the successful runs are merged into one report table.
+    """
+    test_crew = crew.copy()
+    test_crew._telemetry.test_execution_span(test_crew, n_iterations, inputs, openai_model_name)
+
+    evaluators = []
+    for iteration in range(1, n_iterations + 1):
+        evaluator = CrewEvaluator(test_crew.copy(), openai_model_name)
+        evaluator.set_iteration(iteration)
+        _iteration_output_files(evaluator.crew, iteration)
+        evaluators.append(evaluator)
+
+    succeeded = _run_iterations([evaluator.crew for evaluator in evaluators], inputs, max_workers)
+    runs = [evaluator for evaluator, ok in zip(evaluators, succeeded) if ok]
+    if not runs:
+        raise RuntimeError(f"All {n_iterations} test iterations failed.")
+
+    # Runs are renumbered so failed iterations leave no gaps in the table
+    report = CrewEvaluator(runs[0].crew, openai_model_name)
+    report.tasks_scores = defaultdict(list, {
+        run: list(evaluator.tasks_scores[evaluator.iteration]) for run, evaluator in enumerate(runs, start=1)
+    })
+    report.run_execution_times = defaultdict(list, {
+        run: list(evaluator.run_execution_times[evaluator.iteration]) for run, evaluator in enumerate(runs, start=1)
+    })
+    report.print_crew_evaluation_result()
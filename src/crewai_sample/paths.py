@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from crewai.utilities.paths import db_storage_path
+
+
+def storage_path(*parts: str) -> Path:
+    """Return a path under crewAI's storage directory, creating its parent folders."""
+    path = Path(db_storage_path(), *parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
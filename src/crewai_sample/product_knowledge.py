@@ -0,0 +1,96 @@
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+import requests
+from typing import Dict, Any, Iterator, Tuple
+from pydantic import Field
+
+from crewai_sample.embedding_index import EmbeddingIndex, sync_records
+from crewai_sample.record_format import format_record, record_metadata
+from crewai_sample.tracing import span
+
+
+class ProductKnowledgeSource(BaseKnowledgeSource):
+    """Knowledge source that streams product data from a paginated product API."""
+
+    api_endpoint: str = Field(description="API endpoint URL")
+    page_size: int = Field(default=100, description="Products requested per page (the API's `limit`)")
+    embed_batch_size: int = Field(default=512, description="Chunks embedded and saved per storage call")
+    request_timeout: float = Field(default=30, description="Timeout in seconds for one page request")
+
+    def load_content(self) -> Dict[Any, str]:
+        """Fetch and format the whole catalog as one text, as crewAI's source interface asks for.
+
+        Ingestion does not go through here: ``add`` streams the catalog from ``iter_chunks``.
+        """
+        return {self.api_endpoint: self._format_products(self.iter_products())}
+
+    def iter_products(self) -> Iterator[dict]:
+        """Yield products page by page, following the API's `limit`/`skip` pagination."""
+        skip = 0
+        with requests.Session() as session:
+            while True:
+                try:
+                    with span("fetch", endpoint=self.api_endpoint, skip=skip):
+                        response = session.get(
+                            self.api_endpoint,
+                            params={"limit": self.page_size, "skip": skip},
+                            timeout=self.request_timeout,
+                        )
+                        response.raise_for_status()  # Ensure the request was successful
+                        data = response.json()  # Parse the JSON response
+                except Exception as e:
+                    raise ValueError(f"Failed to fetch product data: {str(e)}")
+
+                products = data.get('products', [])  # Extract the products from the response
+                yield from products
+
+                skip += len(products)
+                if not products or skip >= data.get('total', 0):
+                    break
+
+    def _format_product(self, product: dict) -> str:
+        """Format a single product into one compact chunk."""
+        return format_record({
+            "Name": product.get('title'),
+            "Price": product.get('price'),
+            "Brand": product.get('brand'),
+            "Category": product.get('category'),
+            "Description": product.get('description'),
+        })
+
+    def _product_metadata(self, product: dict) -> Dict[str, Any]:
+        """Structured fields stored next to a product's chunk; the QR code URL lives only here."""
+        return record_metadata({
+            "price": product.get('price'),
+            "category": product.get('category'),
+            "brand": product.get('brand'),
+            "rating": product.get('rating'),
+            "stock": product.get('stock'),
+            "url": product.get('meta', {}).get('qrCode'),
+        })
+
+    def _format_products(self, products) -> str:
+        """Format products into readable text."""
+        return "Product Information:\n\n" + "\n\n".join(self._format_product(product) for product in products)
+
+    def iter_chunks(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (product id, chunk, metadata) for every product in the catalog.
+
+        Each product is exactly one chunk, so retrieval always returns whole products.
+        """
+        for product in self.iter_products():
+            yield str(product.get('id', product['title'])), self._format_product(product), self._product_metadata(product)
+
+    def add(self) -> None:
+        """Stream the catalog into storage, embedding new or changed products in bounded batches.
+
+        Only the current batch and the set of product ids are held in memory, so peak
+        memory does not grow with the size of the catalog.
+        """
+        with span("knowledge_sync", source=self.api_endpoint):
+            index = EmbeddingIndex.for_collection(
+                self.collection_name or self.storage.collection_name or "knowledge", self.api_endpoint
+            )
+            sync_records(
+                self.storage, index, self.api_endpoint, "product_id", self.iter_chunks(),
+                batch_size=self.embed_batch_size,
+            )
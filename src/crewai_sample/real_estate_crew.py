@@ -1,132 +1,146 @@
-from crewai import Agent, Task, Crew, Process, LLM
-from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
-import requests
-from typing import Dict, Any
-from pydantic import BaseModel, Field
+from crewai import Task, Crew, Process
 from dotenv import load_dotenv
-import uuid
+from typing import Any, Dict, Optional
+import os
+import threading
+
+from crewai_sample.answer_cache import AnswerCache
+from crewai_sample.crew_pool import crew_pool, shared_llm
+from crewai_sample.embedding_scheduler import scheduled_embedder
+from crewai_sample.hybrid_knowledge import HybridKnowledgeAgent
+from crewai_sample.real_estate_knowledge import RealEstateKnowledgeSource
+from crewai_sample.tools.geo_search_tool import GeoSearchTool
+from crewai_sample.tools.listing_search_tool import ListingSearchTool
+from crewai_sample.tools.market_trend_tool import MarketTrendTool
+from crewai_sample.tracing import span
 
 # Load environment variables from .env file
 load_dotenv()
 
-class RealEstateKnowledgeSource(BaseKnowledgeSource):
-    """Knowledge source that fetches data from a real estate API."""
-    
-    api_endpoint: str = Field(description="API endpoint URL")
-    
-    def load_content(self) -> Dict[Any, str]:
-        """Fetch and format real estate data from the remote API."""
-        try:
-            # Make a GET request to the API to fetch real estate data
-            response = requests.get(self.api_endpoint)
-            response.raise_for_status()  # Ensure the request was successful
-
-            data = response.json()  # Parse the JSON response
-            if not data.get("success", False):
-                raise ValueError("API response indicates failure.")
-
-            properties = data.get("data", [])
-            if not properties:
-                raise ValueError("No property data found in the API response.")
-
-            formatted_data = self._format_properties(properties)
-            return {self.api_endpoint: formatted_data}
-        except Exception as e:
-            raise ValueError(f"Failed to fetch real estate data: {str(e)}")
-
-    def _format_properties(self, properties: list) -> str:
-        """Format real estate properties into readable text."""
-        formatted = "Real Estate Listings:\n\n"
-        for property in properties:
-            formatted += f"""
-                Title: {property['title']}
-                Price: ${property['price']} per month
-                Location: {property['location']}
-                Bedrooms: {property['bedrooms']}
-                Bathrooms: {property['bathrooms']}
-                Property Type: {property['property_type']}
-                Date Added: {property['date_added']}
-                Images: {", ".join(property['images'])}
-                -------------------\n
-            """
-        return formatted.strip()
-
-    def add(self) -> None:
-        """Process and store the real estate data."""
-        content = self.load_content()
-        for _, text in content.items():
-            chunks = self._chunk_text(text)
-            self.chunks.extend(chunks)
-        
-        # Save documents with metadata
-        chunks_metadata = [
-            {
-                "chunk_id": str(uuid.uuid4()),
-                "source": self.api_endpoint,
-                "description": f"Chunk {i + 1} from API response"
-            }
-            for i in range(len(self.chunks))
-        ]
-
-        # Save documents (chunks) and metadata
-        self.save_documents(metadata=chunks_metadata)
-
-# Create knowledge source
-real_estate_knowledge = RealEstateKnowledgeSource(
-    api_endpoint="https://mocki.io/v1/504c8820-2957-495e-942d-b0bdec66b6d0",
-)
-
-# Create specialized agent
-real_estate_agent = Agent(
-    role="Real Estate Agent",
-    goal="Answer questions about real estate properties and trends accurately and comprehensively",
-    backstory="""You are a real estate agent with expertise in various property types, market trends, and neighborhood dynamics.
-    You excel at answering questions about properties and providing detailed, accurate information.""",
-    knowledge_sources=[real_estate_knowledge],
-    llm=LLM(model="gpt-4o-mini", temperature=0.0)
-)
+EMBEDDING_MODEL = "text-embedding-3-small"
 
-# Function to handle user questions dynamically
-def handle_user_input(user_question: str):
-    """Handles user input, creates a task, and returns the answer based on real estate knowledge."""
-    
-    # Create task for the user question
+DEFAULT_LISTING_FEED = "https://mocki.io/v1/504c8820-2957-495e-942d-b0bdec66b6d0"
+
+_real_estate_knowledge: Optional[RealEstateKnowledgeSource] = None
+_real_estate_knowledge_lock = threading.Lock()
+
+
+def get_real_estate_knowledge() -> RealEstateKnowledgeSource:
+    """The knowledge source shared by every pooled agent, created on first use.
+
+    REAL_ESTATE_API_ENDPOINTS takes a comma-separated list of feeds, which are fetched
+    concurrently and merged.
+    """
+    global _real_estate_knowledge
+    with _real_estate_knowledge_lock:
+        if _real_estate_knowledge is None:
+            _real_estate_knowledge = RealEstateKnowledgeSource(
+                api_endpoints=[
+                    endpoint.strip()
+                    for endpoint in os.getenv("REAL_ESTATE_API_ENDPOINTS", DEFAULT_LISTING_FEED).split(",")
+                    if endpoint.strip()
+                ],
+            )
+        return _real_estate_knowledge
+
+
+def _embedder_config(api_key: Optional[str] = None) -> Dict[str, Any]:
+    """The agent and the answer cache share one scheduled embedder per API key."""
+    return scheduled_embedder(
+        {"provider": "openai", "config": {"api_key": api_key, "model": EMBEDDING_MODEL}} if api_key else None
+    )
+
+
+def build_real_estate_crew(api_key: Optional[str] = None) -> Crew:
+    """Create the real estate agent and a crew whose task takes the question as an input."""
+    real_estate_knowledge = get_real_estate_knowledge()
+
+    # Create specialized agent
+    real_estate_agent = HybridKnowledgeAgent(
+        role="Real Estate Agent",
+        goal="Answer questions about real estate properties and trends accurately and comprehensively",
+        backstory="""You are a real estate agent with expertise in various property types, market trends, and neighborhood dynamics.
+        You excel at answering questions about properties and providing detailed, accurate information.""",
+        knowledge_sources=[real_estate_knowledge],
+        embedder_config=_embedder_config(api_key),
+        tools=[
+            ListingSearchTool(store=real_estate_knowledge.listing_store),
+            MarketTrendTool(trends=real_estate_knowledge.market_trends),
+            GeoSearchTool(index=real_estate_knowledge.geo_index),
+        ],
+        llm=shared_llm("gpt-4o-mini", api_key=api_key, temperature=0.0)
+    )
+
+    # The question is interpolated from the kickoff inputs on every run
     analysis_task = Task(
-        description=f"Answer this question about real estate: {user_question}",
+        description="Answer this question about real estate: {user_question}",
         expected_output="A detailed answer based on the recent real estate data",
         agent=real_estate_agent
     )
-    
-    # Create and run the crew
-    crew = Crew(
+
+    return Crew(
         agents=[real_estate_agent],
         tasks=[analysis_task],
         verbose=True,
         process=Process.sequential
     )
-    
-    # Get the answer for the user question
-    result = crew.kickoff(
-        inputs={"user_question": user_question}
-    )
-    
-    return result
+
+
+crew_pool.register("real_estate", build_real_estate_crew)
+
+_answer_caches: Dict[Optional[str], AnswerCache] = {}
+_answer_caches_lock = threading.Lock()
+
+
+def get_answer_cache(api_key: Optional[str] = None) -> AnswerCache:
+    """Answers are reused until the listings change; one cache per API key."""
+    with _answer_caches_lock:
+        if api_key not in _answer_caches:
+            _answer_caches[api_key] = AnswerCache(embed=_embedder_config(api_key)["provider"])
+        return _answer_caches[api_key]
+
+
+# Function to handle user questions dynamically
+def handle_user_input(user_question: str, api_key: Optional[str] = None) -> str:
+    """Answers the question with a pooled real estate crew, returning cached answers when possible."""
+    with span("chat_turn", bot="real_estate") as turn_span:
+        answer_cache = get_answer_cache(api_key)
+        real_estate_knowledge = get_real_estate_knowledge()
+        data_version = real_estate_knowledge.data_version
+        cached_answer = answer_cache.get(user_question, version=data_version)
+        turn_span.cache("answer", cached_answer is not None)
+        if cached_answer is not None:
+            return cached_answer
+
+        # Get the answer for the user question
+        with crew_pool.checkout("real_estate", api_key) as crew, span("kickoff", bot="real_estate"):
+            result = crew.kickoff(
+                inputs={"user_question": user_question}
+            )
+
+        # A refresh during kickoff may have answered from either snapshot, so only cache
+        # answers whose data did not change; building the first crew sets the version
+        current_version = real_estate_knowledge.data_version
+        if data_version is None or current_version == data_version:
+            answer_cache.put(user_question, result.raw, version=current_version)
+        return result.raw
 
 # Chatbot loop to allow user interaction
 def chatbot_interaction():
     print("Welcome to the Real Estate Knowledge Chatbot! Ask me anything about real estate.")
-    
+
     while True:
         user_question = input("You: ")  # Ask the user for input
         if user_question.lower() in ['exit', 'quit', 'bye']:  # Allow the user to exit the chat
             print("Goodbye!")
             break
-        
+
         # Get the answer based on the user's question
         answer = handle_user_input(user_question)
-        
+
         # Display the answer
         print(f"Chatbot: {answer}\n")
 
 # Start the chatbot interaction
-chatbot_interaction()
\ No newline at end of file
+if __name__ == "__main__":
+    chatbot_interaction()
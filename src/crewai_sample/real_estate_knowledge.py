@@ -0,0 +1,278 @@
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Set, Tuple
+import logging
+import threading
+import time
+from pydantic import Field, PrivateAttr, model_validator
+
+from crewai_sample.embedding_index import EmbeddingIndex, SyncResult, sync_records
+from crewai_sample.geo_index import GeoIndex
+from crewai_sample.listing_fields import to_number
+from crewai_sample.listing_merge import ListingMerger, feed_key
+from crewai_sample.listing_refresher import ListingRefresher, get_refresher
+from crewai_sample.listing_store import ListingStore
+from crewai_sample.market_trends import MarketTrends
+from crewai_sample.record_format import format_record, record_metadata
+from crewai_sample.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class RealEstateKnowledgeSource(BaseKnowledgeSource):
+    """Knowledge source that fetches data from one or more real estate APIs.
+
+    Several feeds with overlapping inventory are fetched concurrently and merged,
+    with duplicate listings folded together before anything is embedded.
+    """
+
+    api_endpoint: Optional[str] = Field(default=None, description="API endpoint URL of a single feed")
+    api_endpoints: List[str] = Field(
+        default_factory=list,
+        description="API endpoint URLs of several feeds, in order of preference for merged listings",
+    )
+    incremental: bool = Field(
+        default=True,
+        description="Only embed new or changed listings and delete removed ones on refresh",
+    )
+    listing_store: ListingStore = Field(
+        default_factory=ListingStore,
+        exclude=True,
+        description="Structured copy of the latest listings for exact filtering",
+    )
+    market_trends: MarketTrends = Field(
+        default_factory=MarketTrends,
+        exclude=True,
+        description="Rent and new-listing rollups of the latest listings, updated incrementally",
+    )
+    geo_index: GeoIndex = Field(
+        default_factory=GeoIndex,
+        exclude=True,
+        description="Coordinates of the latest listings for radius and nearest-listing queries",
+    )
+
+    refresh_interval: float = Field(default=300, description="Seconds between background polls of the API")
+    request_timeout: float = Field(default=10, description="Timeout in seconds for one request to the API")
+    feed_timeouts: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-endpoint overrides of request_timeout, e.g. for a slow feed",
+    )
+    merger: ListingMerger = Field(
+        default_factory=ListingMerger,
+        exclude=True,
+        description="Folds listings of the same property from different feeds together",
+    )
+
+    _data_version: Optional[str] = PrivateAttr(default=None)
+    _loaded_properties: Optional[List[dict]] = PrivateAttr(default=None)
+    _merged_from: Tuple[List[dict], ...] = PrivateAttr(default=())
+    _unavailable_feeds: Set[str] = PrivateAttr(default_factory=set)
+    _sync_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @model_validator(mode="after")
+    def _check_endpoints(self) -> "RealEstateKnowledgeSource":
+        if not self.endpoints:
+            raise ValueError("RealEstateKnowledgeSource needs an api_endpoint or api_endpoints.")
+        return self
+
+    @property
+    def endpoints(self) -> List[str]:
+        endpoints = list(self.api_endpoints)
+        if self.api_endpoint and self.api_endpoint not in endpoints:
+            endpoints.insert(0, self.api_endpoint)
+        return endpoints
+
+    @property
+    def source(self) -> str:
+        """Name the stored listings are filed under: the endpoint itself for a single feed."""
+        endpoints = self.endpoints
+        return endpoints[0] if len(endpoints) == 1 else f"feeds:{feed_key('|'.join(endpoints))}"
+
+    @property
+    def data_version(self) -> Optional[str]:
+        """Fingerprint of the stored listings, or None before the first sync."""
+        return self._data_version
+
+    def load_content(self) -> Dict[Any, str]:
+        """Fetch and format real estate data from the remote API."""
+        properties = self.fetch_properties()
+        return {self.source: self._format_properties(properties)}
+
+    def fetch_properties(self) -> List[dict]:
+        """Return the latest property records without waiting on the remote APIs.
+
+        Each API is polled by its own background refresher; only the very first call
+        of a process with no snapshot on disk waits for them. With several feeds, the
+        ones that fail or time out are skipped and the others are merged.
+        """
+        try:
+            feeds = self._fetch_feeds()
+        except Exception as e:
+            raise ValueError(f"Failed to fetch real estate data: {str(e)}")
+
+        if len(self.endpoints) == 1:
+            properties = feeds[self.endpoints[0]]
+        else:
+            snapshots = tuple(feeds.values())
+            # Refreshers hand out the same list until their feed changes
+            if len(snapshots) != len(self._merged_from) or any(
+                a is not b for a, b in zip(snapshots, self._merged_from)
+            ):
+                self._loaded_properties = self.merger.merge(feeds, self._property_id)
+                self._merged_from = snapshots
+                self._load_listings(self._loaded_properties)
+            return self._loaded_properties
+
+        if properties is not self._loaded_properties:
+            self._load_listings(properties)
+            self._loaded_properties = properties
+        return properties
+
+    def _load_listings(self, properties: List[dict]) -> None:
+        """Bring the structured store, the market rollups and the geo index up to date with a changed payload."""
+        self.listing_store.load(properties)
+        self.market_trends.update(properties, self._property_id)
+        self.geo_index.load(properties)
+
+    def _fetch_feeds(self) -> Dict[str, List[dict]]:
+        """The latest snapshot of every feed that answered within its timeout, in feed order.
+
+        Feeds are fetched concurrently, so a cold start takes as long as the slowest
+        feed rather than the sum of all of them. A feed that is skipped keeps
+        refreshing in the background and is merged in on a later sync.
+        """
+        endpoints = self.endpoints
+        if len(endpoints) == 1:
+            return {endpoints[0]: self._refresher(endpoints[0]).properties()}
+
+        executor = ThreadPoolExecutor(max_workers=len(endpoints), thread_name_prefix="listing-feed")
+        futures = {endpoint: executor.submit(self._refresher(endpoint).properties) for endpoint in endpoints}
+        executor.shutdown(wait=False)
+
+        start = time.monotonic()
+        feeds: Dict[str, List[dict]] = {}
+        unavailable: Set[str] = set()
+        for endpoint, future in futures.items():
+            remaining = self._feed_timeout(endpoint) - (time.monotonic() - start)
+            try:
+                feeds[endpoint] = future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                logger.warning("Skipping listing feed %s: no answer within %ss", endpoint, self._feed_timeout(endpoint))
+                unavailable.add(feed_key(endpoint))
+            except Exception as e:
+                logger.warning("Skipping listing feed %s: %s", endpoint, e)
+                unavailable.add(feed_key(endpoint))
+        if not feeds:
+            raise ValueError(f"None of the {len(endpoints)} listing feeds could be reached.")
+        self._unavailable_feeds = unavailable
+        return feeds
+
+    def _feed_timeout(self, endpoint: str) -> float:
+        return self.feed_timeouts.get(endpoint, self.request_timeout)
+
+    @staticmethod
+    def _parse_response(data: Dict[str, Any]) -> List[dict]:
+        """Validate an API response and extract its property records."""
+        if not data.get("success", False):
+            raise ValueError("API response indicates failure.")
+
+        properties = data.get("data", [])
+        if not properties:
+            raise ValueError("No property data found in the API response.")
+        return properties
+
+    def _refresher(self, endpoint: str) -> ListingRefresher:
+        return get_refresher(
+            endpoint,
+            self._parse_response,
+            interval=self.refresh_interval,
+            timeout=self._feed_timeout(endpoint),
+        )
+
+    def _format_property(self, property: dict) -> str:
+        """Format a single real estate property into one compact chunk."""
+        return format_record({
+            "Title": property.get('title'),
+            "Price": f"${property['price']} per month" if property.get('price') is not None else None,
+            "Location": property.get('location'),
+            "Bedrooms": property.get('bedrooms'),
+            "Bathrooms": property.get('bathrooms'),
+            "Property Type": property.get('property_type'),
+            "Date Added": property.get('date_added'),
+        })
+
+    def _property_metadata(self, property: dict) -> Dict[str, Any]:
+        """Structured fields stored next to a listing's chunk; image URLs live only here."""
+        return record_metadata({
+            "price": to_number(property.get('price')),
+            "bedrooms": to_number(property.get('bedrooms')),
+            "bathrooms": to_number(property.get('bathrooms')),
+            "property_type": property.get('property_type'),
+            "location": property.get('location'),
+            "date_added": property.get('date_added'),
+            "images": property.get('images'),
+        })
+
+    def _format_properties(self, properties: list) -> str:
+        """Format real estate properties into readable text."""
+        formatted = "Real Estate Listings:\n\n"
+        formatted += "\n\n".join(self._format_property(property) for property in properties)
+        return formatted.strip()
+
+    def add(self) -> None:
+        """Process and store the real estate data, and keep it in sync with the API."""
+        self.sync(full=not self.incremental)
+        for endpoint in self.endpoints:
+            self._refresher(endpoint).subscribe(self._on_listings_updated)
+
+    def _on_listings_updated(self, properties: List[dict]) -> None:
+        """Apply a changed feed from the refresher thread."""
+        self.sync()
+
+    def sync(self, full: bool = False) -> SyncResult:
+        """Diff the API payload against the stored listings and apply only the changes.
+
+        New and changed listings are (re-)embedded, listings that disappeared from the
+        feed are deleted. With ``full=True`` every stored listing is dropped and rebuilt.
+        """
+        with self._sync_lock, span("knowledge_sync", source=self.source) as sync_span:
+            result = self._sync(full)
+            for key, value in result.model_dump().items():
+                sync_span.set(f"listings.{key}", value)
+            return result
+
+    def _sync(self, full: bool) -> SyncResult:
+        properties = self.fetch_properties()
+        index = EmbeddingIndex.for_collection(self._collection_name(), self.source)
+
+        # One chunk per listing, so every retrieved chunk is a complete record
+        with span("chunk", records=len(properties)):
+            records = {
+                self._property_id(property): (self._format_property(property), self._property_metadata(property))
+                for property in properties
+            }
+
+        # Listings of a feed that is down for now are kept until it answers again
+        unavailable = self._unavailable_feeds
+        result = sync_records(
+            self.storage,
+            index,
+            self.source,
+            "property_id",
+            ((pid, chunk, metadata) for pid, (chunk, metadata) in records.items()),
+            rebuild=full,
+            keep=lambda pid: pid.split(":", 1)[0] in unavailable,
+        )
+        self._data_version = index.fingerprint()
+        return result
+
+    @staticmethod
+    def _property_id(property: dict) -> str:
+        """Stable identity of a listing: its API id, or its title and location."""
+        if property.get("id") is not None:
+            return str(property["id"])
+        key = f"{property['title']}|{property['location']}".strip().lower()
+        return EmbeddingIndex.digest(key)[:16]
+
+    def _collection_name(self) -> str:
+        return self.collection_name or self.storage.collection_name or "knowledge"
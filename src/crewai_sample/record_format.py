@@ -0,0 +1,37 @@
+from typing import Any, Dict, Union
+
+MetadataValue = Union[str, int, float, bool]
+
+
+def compact(value: Any) -> str:
+    """Collapse runs of whitespace (including newlines) into single spaces."""
+    return " ".join(str(value).split())
+
+
+def format_record(fields: Dict[str, Any]) -> str:
+    """Format one record as compact ``Label: value`` lines, skipping blank values.
+
+    Each record becomes exactly one chunk, so retrieval always returns whole records
+    and no embedding tokens are spent on indentation or separators.
+    """
+    lines = []
+    for label, value in fields.items():
+        if value is None:
+            continue
+        text = compact(value)
+        if text:
+            lines.append(f"{label}: {text}")
+    return "\n".join(lines)
+
+
+def record_metadata(fields: Dict[str, Any]) -> Dict[str, MetadataValue]:
+    """Keep the values the vector store can filter on; it rejects None and nested types."""
+    metadata: Dict[str, MetadataValue] = {}
+    for key, value in fields.items():
+        if isinstance(value, (bool, int, float)):
+            metadata[key] = value
+        elif isinstance(value, str) and value.strip():
+            metadata[key] = compact(value)
+        elif isinstance(value, (list, tuple)) and value:
+            metadata[key] = ", ".join(compact(item) for item in value)
+    return metadata
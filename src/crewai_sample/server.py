@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+import asyncio
+import contextvars
+import importlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from crewai_sample.tracing import metrics, span
+
+# Bot name -> module exposing handle_user_input(question, api_key). Modules are imported
+# on first use so the server starts without ingesting every knowledge base.
+BOT_MODULES = {
+    "real_estate": "crewai_sample.real_estate_crew",
+    "ecommerce": "crewai_sample.ecom_crew",
+    "cit_alumni": "crewai_sample.alumni_crew",
+}
+
+MAX_CONCURRENCY = int(os.getenv("BOT_SERVER_MAX_CONCURRENCY", "32"))
+REQUEST_TIMEOUT = float(os.getenv("BOT_SERVER_REQUEST_TIMEOUT", "120"))
+WARM_BOTS = [bot for bot in os.getenv("BOT_SERVER_WARM", "").split(",") if bot]
+
+
+class ChatRequest(BaseModel):
+    """Bots always use the server's configured provider keys.
+
+    Per-request keys are rejected: pools, LLM clients and embedding schedulers are
+    kept per key for the life of the process, so callers must not be able to mint new ones.
+    """
+
+    question: str = Field(..., min_length=1, description="The user's question.")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ChatResponse(BaseModel):
+    bot: str
+    answer: str
+    seconds: float
+
+
+class BotRunner:
+    """Runs the synchronous crews on a bounded thread pool.
+
+    At most ``max_concurrency`` kickoffs run at once; further requests wait for a slot.
+    A request that times out stops waiting, but its kickoff cannot be interrupted and
+    keeps holding its slot until it finishes, so the pool never oversubscribes.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, timeout: float = REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crew")
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._handlers: Dict[str, Callable[[str, Optional[str]], str]] = {}
+
+    def handler(self, bot: str) -> Callable[[str, Optional[str]], str]:
+        if bot not in self._handlers:
+            self._handlers[bot] = importlib.import_module(BOT_MODULES[bot]).handle_user_input
+        return self._handlers[bot]
+
+    async def run(self, func: Callable, *args):
+        await self._slots.acquire()
+        try:
+            # Carry the request's span context into the worker thread
+            context = contextvars.copy_context()
+            future = asyncio.get_running_loop().run_in_executor(self._executor, context.run, func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        # Shield so a timeout abandons the wait, not the slot accounting
+        return await asyncio.shield(future)
+
+    async def ask(self, bot: str, question: str) -> str:
+        handler = await self.run(self.handler, bot)
+        return await asyncio.wait_for(self.run(handler, question), self.timeout)
+
+    async def warm(self, bot: str) -> None:
+        from crewai_sample.crew_pool import crew_pool
+
+        await self.run(self.handler, bot)
+        await self.run(crew_pool.warm, bot)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.runner = BotRunner()
+    for bot in WARM_BOTS:
+        await app.state.runner.warm(bot)
+    yield
+    app.state.runner.shutdown()
+
+
+app = FastAPI(title="Highonswift bots", lifespan=lifespan)
+
+
+@app.get("/healthz")
+async def healthz() -> Dict[str, str]:
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> str:
+    return metrics.render()
+
+
+@app.get("/bots")
+async def list_bots() -> Dict[str, list]:
+    return {"bots": sorted(BOT_MODULES)}
+
+
+@app.post("/bots/{bot}/chat", response_model=ChatResponse)
+async def chat(bot: str, request: ChatRequest) -> ChatResponse:
+    if bot not in BOT_MODULES:
+        raise HTTPException(status_code=404, detail=f"Unknown bot '{bot}'.")
+    start = time.perf_counter()
+    try:
+        with span("http_request", bot=bot):
+            answer = await app.state.runner.ask(bot, request.question)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="The bot did not answer in time.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    return ChatResponse(bot=bot, answer=answer, seconds=round(time.perf_counter() - start, 3))
+
+
+def run():
+    """
+    Serve every bot over HTTP.
+    """
+    uvicorn.run(
+        app,
+        host=os.getenv("BOT_SERVER_HOST", "0.0.0.0"),
+        port=int(os.getenv("BOT_SERVER_PORT", "8000")),
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,149 @@
+import contextvars
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import litellm
+from crewai import LLM
+
+from crewai_sample.tracing import Span, span
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+# Where the current thread's final-answer tokens go; unset means "do not stream"
+_token_sink: contextvars.ContextVar[Optional[Callable[[str], None]]] = contextvars.ContextVar(
+    "token_sink", default=None
+)
+
+
+class _FinalAnswerFilter:
+    """Passes through only the text after the agent's "Final Answer:" marker.
+
+    The agent's intermediate thoughts and tool calls come through the same LLM, so
+    tokens are held back until the marker shows up.
+    """
+
+    def __init__(self, sink: Callable[[str], None]):
+        self.sink = sink
+        self.buffer = ""
+        self.streaming = False
+
+    def feed(self, text: str) -> None:
+        if self.streaming:
+            self.sink(text)
+            return
+        self.buffer += text
+        position = self.buffer.find(FINAL_ANSWER_MARKER)
+        if position >= 0:
+            self.streaming = True
+            remainder = self.buffer[position + len(FINAL_ANSWER_MARKER):].lstrip()
+            if remainder:
+                self.sink(remainder)
+
+
+class StreamingLLM(LLM):
+    """LLM that streams its completions when a token sink is active on the calling thread.
+
+    Without a sink it behaves exactly like ``LLM``, so pooled agents can serve both
+    streaming and non-streaming callers.
+    """
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        with span("llm", model=self.model) as llm_span:
+            sink = _token_sink.get()
+            llm_span.set("streaming", sink is not None)
+            if sink is None:
+                text = super().call(messages, callbacks)
+                llm_span.add_tokens("prompt", litellm.token_counter(model=self.model, messages=messages))
+                llm_span.add_tokens("completion", litellm.token_counter(model=self.model, text=text))
+                return text
+            return self._stream(messages, callbacks, sink, llm_span)
+
+    def _stream(
+        self, messages: List[Dict[str, str]], callbacks: List[Any], sink: Callable[[str], None], llm_span: Span
+    ) -> str:
+        if callbacks and len(callbacks) > 0:
+            self.set_callbacks(callbacks)
+
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "timeout": self.timeout,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "n": self.n,
+            "stop": self.stop,
+            "max_tokens": self.max_tokens or self.max_completion_tokens,
+            "presence_penalty": self.presence_penalty,
+            "frequency_penalty": self.frequency_penalty,
+            "logit_bias": self.logit_bias,
+            "seed": self.seed,
+            "api_base": self.base_url,
+            "api_version": self.api_version,
+            "api_key": self.api_key,
+            **self.kwargs,
+            "stream": True,
+            # Lets the token usage callbacks see the totals at the end of the stream
+            "stream_options": {"include_usage": True},
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+
+        answer_filter = _FinalAnswerFilter(sink)
+        parts = []
+        usage = None
+        for chunk in litellm.completion(**params):
+            # Only the final chunk carries the totals
+            usage = getattr(chunk, "usage", None) or usage
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                parts.append(text)
+                answer_filter.feed(text)
+        if usage:
+            llm_span.add_tokens("prompt", usage.prompt_tokens)
+            llm_span.add_tokens("completion", usage.completion_tokens)
+        return "".join(parts)
+
+
+class AnswerStream:
+    """Runs a blocking answer function in a worker thread and iterates its answer tokens.
+
+    Iterate it (e.g. with ``st.write_stream``) to render tokens as they arrive; once the
+    iteration is over, ``result`` holds the complete answer returned by the function.
+    If nothing was streamed (a cache hit, or a model that never emitted the final
+    answer marker), the complete answer is yielded in one piece.
+    """
+
+    _DONE = object()
+
+    def __init__(self, answer: Callable[[], str]):
+        self.answer = answer
+        self.result: Optional[str] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        # Run the answer in the caller's context so its spans nest under the caller's
+        self._context = contextvars.copy_context()
+
+    def _run(self) -> None:
+        _token_sink.set(self._queue.put)
+        try:
+            self.result = str(self.answer())
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._queue.put(self._DONE)
+
+    def __iter__(self) -> Iterator[str]:
+        threading.Thread(target=self._context.run, args=(self._run,), name="answer-stream", daemon=True).start()
+        streamed = False
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                break
+            streamed = True
+            yield item
+        if self._error is not None:
+            raise self._error
+        if not streamed and self.result:
+            yield self.result
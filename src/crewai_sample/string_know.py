@@ -2,6 +2,8 @@ from crewai import Agent, Task, Crew, Process, LLM
 from crewai.knowledge.source.string_knowledge_source import StringKnowledgeSource
 import os
 
+from crewai_sample.embedding_scheduler import scheduled_embedder
+
 # Get the GEMINI API key
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 
@@ -48,13 +50,13 @@ crew = Crew(
     verbose=True,
     process=Process.sequential,
     knowledge_sources=[string_source],
-    embedder={
+    embedder=scheduled_embedder({
         "provider": "google",
         "config": {
             "model": "models/text-embedding-004",
             "api_key": GEMINI_API_KEY,
         }
-    }
+    })
 )
 
 result = crew.kickoff(inputs={"question": "What city does John live in and how old is he?"})
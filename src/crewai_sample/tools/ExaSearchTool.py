@@ -1,7 +1,45 @@
+import ast
+import logging
 import os
-from exa_py import Exa
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional
+
 from langchain.agents import tool
 
+from crewai_sample.record_format import format_record
+
+logger = logging.getLogger(__name__)
+
+# Tokens of page text kept per document, pages fetched at once, seconds to wait for all
+# of them before answering with the ones in, and seconds to wait for at least one
+CONTENT_TOKEN_BUDGET = int(os.getenv("EXA_CONTENT_TOKENS", "250"))
+CONTENT_WORKERS = int(os.getenv("EXA_CONTENT_WORKERS", "4"))
+CONTENT_WAIT = float(os.getenv("EXA_CONTENT_WAIT", "5"))
+CONTENT_TIMEOUT = float(os.getenv("EXA_CONTENT_TIMEOUT", "30"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _contents_executor() -> ThreadPoolExecutor:
+    """One bounded pool for all page fetches, so parallel agents cannot open unlimited requests."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CONTENT_WORKERS, thread_name_prefix="exa-contents")
+        return _executor
+
+
+def _truncate_tokens(text: str, budget: int) -> str:
+    import litellm
+
+    tokens = litellm.encode(model="gpt-4o-mini", text=text)
+    if len(tokens) <= budget:
+        return text
+    return litellm.decode(model="gpt-4o-mini", tokens=tokens[:budget]).rstrip() + " [...]"
+
+
 class ExaSearchTool:
     @tool
     def search(query: str):
@@ -30,18 +68,16 @@ class ExaSearchTool:
             ids (str): A stringified list of IDs returned from `search`.
         
         Returns:
-            str: The concatenated content of the webpages, truncated to 1000 characters each.
+            str: The title, URL and text of each webpage, the text truncated to a fixed token budget.
+                Pages that are slow to load are listed by ID; ask for those again.
         """
         try:
-            ids_list = eval(ids)
+            ids_list = ast.literal_eval(ids)
+            if isinstance(ids_list, str):
+                ids_list = [ids_list]
             if not isinstance(ids_list, list):
                 raise ValueError("The provided ids must be a list.")
-            contents = ExaSearchTool._exa().get_contents(ids=ids_list)
-            contents_str = str(contents)
-            print(contents_str)  # Debugging: Print the raw contents
-            split_contents = contents_str.split("URL:")
-            truncated_contents = [content[:1000] for content in split_contents]
-            return "\n\n".join(truncated_contents)
+            return "\n\n".join(ExaSearchTool._fetch_contents([str(id_) for id_ in ids_list]))
         except Exception as e:
             return f"Error in getting contents: {str(e)}"
 
@@ -50,10 +86,58 @@ class ExaSearchTool:
         """Return the list of tools provided by ExaSearchTool."""
         return [ExaSearchTool.search, ExaSearchTool.find_similar, ExaSearchTool.get_contents]
 
+    @staticmethod
+    def _fetch_contents(ids: List[str]) -> List[str]:
+        """Fetch the pages concurrently on the bounded pool, answering as soon as the fast ones are in.
+
+        The tool returns once every page is in, or after ``CONTENT_WAIT`` seconds with the
+        pages that are in by then (waiting up to ``CONTENT_TIMEOUT`` seconds for the first).
+        Pages still loading are listed by id; their fetches finish in the background into
+        the response cache, so asking for them again is answered from it. Failed pages are
+        reported in place, and results keep the order asked for.
+        """
+        ids = list(dict.fromkeys(ids))
+        futures = {_contents_executor().submit(ExaSearchTool._fetch_content, id_): id_ for id_ in ids}
+        done, _ = wait(futures, timeout=CONTENT_WAIT)
+        if not done:
+            done, _ = wait(futures, timeout=max(CONTENT_TIMEOUT - CONTENT_WAIT, 0), return_when=FIRST_COMPLETED)
+
+        pages = []
+        for future, id_ in futures.items():
+            if future not in done:
+                pages.append(f"ID: {id_}\nError: still loading; call get_contents for this ID again shortly")
+                continue
+            try:
+                pages.append(future.result())
+            except Exception as e:
+                pages.append(f"ID: {id_}\nError: {str(e)}")
+        return pages
+
+    @staticmethod
+    def _fetch_content(id_: str) -> str:
+        # Ask for no more text than the token budget can use
+        response = ExaSearchTool._exa().get_contents(ids=[id_], text={"max_characters": CONTENT_TOKEN_BUDGET * 8})
+        if not response.results:
+            raise ValueError("no content returned")
+        result = response.results[0]
+        text = _truncate_tokens(" ".join((result.text or "").split()), CONTENT_TOKEN_BUDGET)
+        logger.info("Fetched contents of %s", result.url)
+        return format_record({
+            "Title": result.title,
+            "URL": result.url,
+            "ID": result.id,
+            "Published Date": result.published_date,
+            "Author": result.author,
+            "Text": text,
+        })
+
     @staticmethod
     def _exa():
-        """Initialize the Exa client using the API key from environment variables."""
+        """Return the shared, caching Exa client for the API key in the environment."""
+        # exa_py is only imported once a research agent actually calls Exa
+        from crewai_sample.exa_client import shared_exa
+
         api_key = os.getenv("EXA_API_KEY")
         if not api_key:
             raise EnvironmentError("EXA_API_KEY environment variable is not set.")
-        return Exa(api_key=api_key)
+        return shared_exa(api_key)
@@ -0,0 +1,67 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+
+from crewai_sample.alumni_directory import AlumniDirectory, get_alumni_directory
+
+
+class AlumniLookupInput(BaseModel):
+    """Input schema for AlumniLookupTool."""
+    membership_no: Optional[str] = Field(None, description="Membership number, e.g. 'LTM0123'.")
+    receipt_no: Optional[str] = Field(None, description="Payment receipt number, e.g. '287/22-23'.")
+    email: Optional[str] = Field(None, description="E-mail address of the member.")
+    phone: Optional[str] = Field(None, description="Mobile number of the member.")
+    name: Optional[str] = Field(None, description="Full or partial name of the member.")
+    batch: Optional[str] = Field(None, description="Graduation year, e.g. '1989' or '89'.")
+    branch: Optional[str] = Field(None, description="Branch, e.g. 'Mech'; combine with batch.")
+    stats: bool = Field(False, description="Return member counts by batch, branch, zone and payment period.")
+    limit: int = Field(20, description="Maximum number of members to return.")
+
+
+class AlumniLookupTool(BaseTool):
+    name: str = "Look up CIT alumni records"
+    description: str = (
+        "Exact lookups of alumni by membership number, receipt number, e-mail, phone, name, "
+        "batch and branch, including whether and when they paid their membership fee, plus "
+        "member counts by batch, branch, zone and payment period. Use it instead of the "
+        "background knowledge snippets for any question about a specific member or a count."
+    )
+    args_schema: Type[BaseModel] = AlumniLookupInput
+    file_path: str = Field(description="Alumni spreadsheet, relative to the knowledge/ directory")
+
+    def _run(
+        self,
+        membership_no: Optional[str] = None,
+        receipt_no: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        name: Optional[str] = None,
+        batch: Optional[str] = None,
+        branch: Optional[str] = None,
+        stats: bool = False,
+        limit: int = 20,
+    ) -> str:
+        directory = get_alumni_directory(self.file_path)
+        if stats:
+            return "\n".join(f"{key}: {value}" for key, value in directory.stats.items())
+
+        if membership_no:
+            members = directory.member(membership_no)
+        elif receipt_no:
+            members = directory.receipt(receipt_no)
+        elif email:
+            members = directory.email(email)
+        elif phone:
+            members = directory.phone(phone)
+        elif name:
+            members = directory.search_name(name, limit=limit)
+        elif batch:
+            members = directory.batch(batch, branch)
+        else:
+            return "Give a membership number, receipt number, e-mail, phone, name or batch, or ask for stats."
+
+        if not members:
+            return "No alumni records match."
+        lines = [f"{len(members)} member(s) match; showing {min(len(members), limit)}:"]
+        lines.extend(f"- {AlumniDirectory.describe(record)}" for record in members[:limit])
+        return "\n".join(lines)
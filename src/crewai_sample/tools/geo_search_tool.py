@@ -0,0 +1,80 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
+
+from crewai_sample.geo_index import GeoIndex
+from crewai_sample.listing_store import ListingStore
+
+
+class GeoSearchInput(BaseModel):
+    """Input schema for GeoSearchTool."""
+    near: Optional[str] = Field(
+        None,
+        description="Place to search around: a neighborhood or city, e.g. 'Downtown Seattle' or "
+                    "'Park Slope, Brooklyn', or 'latitude, longitude'.",
+    )
+    radius_miles: Optional[float] = Field(
+        None, description="Return every listing within this many miles of the place; leave empty for the closest ones.",
+    )
+    south: Optional[float] = Field(None, description="Southern latitude of a bounding box, instead of 'near'.")
+    west: Optional[float] = Field(None, description="Western longitude of a bounding box.")
+    north: Optional[float] = Field(None, description="Northern latitude of a bounding box.")
+    east: Optional[float] = Field(None, description="Eastern longitude of a bounding box.")
+    limit: int = Field(10, description="Maximum number of listings to return.")
+
+
+class GeoSearchTool(BaseTool):
+    name: str = "Search real estate listings by distance"
+    description: str = (
+        "Find listings near a place: every listing within a radius in miles, the closest listings, "
+        "or the listings inside a latitude/longitude bounding box, with distances in miles. Use it "
+        "for questions like 'within 2 miles of downtown' or 'closest to Central Park'."
+    )
+    args_schema: Type[BaseModel] = GeoSearchInput
+    index: GeoIndex = Field(exclude=True)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _run(
+        self,
+        near: Optional[str] = None,
+        radius_miles: Optional[float] = None,
+        south: Optional[float] = None,
+        west: Optional[float] = None,
+        north: Optional[float] = None,
+        east: Optional[float] = None,
+        limit: int = 10,
+    ) -> str:
+        box = (south, west, north, east)
+        if all(bound is not None for bound in box):
+            try:
+                total, records = self.index.within_bbox(*box, limit=limit)
+            except ValueError as e:
+                return str(e)
+            if not records:
+                return "No listings in this area."
+            lines = [f"{total} listing(s) in the area; showing {len(records)}:"]
+            lines.extend(f"- {ListingStore.describe(record)}" for record in records)
+            return "\n".join(lines)
+
+        if not near:
+            return "Give a place to search around ('near') or all four bounds of a box."
+        places = self.index.gazetteer.lookup(near)
+        if not places:
+            return f"Unknown place '{near}'. Try a neighborhood or city with its state, e.g. 'Park Slope, Brooklyn, NY'."
+        if len(places) > 1:
+            return f"'{near}' may mean: " + "; ".join(place.name for place in places) + ". Please pick one."
+        place = places[0]
+
+        if radius_miles is not None:
+            total, matches = self.index.within_radius(place.latitude, place.longitude, radius_miles, limit=limit)
+            if not matches:
+                return f"No listings within {radius_miles} miles of {place.name}."
+            lines = [f"{total} listing(s) within {radius_miles} miles of {place.name}; showing {len(matches)}:"]
+        else:
+            matches = self.index.nearest(place.latitude, place.longitude, k=limit)
+            if not matches:
+                return "No listings with a known location."
+            lines = [f"The {len(matches)} listing(s) closest to {place.name}:"]
+        lines.extend(f"- {miles:.1f} mi: {ListingStore.describe(record)}" for record, miles in matches)
+        return "\n".join(lines)
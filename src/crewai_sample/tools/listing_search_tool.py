@@ -0,0 +1,48 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
+
+from crewai_sample.listing_store import ListingStore
+
+
+class ListingSearchInput(BaseModel):
+    """Input schema for ListingSearchTool."""
+    location: Optional[str] = Field(None, description="Neighborhood, city or full location, e.g. 'Brooklyn'.")
+    property_type: Optional[str] = Field(None, description="Property type, e.g. 'Apartment' or 'House'.")
+    bedrooms: Optional[float] = Field(None, description="Exact number of bedrooms.")
+    min_bedrooms: Optional[float] = Field(None, description="Minimum number of bedrooms.")
+    max_bedrooms: Optional[float] = Field(None, description="Maximum number of bedrooms.")
+    bathrooms: Optional[float] = Field(None, description="Exact number of bathrooms.")
+    min_bathrooms: Optional[float] = Field(None, description="Minimum number of bathrooms.")
+    min_price: Optional[float] = Field(None, description="Minimum monthly price in dollars.")
+    max_price: Optional[float] = Field(None, description="Maximum monthly price in dollars.")
+    added_after: Optional[str] = Field(None, description="Only listings added on or after this date (YYYY-MM-DD).")
+    added_before: Optional[str] = Field(None, description="Only listings added on or before this date (YYYY-MM-DD).")
+    sort_by: str = Field("price", description="Sort by 'price', 'bedrooms', 'bathrooms' or 'date_added'.")
+    descending: bool = Field(False, description="Sort from highest to lowest.")
+    limit: int = Field(20, description="Maximum number of listings to return.")
+
+
+class ListingSearchTool(BaseTool):
+    name: str = "Search real estate listings"
+    description: str = (
+        "Find listings by exact filters on price, bedrooms, bathrooms, property type, location "
+        "and date added. Use it for questions like '2-bed apartments under $2000 in Brooklyn'; "
+        "the results are exact and complete, unlike the background knowledge snippets."
+    )
+    args_schema: Type[BaseModel] = ListingSearchInput
+    store: ListingStore = Field(exclude=True)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _run(self, **filters) -> str:
+        filters = {key: value for key, value in filters.items() if value is not None}
+        matches = self.store.query(**filters)
+        if not matches:
+            return "No listings match these filters."
+        total = self.store.count(
+            **{key: value for key, value in filters.items() if key not in ("sort_by", "descending", "limit")}
+        )
+        lines = [f"{total} listing(s) match; showing {len(matches)}:"]
+        lines.extend(f"- {ListingStore.describe(record)}" for record in matches)
+        return "\n".join(lines)
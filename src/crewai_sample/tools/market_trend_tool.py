@@ -0,0 +1,68 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
+
+from crewai_sample.market_trends import MarketTrends
+
+
+class MarketTrendInput(BaseModel):
+    """Input schema for MarketTrendTool."""
+    metric: str = Field(
+        "rent",
+        description="'rent' (monthly rent), 'price_per_bedroom' (monthly rent per bedroom) "
+                    "or 'new_listings' (number of listings added).",
+    )
+    period: str = Field("month", description="Group by 'week', 'month' or 'all' (one row over all time).")
+    location: Optional[str] = Field(None, description="Neighborhood, city or full location, e.g. 'Brooklyn'.")
+    property_type: Optional[str] = Field(None, description="Property type, e.g. 'Apartment' or 'House'.")
+    start: Optional[str] = Field(None, description="First date to include (YYYY-MM-DD).")
+    end: Optional[str] = Field(None, description="Last date to include (YYYY-MM-DD).")
+
+
+class MarketTrendTool(BaseTool):
+    name: str = "Real estate market trends"
+    description: str = (
+        "Exact, precomputed market statistics by date added: median, mean, min and max rent or "
+        "rent per bedroom, and the number of new listings, per week or month, optionally for one "
+        "location and/or property type. Use it for any trend, average or comparison question "
+        "instead of calculating from individual listings."
+    )
+    args_schema: Type[BaseModel] = MarketTrendInput
+    trends: MarketTrends = Field(exclude=True)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _run(
+        self,
+        metric: str = "rent",
+        period: str = "month",
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> str:
+        try:
+            rows = self.trends.trend(metric, period, location, property_type, start, end)
+        except ValueError as e:
+            return str(e)
+        scope = " ".join(filter(None, [property_type or "listings", f"in {location}" if location else None]))
+        per = "over all time" if period == "all" else f"per {period}"
+        if not rows:
+            return f"No listings for {scope} in this period."
+
+        if metric == "new_listings":
+            lines = [f"New listings {per} for {scope}:"]
+            lines.extend(f"- {row['period']}: {row['listings']}" for row in rows)
+            return "\n".join(lines)
+
+        unit = "rent per bedroom" if metric == "price_per_bedroom" else "rent"
+        lines = [f"Monthly {unit} {per} for {scope} (dollars):"]
+        for row in rows:
+            if not row["priced"]:
+                lines.append(f"- {row['period']}: {row['listings']} listing(s), none priced")
+                continue
+            lines.append(
+                f"- {row['period']}: median {row['median']}, mean {row['mean']}, "
+                f"min {row['min']}, max {row['max']} ({row['priced']} listing(s))"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,237 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "crewai_sample"
+# Spans are written as JSON lines to TRACE_FILE and/or sent to an OTLP/HTTP collector
+TRACE_FILE = os.getenv("TRACE_FILE")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class StageMetrics:
+    """Prometheus-style metrics per pipeline stage.
+
+    Durations keep a window of the most recent observations per stage, from which
+    the p50/p95/p99 summaries are computed; token and cache counters are totals.
+    """
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._durations: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._sums: Dict[str, float] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+        self._cache: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._durations.setdefault(stage, deque(maxlen=self.window)).append(seconds)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            self._sums[stage] = self._sums.get(stage, 0.0) + seconds
+
+    def add_tokens(self, stage: str, kind: str, count: int) -> None:
+        with self._lock:
+            self._tokens[(stage, kind)] = self._tokens.get((stage, kind), 0) + count
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        key = (cache, "hit" if hit else "miss")
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+
+    def quantiles(self, stage: str) -> Dict[float, float]:
+        with self._lock:
+            values = sorted(self._durations.get(stage, ()))
+        if not values:
+            return {}
+        return {q: values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Count, total seconds and percentiles per stage, plus the token and cache counters."""
+        with self._lock:
+            stages = sorted(self._durations)
+            counts, sums = dict(self._counts), dict(self._sums)
+            tokens, cache = dict(self._tokens), dict(self._cache)
+        return {
+            "stages": {
+                stage: {"count": counts[stage], "seconds": sums[stage],
+                        **{f"p{int(q * 100)}": value for q, value in self.quantiles(stage).items()}}
+                for stage in stages
+            },
+            "tokens": {f"{stage}.{kind}": count for (stage, kind), count in sorted(tokens.items())},
+            "cache": {f"{name}.{result}": count for (name, result), count in sorted(cache.items())},
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._sums.clear()
+            self._tokens.clear()
+            self._cache.clear()
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP crewai_sample_stage_duration_seconds Time spent in each pipeline stage.",
+            "# TYPE crewai_sample_stage_duration_seconds summary",
+        ]
+        with self._lock:
+            stages = sorted(self._durations)
+            counts, sums = dict(self._counts), dict(self._sums)
+            tokens, cache = dict(self._tokens), dict(self._cache)
+        for stage in stages:
+            for q, value in self.quantiles(stage).items():
+                lines.append(f'crewai_sample_stage_duration_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'crewai_sample_stage_duration_seconds_sum{{stage="{stage}"}} {sums[stage]:.6f}')
+            lines.append(f'crewai_sample_stage_duration_seconds_count{{stage="{stage}"}} {counts[stage]}')
+
+        lines += ["# HELP crewai_sample_tokens_total Tokens processed by stage.", "# TYPE crewai_sample_tokens_total counter"]
+        for (stage, kind), count in sorted(tokens.items()):
+            lines.append(f'crewai_sample_tokens_total{{stage="{stage}",kind="{kind}"}} {count}')
+
+        lines += ["# HELP crewai_sample_cache_total Cache lookups by result.", "# TYPE crewai_sample_cache_total counter"]
+        for (name, result), count in sorted(cache.items()):
+            lines.append(f'crewai_sample_cache_total{{cache="{name}",result="{result}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class Span:
+    """Handle for the stage being timed; attributes end up on the OpenTelemetry span, if any."""
+
+    def __init__(self, stage: str, otel_span: Optional["trace.Span"]):
+        self.stage = stage
+        self._span = otel_span
+
+    def set(self, key: str, value: Any) -> None:
+        if self._span is not None:
+            self._span.set_attribute(key, value)
+
+    def add_tokens(self, kind: str, count: Optional[int]) -> None:
+        """Count tokens of a kind (prompt, completion, embedded, saved...) for this stage."""
+        if count:
+            self.set(f"tokens.{kind}", count)
+            metrics.add_tokens(self.stage, kind, count)
+
+    def cache(self, name: str, hit: bool) -> None:
+        self.set(f"cache.{name}", "hit" if hit else "miss")
+        metrics.record_cache(name, hit)
+
+
+def _json_file_exporter(path: str) -> Any:
+    """An exporter that appends finished spans to a file, one OpenTelemetry JSON span per line."""
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonFileSpanExporter(SpanExporter):
+        def __init__(self):
+            self._lock = threading.Lock()
+
+        def export(self, spans):
+            lines = [json.dumps(json.loads(span.to_json())) for span in spans]
+            try:
+                with self._lock, open(path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError:
+                logger.exception("Could not write spans to %s", path)
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+    return JsonFileSpanExporter()
+
+
+def _tracer_provider() -> Any:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    # Our own provider, separate from the one crewAI's telemetry installs globally
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    if TRACE_FILE:
+        provider.add_span_processor(BatchSpanProcessor(_json_file_exporter(TRACE_FILE)))
+    if OTLP_ENDPOINT:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    return provider
+
+
+metrics = StageMetrics()
+_tracer: Optional[Any] = None
+_tracer_loaded = False
+_tracer_lock = threading.Lock()
+
+
+def _get_tracer() -> Optional[Any]:
+    """The OpenTelemetry tracer, set up on first use; None when opentelemetry-sdk is not installed."""
+    global _tracer, _tracer_loaded
+    if not _tracer_loaded:
+        with _tracer_lock:
+            if not _tracer_loaded:
+                try:
+                    _tracer = _tracer_provider().get_tracer(SERVICE_NAME)
+                except ImportError:
+                    logger.info("opentelemetry-sdk is not installed; stages are timed but no spans are exported")
+                _tracer_loaded = True
+    return _tracer
+
+
+@contextmanager
+def span(stage: str, **attributes: Any) -> Iterator[Span]:
+    """Time a pipeline stage, nesting it under the current span.
+
+    The duration feeds the per-stage percentiles; the span is exported when a trace
+    file or OTLP endpoint is configured. Without opentelemetry-sdk installed, only the
+    metrics are kept.
+    """
+    tracer = _get_tracer()
+    start = time.perf_counter()
+    context = tracer.start_as_current_span(stage, attributes=attributes) if tracer else nullcontext()
+    with context as otel_span:
+        try:
+            yield Span(stage, otel_span)
+        finally:
+            metrics.observe(stage, time.perf_counter() - start)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+_metrics_server_lock = threading.Lock()
+
+
+def serve_metrics(port: Optional[int] = None) -> None:
+    """Expose ``/metrics`` from a background thread (for processes without an HTTP API).
+
+    Does nothing unless a port is given or ``METRICS_PORT`` is set; safe to call repeatedly.
+    """
+    global _metrics_server
+    port = port or int(os.getenv("METRICS_PORT", "0"))
+    if not port:
+        return
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics", daemon=True).start()
@@ -0,0 +1,121 @@
+import random
+import re
+
+from crewai_sample.alumni_directory import (
+    MEMBERSHIP_COLUMN,
+    NAME_COLUMN,
+    PAYMENT_DATE_COLUMN,
+    RECEIPT_COLUMN,
+    AlumniDirectory,
+    normalize_batch,
+)
+
+FIRST_NAMES = ("Arun", "Aruna", "Bala", "Deepa", "Karthik", "Karthika", "Meena", "Suresh")
+LAST_NAMES = ("Kumar", "Raman", "Subramanian", "Iyer", "Krishnan")
+BRANCHES = ("Civil", "Mechanical", "EEE", "ECE")
+
+
+class _Dataset:
+    """Just the ``rows()`` of an alumni dataset; the directory annotates the rows it gets."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def rows(self):
+        return [dict(row) for row in self._rows]
+
+
+def _rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        batch = rng.choice(["77", "1985", "05", "2012"])
+        paid = rng.random() < 0.6
+        rows.append({
+            MEMBERSHIP_COLUMN: rng.choice([f"LTM{rng.randrange(100):04d}", f"ltm {rng.randrange(100):04d}", None]),
+            RECEIPT_COLUMN: f"{rng.randrange(50)}/{rng.choice(['22-23', '23-24'])}" if paid else None,
+            NAME_COLUMN: f"{name} / {batch} / {rng.choice(BRANCHES)}",
+            PAYMENT_DATE_COLUMN: f"2023-{rng.randrange(1, 13):02d}-01" if paid else None,
+            "Branch": rng.choice(BRANCHES),
+            "Zone": rng.choice(["Chennai", "Coimbatore", None]),
+            "E Mail": rng.choice([f"user{i % 40}@example.com", f" USER{i % 40}@Example.com ", None]),
+            "Mob No": rng.choice([f"+91 {rng.randrange(10 ** 9, 10 ** 10)}", None]),
+        })
+    return rows
+
+
+def _ids(records):
+    return sorted(id(record) for record in records)
+
+
+def _key(value):
+    return re.sub(r"\s+", "", str(value)).upper()
+
+
+def _words(text):
+    return " ".join(re.sub(r"[^\w@.+]+", " ", str(text).lower()).split())
+
+
+def test_exact_lookups_match_brute_force():
+    directory = AlumniDirectory(_Dataset(_rows(400)))
+    records = directory.records
+    for i in range(100):
+        membership = f"LTM{i:04d}"
+        expected = [r for r in records if r.get(MEMBERSHIP_COLUMN) and _key(r[MEMBERSHIP_COLUMN]) == membership]
+        assert _ids(directory.member(f" ltm{i:04d}")) == _ids(expected)
+
+    for receipt in {r[RECEIPT_COLUMN] for r in records if r.get(RECEIPT_COLUMN)}:
+        expected = [r for r in records if r.get(RECEIPT_COLUMN) and _key(r[RECEIPT_COLUMN]) == _key(receipt)]
+        assert _ids(directory.receipt(receipt)) == _ids(expected)
+
+    for i in range(40):
+        email = f"user{i}@example.com"
+        expected = [r for r in records if any(
+            isinstance(v, str) and "@" in v and v.strip().lower() == email for v in r.values()
+        )]
+        assert _ids(directory.email(email.upper())) == _ids(expected)
+
+    for phone in {r["Mob No"] for r in records if r.get("Mob No")}:
+        digits = re.sub(r"\D", "", phone)[-10:]
+        expected = [r for r in records if r.get("Mob No") and re.sub(r"\D", "", r["Mob No"])[-10:] == digits]
+        assert _ids(directory.phone(digits)) == _ids(expected)
+
+
+def test_batch_and_stats_match_brute_force():
+    rows = _rows(400, seed=1)
+    directory = AlumniDirectory(_Dataset(rows))
+    records = directory.records
+    for batch in ("77", 1977, "1985", "05", "2012", "1999"):
+        for branch in (None, "civil", "EEE"):
+            expected = [
+                r for r in records
+                if r["Batch"] == normalize_batch(batch) and (not branch or _words(r["Branch"]) == _words(branch))
+            ]
+            assert _ids(directory.batch(batch, branch)) == _ids(expected)
+
+    assert directory.stats["members"] == len(rows)
+    assert directory.stats["paid"] == sum(1 for row in rows if row[PAYMENT_DATE_COLUMN] or row[RECEIPT_COLUMN])
+    assert sum(directory.stats["by_batch"].values()) == len(rows)
+
+
+def test_name_search_matches_brute_force():
+    directory = AlumniDirectory(_Dataset(_rows(400, seed=2)))
+    names = [_words(record["Name"]) for record in directory.records]
+    for query in ("arun", "Arun Kumar", "karth", "karthika iyer", "S", "meena raman", "Bala  K"):
+        tokens = _words(query).split()
+        expected = [
+            row for row, name in enumerate(names)
+            if all(any(word.startswith(token) for word in name.split()) for token in tokens)
+        ]
+        expected.sort(key=lambda row: (names[row] != _words(query), names[row]))
+        found = directory.search_name(query, limit=len(names))
+        assert [_words(record["Name"]) for record in found] == [names[row] for row in expected]
+        assert _ids(found) == _ids([directory.records[row] for row in expected])
+
+
+def test_misspelt_names_fall_back_to_fuzzy_matches():
+    directory = AlumniDirectory(_Dataset(_rows(200, seed=3)))
+    found = directory.search_name("Sursh Kumr")
+    assert found
+    assert all(record["Name"].startswith("Suresh") or record["Name"].endswith("Kumar") for record in found)
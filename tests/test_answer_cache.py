@@ -0,0 +1,133 @@
+import hashlib
+import random
+import re
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from crewai_sample import answer_cache
+from crewai_sample.answer_cache import AnswerCache, normalize_question
+
+WORDS = ("cheap", "apartments", "in", "brooklyn", "austin", "with", "parking", "under", "near", "park", "2", "3")
+
+
+def _embed(texts):
+    """Deterministic bag-of-words vectors, so similar questions get similar vectors."""
+    vectors = []
+    for text in texts:
+        vector = np.zeros(64)
+        for word in text.split():
+            vector[int(hashlib.sha1(word.encode("utf-8")).hexdigest(), 16) % 64] += 1
+        vectors.append(vector)
+    return vectors
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _question(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randrange(2, 6))) + rng.choice(["?", "", " ."])
+
+
+def test_exact_lookups_follow_lru_order():
+    rng = random.Random(0)
+    cache = AnswerCache(max_size=16)
+    reference = OrderedDict()
+    for step in range(2000):
+        question = _question(rng)
+        key = normalize_question(question)
+        if rng.random() < 0.4:
+            cache.put(question, f"answer {step}")
+            reference[key] = f"answer {step}"
+            reference.move_to_end(key)
+            while len(reference) > 16:
+                reference.popitem(last=False)
+        else:
+            expected = reference.get(key)
+            if expected is not None:
+                reference.move_to_end(key)
+            assert cache.get(question.upper()) == expected
+        assert len(cache) == len(reference)
+
+
+def test_semantic_lookups_match_brute_force():
+    rng = random.Random(1)
+    # Thresholds off the simple fractions bag-of-words cosines land on
+    for threshold in (0.71, 0.83, 0.93):
+        cache = AnswerCache(max_size=1000, similarity_threshold=threshold, embed=_embed)
+        answers = {}
+        for step in range(200):
+            question = _question(rng)
+            cache.put(question, f"answer {step}")
+            answers[normalize_question(question)] = f"answer {step}"
+        questions = {answer: key for key, answer in answers.items()}
+
+        def score(a, b):
+            return float(np.dot(_unit(_embed([a])[0]), _unit(_embed([b])[0])))
+
+        for _ in range(300):
+            key = normalize_question(_question(rng))
+            if key in answers:
+                continue
+            numbers = re.findall(r"\d+(?:[.,]\d+)?", key)
+            scores = [
+                score(key, candidate) for candidate in answers
+                if re.findall(r"\d+(?:[.,]\d+)?", candidate) == numbers
+            ]
+            best = max((s for s in scores if s >= threshold), default=None)
+            found = cache.get(key)
+            if best is None:
+                assert found is None
+            else:
+                # Equally similar questions may answer it; any of them is as good
+                assert found is not None
+                assert score(key, questions[found]) == pytest.approx(best, abs=1e-5)
+
+
+def test_numbers_must_match():
+    cache = AnswerCache(similarity_threshold=0.5, embed=_embed)
+    cache.put("2 bed apartments in brooklyn", "two")
+    assert cache.get("3 bed apartments in brooklyn") is None
+    assert cache.get("2 bed apartment in brooklyn") == "two"
+
+
+def test_new_version_and_ttl_empty_the_cache(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now[0])
+    cache = AnswerCache(ttl=60)
+    cache.put("rent in austin", "high", version="v1")
+    assert cache.get("Rent in Austin?", version="v1") == "high"
+    assert cache.get("rent in austin", version="v2") is None
+
+    cache.put("rent in austin", "higher", version="v2")
+    now[0] += 61
+    assert cache.get("rent in austin", version="v2") is None
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_failing_embedder_falls_back_to_exact_matches():
+    def embed(texts):
+        raise RuntimeError("rate limited")
+
+    cache = AnswerCache(embed=embed)
+    cache.put("rent in austin", "high")
+    assert cache.get("Rent in Austin?") == "high"
+    assert cache.get("rents in austin") is None
+    assert cache.misses == 1
+
+
+def test_older_versions_cannot_read_or_store():
+    cache = AnswerCache()
+    cache.put("rent in austin", "high", version="v1")
+    assert cache.get("rent in austin", version="v2") is None
+    cache.put("rent in austin", "higher", version="v2")
+
+    # A turn that started before the refresh neither stores its answer nor wipes the cache
+    cache.put("rent in austin", "stale", version="v1")
+    assert cache.get("rent in austin", version="v1") is None
+    assert cache.get("rent in austin", version="v2") == "higher"
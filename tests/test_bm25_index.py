@@ -0,0 +1,96 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from crewai_sample.hybrid_knowledge import BM25Index, tokenize
+
+VOCABULARY = (
+    "brooklyn austin seattle condo house studio parking balcony gym pool quiet sunny renovated "
+    "LTM0261 287/22-23 laptop phone perfume chair the a with"
+).split()
+
+
+def _document(rng):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randrange(1, 30)))
+
+
+def _scores(documents, query, k1=1.5, b=0.75):
+    """BM25 of every document for the query, computed from scratch."""
+    tokens = {doc_id: tokenize(text) for doc_id, text in documents.items()}
+    if not tokens:
+        return {}
+    average_length = sum(len(t) for t in tokens.values()) / len(tokens)
+    scores = {}
+    for term in set(tokenize(query)):
+        containing = [doc_id for doc_id, t in tokens.items() if term in t]
+        if not containing:
+            continue
+        idf = math.log(1 + (len(tokens) - len(containing) + 0.5) / (len(containing) + 0.5))
+        for doc_id in containing:
+            frequency = Counter(tokens[doc_id])[term]
+            norm = k1 * (1 - b + b * len(tokens[doc_id]) / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+    return scores
+
+
+def _assert_search_matches(index, documents, rng):
+    for _ in range(30):
+        query = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randrange(1, 4)))
+        expected = _scores(documents, query)
+        found = index.search(query, limit=len(documents) + 1)
+        assert dict(found) == pytest.approx(expected)
+        assert [score for _, score in found] == pytest.approx(sorted(expected.values(), reverse=True))
+
+        top = index.search(query, limit=5)
+        assert [score for _, score in top] == pytest.approx(sorted(expected.values(), reverse=True)[:5])
+
+
+def test_search_matches_brute_force_through_adds_and_removes():
+    rng = random.Random(0)
+    index = BM25Index()
+    documents = {}
+    for _ in range(10):
+        added = {f"doc-{rng.randrange(400)}": _document(rng) for _ in range(60)}
+        index.add(list(added), list(added.values()))
+        documents.update(added)
+
+        removed = rng.sample(sorted(documents), 20) + ["never-added"]
+        index.remove(removed)
+        for doc_id in removed:
+            documents.pop(doc_id, None)
+
+        assert len(index) == len(documents)
+        _assert_search_matches(index, documents, rng)
+
+
+def test_identifiers_are_searchable_by_their_parts():
+    index = BM25Index()
+    index.add(["member", "receipt"], ["Membership No.: LTM0261", "Receipt No.: 287/22-23"])
+    assert [doc_id for doc_id, _ in index.search("ltm0261")] == ["member"]
+    assert [doc_id for doc_id, _ in index.search("receipt 287/22-23")][0] == "receipt"
+
+
+def test_empty_index_and_unknown_terms():
+    index = BM25Index()
+    assert index.search("brooklyn") == []
+    index.add(["one"], ["brooklyn condo"])
+    assert index.search("seattle") == []
+    assert index.search("the") == []
+
+
+def test_removed_documents_are_not_found_and_stop_counting():
+    index = BM25Index()
+    index.add(["one", "two", "three"], ["brooklyn condo", "brooklyn house", "austin house"])
+    index.remove(["one", "missing"])
+    assert len(index) == 2
+    assert index.search("condo") == []
+    assert dict(index.search("brooklyn house")) == pytest.approx(
+        _scores({"two": "brooklyn house", "three": "austin house"}, "brooklyn house")
+    )
+
+    # Adding a document again replaces it instead of counting it twice
+    index.add(["two"], ["seattle studio"])
+    assert len(index) == 2
+    assert [doc_id for doc_id, _ in index.search("brooklyn")] == []
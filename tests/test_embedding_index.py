@@ -0,0 +1,106 @@
+import json
+
+from crewai_sample.embedding_index import EmbeddingIndex, sync_records
+
+
+class _Collection:
+    def __init__(self, storage):
+        self.storage = storage
+
+    def count(self):
+        return len(self.storage.chunks)
+
+
+class _Storage:
+    """The part of HybridKnowledgeStorage a sync uses, over a dict of id -> (chunk, metadata)."""
+
+    def __init__(self):
+        self.chunks = {}
+        self.collection = _Collection(self)
+        self.upserts = []
+        self.deletes = []
+
+    @staticmethod
+    def _matches(metadata, where):
+        if "$and" in where:
+            return all(_Storage._matches(metadata, clause) for clause in where["$and"])
+        [(field, condition)] = where.items()
+        if isinstance(condition, dict):
+            return metadata.get(field) in condition["$in"]
+        return metadata.get(field) == condition
+
+    def upsert(self, ids, documents, metadatas):
+        self.upserts.append(list(ids))
+        self.chunks.update(zip(ids, zip(documents, metadatas)))
+
+    def delete(self, where):
+        ids = [i for i, (_, metadata) in self.chunks.items() if self._matches(metadata, where)]
+        self.deletes.append(ids)
+        for i in ids:
+            del self.chunks[i]
+        return len(ids)
+
+
+def _records(texts):
+    return [(record_id, text, {"kind": "listing"}) for record_id, text in texts.items()]
+
+
+def test_sync_adds_updates_and_deletes(tmp_path):
+    storage, path = _Storage(), str(tmp_path / "index.json")
+    result = sync_records(storage, EmbeddingIndex(path), "feed", "property_id",
+                          _records({"1": "a", "2": "a", "3": "c"}))
+    assert (result.added, result.updated, result.removed, result.unchanged) == (3, 0, 0, 0)
+    # Identical texts keep a vector each
+    assert sorted(storage.chunks) == ["feed#1", "feed#2", "feed#3"]
+
+    result = sync_records(storage, EmbeddingIndex(path), "feed", "property_id",
+                          _records({"1": "a", "2": "b", "4": "d"}))
+    assert (result.added, result.updated, result.removed, result.unchanged) == (1, 1, 1, 1)
+    assert storage.chunks["feed#2"][0] == "b"
+    assert sorted(storage.chunks) == ["feed#1", "feed#2", "feed#4"]
+    # Changed records are replaced in place; only the removed one is deleted
+    assert storage.upserts[-1] == ["feed#2", "feed#4"]
+    assert storage.deletes == [["feed#3"]]
+
+
+def test_sync_embeds_in_batches_from_a_generator(tmp_path):
+    storage = _Storage()
+    records = ((str(i), f"text {i}", {}) for i in range(10))
+    sync_records(storage, EmbeddingIndex(str(tmp_path / "index.json")), "feed", "product_id", records, batch_size=4)
+    assert [len(ids) for ids in storage.upserts] == [4, 4, 2]
+
+
+def test_sync_keeps_records_of_unavailable_feeds(tmp_path):
+    storage, path = _Storage(), str(tmp_path / "index.json")
+    sync_records(storage, EmbeddingIndex(path), "feeds", "property_id", _records({"a:1": "x", "b:1": "y"}))
+    result = sync_records(storage, EmbeddingIndex(path), "feeds", "property_id", _records({"a:1": "x"}),
+                          keep=lambda record_id: record_id.startswith("b:"))
+    assert result.removed == 0
+    assert sorted(storage.chunks) == ["feeds#a:1", "feeds#b:1"]
+
+
+def test_rebuild_and_a_reset_store_embed_everything_again(tmp_path):
+    storage, path = _Storage(), str(tmp_path / "index.json")
+    sync_records(storage, EmbeddingIndex(path), "feed", "property_id", _records({"1": "a"}))
+    storage.chunks["other#1"] = ("z", {"source": "other"})
+
+    result = sync_records(storage, EmbeddingIndex(path), "feed", "property_id", _records({"1": "a"}), rebuild=True)
+    assert result.added == 1
+    assert sorted(storage.chunks) == ["feed#1", "other#1"]
+
+    storage.chunks.clear()
+    result = sync_records(storage, EmbeddingIndex(path), "feed", "property_id", _records({"1": "a"}))
+    assert result.added == 1
+
+
+def test_an_index_from_an_older_version_embeds_everything_again(tmp_path):
+    storage, path = _Storage(), str(tmp_path / "index.json")
+    sync_records(storage, EmbeddingIndex(path), "feed", "property_id", _records({"1": "a", "2": "b"}))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": EmbeddingIndex.VERSION - 1, "entries": {"1": "old digest"}}, f)
+
+    index = EmbeddingIndex(path)
+    assert index.is_new and len(index) == 0
+    result = sync_records(storage, index, "feed", "property_id", _records({"1": "a", "2": "b"}))
+    assert (result.added, result.unchanged) == (2, 0)
+    assert not EmbeddingIndex(path).is_new
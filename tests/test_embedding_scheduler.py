@@ -0,0 +1,48 @@
+import pytest
+
+from crewai_sample import embedding_scheduler
+from crewai_sample.embedding_scheduler import TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(embedding_scheduler, "time", clock)
+    return clock
+
+
+# Rates and amounts are powers of two, so the fake clock lands exactly on each refill
+
+
+def test_bucket_allows_bursts_up_to_capacity_then_the_rate(clock):
+    bucket = TokenBucket(rate=4, capacity=8)
+    for _ in range(8):
+        bucket.acquire()
+    assert clock.now == 0
+    bucket.acquire(2)
+    assert clock.now == 0.5
+
+
+def test_amounts_over_capacity_are_paid_back_before_the_next_caller(clock):
+    bucket = TokenBucket(rate=4, capacity=8)
+    bucket.acquire(20)
+    assert clock.now == 0
+    # 12 units of debt, plus the one asked for
+    bucket.acquire(1)
+    assert clock.now == 3.25
+
+    # Back to back, each one waits for a full bucket: 2s from empty, then 4s out of debt
+    for _ in range(8):
+        bucket.acquire(16)
+    assert clock.now == 3.25 + 2 + 7 * 4
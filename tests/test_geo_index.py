@@ -0,0 +1,105 @@
+import math
+import random
+
+import pytest
+
+from crewai_sample.geo_index import EARTH_RADIUS_MILES, GeoIndex
+
+# Listings cluster around a few cities, with a few scattered far away
+CENTERS = ((40.67, -73.98), (30.27, -97.74), (47.61, -122.33), (64.84, -147.72))
+
+
+def _distance(latitude, longitude, record):
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = math.radians(record["latitude"]), math.radians(record["longitude"])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _listings(count, seed=0):
+    rng = random.Random(seed)
+    listings = []
+    for i in range(count):
+        if rng.random() < 0.05:
+            latitude, longitude = rng.uniform(-80, 80), rng.uniform(-179, 179)
+        else:
+            center = rng.choice(CENTERS)
+            latitude, longitude = center[0] + rng.gauss(0, 0.15), center[1] + rng.gauss(0, 0.15)
+        listings.append({"id": str(i), "latitude": latitude, "longitude": longitude})
+    # Listings without coordinates or a location line are left out of the index
+    listings.append({"id": "nowhere"})
+    return listings
+
+
+LISTINGS = _listings(3000)
+LOCATED = [record for record in LISTINGS if "latitude" in record]
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = GeoIndex(gazetteer_file="missing-gazetteer.csv")
+    index.load(LISTINGS)
+    return index
+
+
+def _queries(seed, count):
+    rng = random.Random(seed)
+    for _ in range(count):
+        center = rng.choice(CENTERS + ((0.0, 0.0),))
+        yield center[0] + rng.gauss(0, 0.2), center[1] + rng.gauss(0, 0.2)
+
+
+def test_within_radius_matches_brute_force(index):
+    assert len(index) == len(LOCATED)
+    for latitude, longitude in _queries(0, 100):
+        for miles in (0.5, 3.0, 25.0, 400.0):
+            expected = sorted(
+                (distance, record["id"]) for record in LOCATED
+                if (distance := _distance(latitude, longitude, record)) <= miles
+            )
+            total, matches = index.within_radius(latitude, longitude, miles, limit=None)
+            assert total == len(expected)
+            assert sorted(record["id"] for record, _ in matches) == sorted(rid for _, rid in expected)
+            assert [d for _, d in matches] == pytest.approx([d for d, _ in expected], abs=1e-6)
+
+            total, matches = index.within_radius(latitude, longitude, miles, limit=5)
+            assert total == len(expected)
+            assert [d for _, d in matches] == pytest.approx([d for d, _ in expected[:5]], abs=1e-6)
+
+
+def test_nearest_matches_brute_force(index):
+    for latitude, longitude in _queries(1, 100):
+        distances = sorted(_distance(latitude, longitude, record) for record in LOCATED)
+        for k in (1, 5, 40):
+            matches = index.nearest(latitude, longitude, k=k)
+            assert [d for _, d in matches] == pytest.approx(distances[:k], abs=1e-6)
+    assert index.nearest(0.0, 0.0, k=0) == []
+
+
+def test_within_bbox_matches_brute_force(index):
+    rng = random.Random(2)
+    for latitude, longitude in _queries(2, 100):
+        half_height, half_width = rng.uniform(0.001, 2), rng.uniform(0.001, 2)
+        box = (latitude - half_height, longitude - half_width, latitude + half_height, longitude + half_width)
+        south, west, north, east = box
+        expected = [
+            record["id"] for record in LOCATED
+            if south <= record["latitude"] <= north and west <= record["longitude"] <= east
+        ]
+        total, found = index.within_bbox(*box, limit=None)
+        assert total == len(expected)
+        # Listings come back in feed order
+        assert [record["id"] for record in found] == expected
+
+
+def test_within_bbox_rejects_inverted_boxes(index):
+    with pytest.raises(ValueError):
+        index.within_bbox(41.0, -73.0, 40.0, -74.0)
+
+
+def test_empty_index():
+    index = GeoIndex(gazetteer_file="missing-gazetteer.csv")
+    assert index.nearest(40.0, -74.0) == []
+    assert index.within_radius(40.0, -74.0, 10.0) == (0, [])
+    assert index.within_bbox(39.0, -75.0, 41.0, -73.0) == (0, [])
+    assert len(index) == 0
@@ -0,0 +1,88 @@
+from typing import Any, Dict
+
+import pytest
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+
+from crewai_sample import hybrid_knowledge
+from crewai_sample.context_packer import PackedKnowledge
+from crewai_sample.hybrid_knowledge import HybridKnowledgeAgent, HybridKnowledgeStorage
+
+
+class _Collection:
+    """Chroma collection returning fixed squared-l2 distances for every query."""
+
+    metadata = None
+
+    def __init__(self, distances: Dict[str, float], documents: Dict[str, str]):
+        self.distances = distances
+        self.documents = documents
+
+    def count(self):
+        return len(self.documents)
+
+    def query(self, query_texts, n_results, where=None):
+        ids = sorted(self.distances, key=self.distances.get)[:n_results]
+        return {
+            "ids": [ids],
+            "distances": [[self.distances[i] for i in ids]],
+            "documents": [[self.documents[i] for i in ids]],
+            "metadatas": [[{} for _ in ids]],
+        }
+
+    def get(self, ids=None, where=None, include=None):
+        ids = [i for i in ids if i in self.documents]
+        return {"ids": ids, "documents": [self.documents[i] for i in ids], "metadatas": [{} for _ in ids]}
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    documents = {
+        "near": "Two bedroom condo in Park Slope",
+        "far": "Studio in Austin with a pool",
+        "keyword": "Listing LTM0261 on Elm Street",
+    }
+    storage = HybridKnowledgeStorage(collection_name="listings", rerank_model=None)
+    # Cosine similarities 0.9, 0.2 and 0.1 for unit vectors
+    storage.collection = _Collection({"near": 0.2, "far": 1.6, "keyword": 1.8}, documents)
+    storage.bm25.add(list(documents), list(documents.values()))
+    return storage
+
+
+def test_vector_hits_below_the_threshold_are_dropped(storage):
+    assert [r["id"] for r in storage.search(["two bedroom condo"], limit=3, score_threshold=0.35)] == ["near"]
+    assert sorted(r["id"] for r in storage.search(["two bedroom condo"], limit=3, score_threshold=0.0)) == [
+        "far", "keyword", "near",
+    ]
+
+
+def test_keyword_hits_are_kept_whatever_their_similarity(storage):
+    found = storage.search(["ltm0261"], limit=3, score_threshold=0.35)
+    # "far" is only a vector hit, and below the threshold
+    assert sorted(r["id"] for r in found) == ["keyword", "near"]
+
+
+class _Source(BaseKnowledgeSource):
+    def load_content(self) -> Dict[Any, str]:
+        return {}
+
+    def add(self) -> None:
+        pass
+
+
+def test_agent_knowledge_uses_the_shared_hybrid_storage(storage, monkeypatch):
+    # Agent._set_knowledge is a private crewAI hook; this checks the installed crewAI still calls it
+    collections = []
+
+    def shared_storage(collection_name, embedder_config):
+        collections.append(collection_name)
+        return storage
+
+    monkeypatch.setattr(hybrid_knowledge, "shared_storage", shared_storage)
+    agent = HybridKnowledgeAgent(
+        role="Listings Expert", goal="Answer", backstory="Knows listings", llm="gpt-4o-mini",
+        knowledge_sources=[_Source()],
+    )
+    assert isinstance(agent._knowledge, PackedKnowledge)
+    assert agent._knowledge.storage is storage
+    assert collections == ["Listings_Expert"]
@@ -0,0 +1,119 @@
+import random
+
+from crewai_sample.listing_merge import ListingMerger, _Group, feed_key, normalize_text
+
+FEEDS = ("https://feed-a.example/listings", "https://feed-b.example/listings", "https://feed-c.example/listings")
+STREETS = ("Main", "Oak", "Maple", "Cedar", "Elm", "Pine", "Lake", "Hill")
+SUFFIXES = (("St", "Street"), ("Ave", "Avenue"), ("Rd", "Road"), ("Blvd", "Boulevard"))
+
+
+def _feeds(properties, seed=0):
+    """Each property is listed by one to three feeds, with the spellings and prices varying between them."""
+    rng = random.Random(seed)
+    feeds = {endpoint: [] for endpoint in FEEDS}
+    truth = []
+    for number in range(properties):
+        street, (short, long) = rng.choice(STREETS), rng.choice(SUFFIXES)
+        bedrooms = rng.randrange(1, 5)
+        price = rng.randrange(1000, 5000)
+        listed = []
+        for endpoint in rng.sample(FEEDS, rng.randrange(1, 4)):
+            listing_id = f"{number}-{len(feeds[endpoint])}"
+            feeds[endpoint].append({
+                "id": listing_id,
+                "title": rng.choice([f"{bedrooms} Bed Apartment on {street}", f"{bedrooms}bd apartment, {street}"]),
+                "location": f"{100 + number} {street} {rng.choice([short, long])}, Springfield",
+                "bedrooms": bedrooms,
+                "price": price + rng.randrange(-50, 51),
+                "images": [f"{endpoint}/{listing_id}.jpg"],
+            })
+            listed.append(f"{feed_key(endpoint)}:{listing_id}")
+        truth.append(frozenset(listed))
+    for listings in feeds.values():
+        rng.shuffle(listings)
+    return feeds, set(truth)
+
+
+def _brute_force(merger, feeds):
+    """Compare every listing with every group so far, without the block and exact-match indexes.
+
+    Only groups in the listing's block (bedrooms and street number) or with the same
+    address and title are candidates; the similarity rule alone would merge neighbours.
+    """
+    groups = []
+    for endpoint, listings in feeds.items():
+        for listing in listings:
+            address, title = normalize_text(listing.get("location")), normalize_text(listing.get("title"))
+            listing = {**listing, "id": f"{feed_key(endpoint)}:{listing['id']}"}
+            block = merger._block(listing, address)
+            group = next(
+                (g for g in groups
+                 if endpoint not in g.endpoints
+                 and ((g.address, g.title) == (address, title) or merger._block(g.listings[0], g.address) == block)
+                 and merger._same_property(g, listing, address, title)),
+                None,
+            )
+            if group is None:
+                groups.append(_Group(endpoint, listing, address, title))
+            else:
+                group.endpoints.append(endpoint)
+                group.listings.append(listing)
+    return [group.merged() for group in groups]
+
+
+def _groups(merged, feeds):
+    """Each merged listing as the set of feed listing ids it was made from."""
+    images = {}
+    for endpoint, listings in feeds.items():
+        for listing in listings:
+            images[listing["images"][0]] = f"{feed_key(endpoint)}:{listing['id']}"
+    return {frozenset(images[image] for image in listing["images"]) for listing in merged}
+
+
+def test_merge_matches_brute_force_and_ground_truth():
+    merger = ListingMerger()
+    for seed in range(5):
+        feeds, truth = _feeds(200, seed=seed)
+        merged = merger.merge(feeds, lambda listing: listing["id"])
+        assert _groups(merged, feeds) == _groups(_brute_force(merger, feeds), feeds)
+        assert _groups(merged, feeds) == truth
+        assert len({listing["id"] for listing in merged}) == len(merged)
+
+
+def test_merged_listing_keeps_the_first_feed_and_fills_gaps():
+    first, second = FEEDS[:2]
+    feeds = {
+        first: [{"id": "1", "title": "2 Bed Apartment", "location": "12 Main St, Springfield", "bedrooms": 2,
+                 "price": "$2,000", "description": ""}],
+        second: [{"id": "9", "title": "2bd apartment", "location": "12 Main Street, Springfield", "bedrooms": 2,
+                  "price": 2050, "description": "Sunny corner unit"}],
+    }
+    [merged] = ListingMerger().merge(feeds, lambda listing: listing["id"])
+    assert merged["id"] == f"{feed_key(first)}:1"
+    assert merged["price"] == "$2,000"
+    assert merged["description"] == "Sunny corner unit"
+    assert merged["sources"] == [first, second]
+
+
+def test_units_of_one_building_in_one_feed_stay_apart():
+    units = [
+        {"id": str(unit), "title": "1 Bed Apartment", "location": "5 Oak Ave, Springfield", "bedrooms": 1, "price": 1500}
+        for unit in range(3)
+    ]
+    merged = ListingMerger().merge({FEEDS[0]: units}, lambda listing: listing["id"])
+    assert len(merged) == 3
+
+
+def test_same_ids_in_different_feeds_do_not_collide():
+    first, second = FEEDS[:2]
+    feeds = {
+        first: [{"id": "1", "title": "Studio", "location": "3 Elm St, Springfield", "bedrooms": 0, "price": 1200}],
+        second: [
+            {"id": "1", "title": "3 Bed House", "location": "80 Lake Rd, Springfield", "bedrooms": 3, "price": 3900},
+            {"id": "2", "title": "Studio", "location": "3 Elm Street, Springfield", "bedrooms": 0, "price": 1210},
+        ],
+    }
+    merged = ListingMerger().merge(feeds, lambda listing: listing["id"])
+    assert [listing["id"] for listing in merged] == [f"{feed_key(first)}:1", f"{feed_key(second)}:1"]
+    assert merged[0]["sources"] == [first, second]
+    assert merged[1]["title"] == "3 Bed House"
@@ -0,0 +1,142 @@
+import random
+
+from crewai_sample.listing_fields import normalize, to_day, to_float
+from crewai_sample.listing_store import ListingStore
+
+LOCATIONS = ("Park Slope, Brooklyn, NY", "Williamsburg, Brooklyn, NY", "Austin, TX", "Downtown, Seattle, WA")
+PROPERTY_TYPES = ("Apartment", "condo", "House ", "Studio")
+
+
+def _listings(count, seed=0):
+    rng = random.Random(seed)
+    listings = []
+    for i in range(count):
+        listings.append({
+            "id": str(i),
+            "price": rng.choice([f"${rng.randrange(800, 5000):,}", rng.randrange(800, 5000), None, "call"]),
+            "bedrooms": rng.choice([0, 1, 2, 2.0, "3", None]),
+            "bathrooms": rng.choice([1, 1.5, 2, None]),
+            "property_type": rng.choice(PROPERTY_TYPES + (None,)),
+            "location": rng.choice(LOCATIONS + (None,)),
+            "date_added": rng.choice([f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}", None, "soon"]),
+        })
+    return listings
+
+
+def _matches(listing, min_price=None, max_price=None, bedrooms=None, min_bedrooms=None, max_bedrooms=None,
+             bathrooms=None, min_bathrooms=None, property_type=None, location=None, added_after=None,
+             added_before=None):
+    price = to_float(listing.get("price"))
+    beds = to_float(listing.get("bedrooms"))
+    baths = to_float(listing.get("bathrooms"))
+    day = to_day(listing.get("date_added"))
+
+    def in_range(value, low, high):
+        if value != value:
+            return False
+        return (low is None or value >= low) and (high is None or value <= high)
+
+    if bedrooms is not None and beds != float(bedrooms):
+        return False
+    if bathrooms is not None and baths != float(bathrooms):
+        return False
+    if property_type and normalize(listing.get("property_type")) != normalize(property_type):
+        return False
+    if location:
+        value = listing.get("location")
+        if value is None:
+            return False
+        keys = {normalize(value)} | {normalize(part) for part in str(value).split(",") if part.strip()}
+        if normalize(location) not in keys:
+            return False
+    if (min_price is not None or max_price is not None) and not in_range(price, min_price, max_price):
+        return False
+    if (min_bedrooms is not None or max_bedrooms is not None) and not in_range(beds, min_bedrooms, max_bedrooms):
+        return False
+    if min_bathrooms is not None and not in_range(baths, min_bathrooms, None):
+        return False
+    if added_after or added_before:
+        if day != day:
+            return False
+        if added_after and day < to_day(added_after):
+            return False
+        if added_before and day > to_day(added_before):
+            return False
+    return True
+
+
+def _random_filters(rng):
+    filters = {}
+    for name, values in (
+        ("min_price", [1000, 2500]),
+        ("max_price", [2000, 4000]),
+        ("bedrooms", [0, 1, 2, 3]),
+        ("min_bedrooms", [1, 2]),
+        ("max_bedrooms", [2, 3]),
+        ("bathrooms", [1, 1.5]),
+        ("min_bathrooms", [1.5, 2]),
+        ("property_type", ["apartment", "CONDO", "house"]),
+        ("location", ["brooklyn", "Park Slope, Brooklyn, NY", "seattle", "Nowhere"]),
+        ("added_after", ["2024-03-01", "2024-06-15"]),
+        ("added_before", ["2024-09-30", "2024-12-31"]),
+    ):
+        if rng.random() < 0.3:
+            filters[name] = rng.choice(values)
+    return filters
+
+
+def test_query_matches_brute_force():
+    listings = _listings(600)
+    store = ListingStore(listings)
+    rng = random.Random(1)
+    for _ in range(300):
+        filters = _random_filters(rng)
+        expected = [listing["id"] for listing in listings if _matches(listing, **filters)]
+        found = store.query(sort_by="", limit=None, **filters)
+        assert sorted(listing["id"] for listing in found) == sorted(expected), filters
+        assert store.count(**filters) == len(expected)
+
+
+PRICED = [
+    {"id": "a", "price": "$2,500", "bedrooms": 2, "date_added": "2024-03-01"},
+    {"id": "b", "price": "call", "bedrooms": 2, "date_added": "2024-01-15"},
+    {"id": "c", "price": 1800, "bedrooms": 1, "date_added": "soon"},
+    {"id": "d", "price": None, "bedrooms": "2", "date_added": "2024-02-10"},
+    {"id": "e", "price": "NaN", "bedrooms": 3},
+    {"id": "f", "price": "3,100", "bedrooms": 2.0, "date_added": "2024-05-20"},
+]
+
+
+def _ids(listings):
+    return [listing["id"] for listing in listings]
+
+
+def test_unparsable_prices_never_match_a_price_range():
+    store = ListingStore(PRICED)
+    assert _ids(store.query(min_price=0, limit=None)) == ["c", "a", "f"]
+    assert store.count(max_price=2000) == 1
+    # They still match filters on other fields
+    assert _ids(store.query(bedrooms=2, sort_by="", limit=None)) == ["a", "b", "d", "f"]
+
+
+def test_missing_values_sort_last_in_either_direction():
+    store = ListingStore(PRICED)
+    assert _ids(store.query(limit=None)) == ["c", "a", "f", "b", "d", "e"]
+    assert _ids(store.query(descending=True, limit=None)) == ["f", "a", "c", "b", "d", "e"]
+    assert _ids(store.query(descending=True, limit=2)) == ["f", "a"]
+    assert _ids(store.query(sort_by="date_added", descending=True, limit=None)) == ["f", "a", "d", "b", "c", "e"]
+
+
+def test_empty_store():
+    store = ListingStore()
+    assert len(store) == 0
+    assert store.query() == []
+    assert store.query(min_price=1000, location="brooklyn", descending=True) == []
+    assert store.count(bedrooms=2) == 0
+
+
+def test_load_replaces_the_snapshot():
+    store = ListingStore(_listings(50))
+    store.load(_listings(20, seed=5))
+    assert len(store) == 20
+    assert store.count() == 20
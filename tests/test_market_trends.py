@@ -0,0 +1,181 @@
+import datetime
+import random
+import statistics
+
+import pytest
+
+from crewai_sample.listing_fields import normalize, to_float
+from crewai_sample.market_trends import MarketTrends
+
+LOCATIONS = ("Park Slope, Brooklyn, NY", "Williamsburg, Brooklyn, NY", "Austin, TX", None)
+PROPERTY_TYPES = ("Apartment", "Condo", "House", None)
+
+
+def _listing(rng, pid):
+    return {
+        "id": str(pid),
+        "price": rng.choice([rng.randrange(900, 6000), f"${rng.randrange(900, 6000):,}", None]),
+        "bedrooms": rng.choice([0, 1, 2, 3, None]),
+        "property_type": rng.choice(PROPERTY_TYPES),
+        "location": rng.choice(LOCATIONS),
+        "date_added": rng.choice([
+            (datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randrange(200))).isoformat(), None,
+        ]),
+    }
+
+
+def _period(listing, period):
+    if period == "all":
+        return "all"
+    try:
+        day = datetime.date.fromisoformat(str(listing.get("date_added"))[:10])
+    except ValueError:
+        return None
+    if period == "month":
+        return day.isoformat()[:7]
+    return (day - datetime.timedelta(days=day.weekday())).isoformat()
+
+
+def _in_location(listing, location):
+    value = listing.get("location")
+    if not value:
+        return False
+    return normalize(location) in {normalize(value)} | {normalize(part) for part in value.split(",") if part.strip()}
+
+
+def _brute_force(listings, metric, period, location=None, property_type=None):
+    groups = {}
+    for listing in listings:
+        name = _period(listing, period)
+        if name is None:
+            continue
+        if location and not _in_location(listing, location):
+            continue
+        if property_type and normalize(listing.get("property_type") or "") != normalize(property_type):
+            continue
+        price, bedrooms = to_float(listing.get("price")), to_float(listing.get("bedrooms"))
+        if metric == "price_per_bedroom":
+            value = price / bedrooms if bedrooms > 0 else float("nan")
+        else:
+            value = price
+        groups.setdefault(name, []).append(value)
+
+    rows = []
+    for name in sorted(groups):
+        priced = [value for value in groups[name] if value == value]
+        rows.append({
+            "period": name,
+            "listings": len(groups[name]),
+            "priced": len(priced),
+            "median": statistics.median(priced) if priced else None,
+            "mean": statistics.fmean(priced) if priced else None,
+            "min": min(priced) if priced else None,
+            "max": max(priced) if priced else None,
+        })
+    return rows
+
+
+def _assert_trends_match(trends, listings):
+    for metric in ("rent", "new_listings", "price_per_bedroom"):
+        for period in ("week", "month", "all"):
+            for location in (None, "brooklyn", "Park Slope, Brooklyn, NY", "austin, tx", "nowhere"):
+                for property_type in (None, "condo", "House"):
+                    expected = _brute_force(listings, metric, period, location, property_type)
+                    found = trends.trend(metric, period, location, property_type)
+                    assert [row["period"] for row in found] == [row["period"] for row in expected]
+                    for row, want in zip(found, expected):
+                        for field in ("listings", "priced"):
+                            assert row[field] == want[field]
+                        for field in ("median", "mean", "min", "max"):
+                            assert row[field] == (None if want[field] is None else pytest.approx(want[field], abs=0.01))
+
+
+def test_trends_match_brute_force():
+    rng = random.Random(0)
+    listings = [_listing(rng, pid) for pid in range(500)]
+    trends = MarketTrends()
+    assert trends.update(listings, lambda listing: listing["id"]) == len(listings)
+    _assert_trends_match(trends, listings)
+
+
+def test_incremental_updates_match_a_rebuild():
+    rng = random.Random(1)
+    listings = [_listing(rng, pid) for pid in range(400)]
+    trends = MarketTrends()
+    trends.update(listings, lambda listing: listing["id"])
+    next_id = len(listings)
+    for _ in range(5):
+        listings = [listing for listing in listings if rng.random() > 0.1]
+        for i in rng.sample(range(len(listings)), 30):
+            listings[i] = {**_listing(rng, 0), "id": listings[i]["id"]}
+        for _ in range(40):
+            listings.append(_listing(rng, next_id))
+            next_id += 1
+        trends.update(listings, lambda listing: listing["id"])
+        assert len(trends) == len(listings)
+        _assert_trends_match(trends, listings)
+    assert trends.update(listings, lambda listing: listing["id"]) == 0
+
+
+LISTINGS = [
+    {"id": "1", "price": "$2,000", "bedrooms": 2, "location": "Park Slope, Brooklyn, NY", "date_added": "2024-03-04"},
+    {"id": "2", "price": "call", "bedrooms": 1, "location": "Park Slope, Brooklyn, NY", "date_added": "2024-03-05"},
+    {"id": "3", "price": 3000, "bedrooms": 0, "location": "Austin, TX", "date_added": "2024-03-20"},
+    {"id": "4", "price": 1500, "bedrooms": 1, "location": "Williamsburg, Brooklyn, NY", "date_added": "2024-04-02"},
+    {"id": "5", "price": 2500, "bedrooms": "3", "location": "Austin, TX", "date_added": "not a date"},
+]
+
+
+def _summary(rows, *fields):
+    return [tuple(row[field] for field in ("period",) + fields) for row in rows]
+
+
+def test_unpriced_listings_are_counted_but_not_averaged():
+    trends = MarketTrends()
+    trends.update(LISTINGS, lambda listing: listing["id"])
+    assert _summary(trends.trend("rent", "month"), "listings", "priced", "median", "min", "max") == [
+        ("2024-03", 3, 2, 2500.0, 2000.0, 3000.0),
+        ("2024-04", 1, 1, 1500.0, 1500.0, 1500.0),
+    ]
+    # Listings without a date only count over all time
+    assert _summary(trends.trend("rent", "all"), "listings", "priced", "mean") == [("all", 5, 4, 2250.0)]
+    # "call" and zero bedrooms have no price per bedroom
+    assert _summary(trends.trend("price_per_bedroom", "all"), "priced", "median", "min", "max") == [
+        ("all", 3, 1000.0, 833.33, 1500.0),
+    ]
+    assert _summary(trends.trend("rent", "month", location="brooklyn"), "listings", "priced", "median") == [
+        ("2024-03", 2, 1, 2000.0),
+        ("2024-04", 1, 1, 1500.0),
+    ]
+
+
+def test_removed_listings_leave_their_groups():
+    trends = MarketTrends()
+    trends.update(LISTINGS, lambda listing: listing["id"])
+    kept = [listing for listing in LISTINGS if listing["id"] not in ("3", "4")]
+    assert trends.update(kept, lambda listing: listing["id"]) == 2
+    assert _summary(trends.trend("rent", "month"), "listings", "priced", "median") == [("2024-03", 2, 1, 2000.0)]
+    assert trends.trend("rent", "month", location="austin") == []
+    assert _summary(trends.trend("rent", "all", location="austin"), "listings", "median") == [("all", 1, 2500.0)]
+
+    assert trends.update([], lambda listing: listing["id"]) == 3
+    assert len(trends) == 0
+    assert trends.trend("rent", "all") == []
+
+
+def test_trend_filters_periods_by_start_and_end():
+    trends = MarketTrends()
+    trends.update(LISTINGS, lambda listing: listing["id"])
+    # Weeks are named by their Monday; a period is in range when its start is
+    weeks = trends.trend(period="week", start="2024-03-10", end="2024-04-01")
+    assert [row["period"] for row in weeks] == ["2024-03-18", "2024-04-01"]
+    months = trends.trend(period="month", start="2024-03-15", end="2024-03-31")
+    assert [row["period"] for row in months] == ["2024-03"]
+    assert [row["period"] for row in trends.trend(period="month", start="2024-03-15")] == ["2024-03", "2024-04"]
+
+
+def test_unknown_metric_or_period_is_rejected():
+    with pytest.raises(ValueError):
+        MarketTrends().trend(metric="yield")
+    with pytest.raises(ValueError):
+        MarketTrends().trend(period="year")
@@ -0,0 +1,106 @@
+import pickle
+
+import pytest
+from crewai import Agent, Crew, Task
+from crewai.agents.parser import AgentFinish
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+
+from crewai_sample import parallel_iterations
+
+# These tests run the private crewAI hooks parallel_iterations relies on against the
+# installed crewAI, with kickoff and the LLM evaluations replaced; see the pin in pyproject.toml
+
+
+@pytest.fixture
+def crew(monkeypatch, tmp_path):
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+    researcher = Agent(role="Researcher", goal="Find facts", backstory="Careful", llm="gpt-4o-mini")
+    writer = Agent(role="Writer", goal="Write reports", backstory="Concise", llm="gpt-4o-mini")
+    return Crew(
+        agents=[researcher, writer],
+        tasks=[
+            Task(description="Research", expected_output="Facts", agent=researcher),
+            Task(description="Write", expected_output="A report", agent=writer, output_file="report.md"),
+        ],
+    )
+
+
+def test_train_files_every_iteration_under_the_training_crew_agents(crew, monkeypatch, tmp_path):
+    def kickoff(self, inputs=None):
+        # What a trained task does: build the executor, then record the human feedback
+        for agent in self.agents:
+            agent.crew = self
+            agent.create_agent_executor(tools=[])
+            executor = agent.agent_executor
+            assert hasattr(executor._handle_crew_training_output, "__wrapped__")
+            executor.ask_for_human_input = True
+            executor._handle_crew_training_output(
+                AgentFinish(thought="", output=f"{agent.role} {self._train_iteration}", text=""), "more detail"
+            )
+
+    evaluated = {}
+
+    class Result:
+        @staticmethod
+        def model_dump():
+            return {"suggestions": ["be brief"]}
+
+    class Evaluator:
+        def __init__(self, agent):
+            self.agent = agent
+
+        def evaluate_training_data(self, training_data, agent_id):
+            evaluated[self.agent.role] = training_data[agent_id]
+            return Result
+
+    monkeypatch.setattr(Crew, "kickoff", kickoff)
+    monkeypatch.setattr(parallel_iterations, "TaskEvaluator", Evaluator)
+
+    parallel_iterations.train_in_parallel(crew, n_iterations=3, filename="trained.pkl", max_workers=3)
+
+    assert sorted(evaluated) == ["Researcher", "Writer"]
+    for role, iterations in evaluated.items():
+        assert sorted(iterations) == [0, 1, 2]
+        assert [iterations[n]["initial_output"] for n in range(3)] == [f"{role} {n}" for n in range(3)]
+    with open(tmp_path / "trained.pkl", "rb") as f:
+        assert sorted(pickle.load(f)) == ["Researcher", "Writer"]
+    # The crew passed in is left as it was
+    assert crew.tasks[1].output_file == "report.md"
+    assert not crew.tasks[0].human_input
+
+
+def test_test_reports_the_successful_iterations(crew, monkeypatch):
+    def kickoff(self, inputs=None):
+        evaluator = self.tasks[0].callback.__self__
+        if evaluator.iteration == 2:
+            raise RuntimeError("rate limited")
+        assert self.tasks[1].output_file == f"report.iteration-{evaluator.iteration}.md"
+        for task in self.tasks:
+            task.callback(TaskOutput(description=task.description, raw="done", agent=task.agent.role))
+
+    def evaluate(self, task_output):
+        self.tasks_scores[self.iteration].append(float(self.iteration))
+        self.run_execution_times[self.iteration].append(1)
+
+    reports = []
+    monkeypatch.setattr(Crew, "kickoff", kickoff)
+    monkeypatch.setattr(CrewEvaluator, "evaluate", evaluate)
+    monkeypatch.setattr(CrewEvaluator, "print_crew_evaluation_result", lambda self: reports.append(self))
+
+    parallel_iterations.test_in_parallel(crew, n_iterations=3, openai_model_name="gpt-4o-mini", max_workers=3)
+
+    [report] = reports
+    assert dict(report.tasks_scores) == {1: [1.0, 1.0], 2: [3.0, 3.0]}
+    assert dict(report.run_execution_times) == {1: [1, 1], 2: [1, 1]}
+
+
+def test_test_fails_when_every_iteration_fails(crew, monkeypatch):
+    def kickoff(self, inputs=None):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(Crew, "kickoff", kickoff)
+    with pytest.raises(RuntimeError, match="All 2 test iterations failed"):
+        parallel_iterations.test_in_parallel(crew, n_iterations=2, max_workers=2)